@@ -0,0 +1,22 @@
+"""Writes the compiled basis set archive basis_library.npz consulted by
+qcdb.BasisSet.construct() ahead of the *.gbs files of this directory.
+Rerun after editing or adding basis sets; stale files are otherwise
+read as text until the archive is rebuilt.
+
+    python build_archive.py
+
+"""
+from __future__ import print_function
+import os
+import sys
+import time
+homewrite = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(homewrite))
+import qcdb.libmintsbasissetparser
+
+
+if __name__ == '__main__':
+    t0 = time.time()
+    filename = qcdb.libmintsbasissetparser.compile_basis_library(homewrite)
+    t1 = time.time()
+    print('%-70s %8.1f' % ('*.gbs --> ' + os.path.basename(filename), t1 - t0))
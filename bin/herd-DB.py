@@ -26,11 +26,14 @@ import os
 #import re
 import sys
 import glob
+import json
 #import math
 import string
 import argparse
 import importlib
 import collections
+import multiprocessing
+from decimal import Decimal
 
 qcdbpkg_path = os.path.dirname(__file__)
 sys.path.append(qcdbpkg_path + '/../')
@@ -48,6 +51,12 @@ parser.add_argument('-p', '--prefix', help='force prefix for usemefiles, default
 parser.add_argument('-q', '--qcprog', help='force choice of QC program parser')
 parser.add_argument('-s', '--style', help='stype of usemefile (3col or Wt)')
 parser.add_argument('-a', '--actv', help='force ACTV mode (cp, uncp, sapt), defaults to sample')
+parser.add_argument('-j', '--jobs', type=int, default=multiprocessing.cpu_count(),
+                    help='number of output files to harvest at once, defaults to number of cpus')
+parser.add_argument('-c', '--checkpoint', default='herd-DB.checkpoint',
+                    help='file of harvested results reused for unchanged output files, "none" to disable')
+parser.add_argument('-m', '--aliases', default='imake-DB.aliases',
+                    help='file from imake-DB of reagents computed through an equivalent reagent, "none" to disable')
 args = parser.parse_args()
 
 actionable_data = {
@@ -91,12 +100,130 @@ def identify_qcprog(filename):
         'A Quantum Leap Into The Future Of Chemistry': 'qchem',
         }
 
-    with open(sample, 'r') as handle:
-        contents = handle.readlines()
-    for line in contents:
-        for target in qcprogs.keys():
-            if target.lower() in line.lower():
-                return qcprogs[target]
+    with open(filename, 'r') as handle:
+        for line in handle:
+            for target in qcprogs.keys():
+                if target.lower() in line.lower():
+                    return qcprogs[target]
+
+
+def file_signature(filename):
+    """Returns (size, mtime) of *filename* or None if it can't be read.
+
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime]
+
+
+def harvest_file(task):
+    """Harvests output file *task[1]* with the harvest_output of QC
+    program module *task[0]*. Returns the filename, its signature from
+    before reading, and the harvested psivars as strings so they pickle
+    and serialize without loss of precision, or None for both if the file
+    vanished. Only these return to the parent process, never the file
+    contents.
+
+    """
+    qcprog, filename = task
+    signature = file_signature(filename)
+    try:
+        with open(filename, 'r') as handle:
+            contents = handle.read()
+    except IOError:
+        return filename, None, None
+    pv, _tmp, _tmp2 = importlib.import_module('qcdb.' + qcprog).harvest_output(contents)
+    return filename, signature, dict((key, str(val)) for key, val in pv.items())
+
+
+def load_checkpoint(checkpoint):
+    """Returns dictionary of filename to [signature, psivars] entries
+    from append-only *checkpoint*, later lines superseding earlier.
+
+    """
+    harvested = {}
+    if checkpoint is None or not os.path.isfile(checkpoint):
+        return harvested
+    with open(checkpoint, 'r') as handle:
+        for line in handle:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # partial line from an interrupted run
+                continue
+            harvested[entry['file']] = [entry['signature'], entry['psivar']]
+    return harvested
+
+
+def harvest_files(filenames, qcprog, jobs, checkpoint):
+    """Returns dictionary of filename to harvested psivars (as Decimal)
+    for each readable file in *filenames*. Files whose size and mtime
+    match their entry in *checkpoint* are not reparsed. The rest are
+    harvested across *jobs* processes, each result appended to
+    *checkpoint* as it arrives so an interrupted run loses little.
+
+    """
+    harvested = load_checkpoint(checkpoint)
+    results = {}
+    tasks = []
+    for filename in filenames:
+        signature = file_signature(filename)
+        if signature is None:
+            continue
+        if filename in harvested and harvested[filename][0] == signature:
+            results[filename] = harvested[filename][1]
+        else:
+            tasks.append((qcprog, filename))
+    print("""        harvesting %d output files, %d unchanged since last run\n""" % (len(tasks), len(results)))
+
+    handle = None if checkpoint is None else open(checkpoint, 'a')
+    try:
+        if jobs > 1 and len(tasks) > 1:
+            pool = multiprocessing.Pool(min(jobs, len(tasks)))
+            harvests = pool.imap_unordered(harvest_file, tasks)
+        else:
+            pool = None
+            harvests = (harvest_file(task) for task in tasks)
+        for filename, signature, pv in harvests:
+            if pv is None:
+                continue
+            results[filename] = pv
+            harvested[filename] = [signature, pv]
+            if handle is not None:
+                handle.write(json.dumps({'file': filename, 'signature': signature, 'psivar': pv}) + '\n')
+                handle.flush()
+        if pool is not None:
+            pool.close()
+            pool.join()
+    finally:
+        if handle is not None:
+            handle.close()
+
+    # compact checkpoint to one line per file
+    if checkpoint is not None:
+        with open(checkpoint + '.tmp', 'w') as handle:
+            for filename in sorted(harvested.keys()):
+                handle.write(json.dumps({'file': filename, 'signature': harvested[filename][0],
+                                         'psivar': harvested[filename][1]}) + '\n')
+        os.rename(checkpoint + '.tmp', checkpoint)
+
+    return dict((filename, dict((key, Decimal(val)) for key, val in pv.items()))
+                for filename, pv in results.items())
+
+
+def load_aliases(filename):
+    """Returns dictionary of reagent to the equivalent reagent whose
+    output file holds its results, as written by imake-DB to *filename*,
+    or an empty dictionary if there's no such file.
+
+    """
+    if filename is None or not os.path.isfile(filename):
+        return {}
+    with open(filename, 'r') as handle:
+        manifest = json.load(handle)
+    return dict((alias, group['system']) for group in manifest['groups'] for alias in group['aliases'])
 
 
 # query database, qcprog, and directory name
@@ -172,6 +299,22 @@ print("""
 
 """ % (dbse, db_name, qcprog, mode, dirprefix))
 
+# harvest output files of all reagents, those run as an equivalent
+#   reagent unless present in their own right
+aliases = load_aliases(None if args.aliases.lower() == 'none' else args.aliases)
+rgtfiles = {}
+outfiles = []
+for rxn in HRXN:
+    for rgt in ACTV[dbse + '-' + str(rxn)]:
+        if rgt in aliases and not os.path.isfile(rgt + '.out'):
+            rgtfiles[rgt] = aliases[rgt] + '.out'
+        else:
+            rgtfiles[rgt] = rgt + '.out'
+        if rgtfiles[rgt] not in outfiles:
+            outfiles.append(rgtfiles[rgt])
+harvest = harvest_files(outfiles, qcprog, args.jobs,
+                        None if args.checkpoint.lower() == 'none' else args.checkpoint)
+
 # commence iteration through reactions
 psivar = collections.defaultdict(dict)
 for rxn in HRXN:
@@ -184,12 +327,10 @@ for rxn in HRXN:
         complete = False
         rxnm_wt = RXNM[index][ACTV[index][ACTV[index].index(rgt)]]
         try:
-            with open(rgt + '.out', 'r') as handle:
-                contents = handle.read()
-        except IOError:
+            pv = harvest[rgtfiles[rgt]]
+        except KeyError:
             textline += """|  %14s %3d """ % ('<<< MIA >>>', rxnm_wt)
             continue
-        pv, _tmp, _tmp2 = qcmod.harvest_output(contents)
         for key, val in pv.items():
             psivar[key][rgt] = val
             if key == 'SUCCESS':
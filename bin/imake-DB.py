@@ -27,8 +27,12 @@ import sys
 import math
 import os
 import re
+import json
+import hashlib
+import argparse
 import importlib
 import collections
+import multiprocessing
 
 qcdbpkg_path = os.path.dirname(__file__)
 sys.path.append(qcdbpkg_path + '/../')
@@ -37,11 +41,98 @@ import qcdb.basislist
 from qcdb.exceptions import *
 sys.path.append(qcdbpkg_path + '/../databases')
 
+# instructions
+parser = argparse.ArgumentParser(description='Write quantum chemical input files for database reagents.',
+                                 epilog='Settings not given are prompted for, those with defaults only if no '
+                                        'arguments at all are given. Arguments may be collected one per line '
+                                        'in a file passed as @file.',
+                                 fromfile_prefix_chars='@')
+parser.add_argument('-d', '--dbse', help='database module')
+parser.add_argument('-s', '--subset', nargs='+', help='database subset(s), defaults to all')
+parser.add_argument('-q', '--qcprog', help='QC program whose input files are written')
+parser.add_argument('-m', '--methods', nargs='+', help='quantum chemical method(s)')
+parser.add_argument('-b', '--bases', nargs='+', help='basis set(s)')
+parser.add_argument('-u', '--castup', action='store_true', default=None,
+                    help='cast up from smaller basis set')
+parser.add_argument('-p', '--dirprefix', help='destination directory prefix, defaults to try')
+parser.add_argument('--memory', type=int, help='memory usage in MB, defaults to 1600')
+parser.add_argument('-t', '--rmsdtol', type=float, default=1.0e-5,
+                    help='RMSD in Angstroms within which reagents share a calculation, negative to write all')
+parser.add_argument('-j', '--jobs', type=int, default=multiprocessing.cpu_count(),
+                    help='number of reagents to write input files for at once, defaults to number of cpus')
+args = parser.parse_args()
+interactive = (len(sys.argv) == 1)
+
+
+def file_signature(filename):
+    """Returns (size, mtime) of *filename* or None if it can't be read.
+
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime]
+
+
+def load_manifest(manifest):
+    """Returns dictionary of input filename, relative to the destination
+    directory, to its sha1, signature, reagent, basis, and method as
+    recorded in *manifest* by an earlier run.
+
+    """
+    if not os.path.isfile(manifest):
+        return {}
+    with open(manifest, 'r') as handle:
+        return json.load(handle)
+
+
+def write_reagent_inputs(system):
+    """Formats the input files of reagent *system* for each subdirectory,
+    basis, and method of JOBS and writes those whose contents or
+    signature differ from their MANIFEST entry. Returns list of
+    [filename, entry] for the manifest and the number of files written.
+
+    """
+    entries = []
+    written = 0
+    for subdir, basis, method in JOBS:
+        # set up options dict
+        options = collections.defaultdict(lambda: collections.defaultdict(dict))
+        options['GLOBALS']['BASIS']['value'] = basis
+        options['SCF']['BASIS_GUESS']['value'] = castup
+
+        dertype = 0
+
+        try:
+            if qcprog == 'molpro':
+                infile = qcmod.MolproIn(memory, method, basis, GEOS[system], system, castup).format_infile_string()
+
+            elif qcprog in ['psi4', 'molpro2', 'qchem']:
+                infile = qcmod.Infile(memory, GEOS[system], method, dertype, options).format_infile_string()
+
+        except FragmentCountError:
+            # We're passing ACTV rgt list for SAPT methods so this error is to be expected
+            continue
+
+        filename = subdir + '/' + system + '.' + fext
+        sfile = tdir + '/' + filename
+        digest = hashlib.sha1(infile.encode('utf-8')).hexdigest()
+        previous = MANIFEST.get(filename)
+        if previous is None or previous['sha1'] != digest or previous['signature'] != file_signature(sfile):
+            with open(sfile, 'w') as handle:
+                handle.write(infile)
+            written += 1
+        entries.append([filename, {'sha1': digest, 'signature': file_signature(sfile),
+                                   'system': system, 'basis': basis, 'method': method}])
+    return entries, written
+
+
 # load docstring info from database files (doesn't actually import database modules)
 DBdocstrings = qcdb.dictify_database_docstrings()
 
-# instructions
-print("""
+if interactive:
+    print("""
  Welcome to imake-db.
     Just fill in the variables when prompted.
     Hit ENTER to accept default.
@@ -53,44 +144,60 @@ print("""
 # query database name
 module_choices = dict(zip([x.upper() for x in DBdocstrings.keys()], DBdocstrings.keys()))
 
-print('\n Choose your database.')
-for item in module_choices.keys():
-    print("""    %-12s   %s""" % ('[' + module_choices[item] + ']', DBdocstrings[module_choices[item]]['general'][0].lstrip(' |')))
-print('\n')
-
-user_obedient = False
-while not user_obedient:
-    temp = raw_input('    dbse = ').strip()
-    if temp.upper() in module_choices.keys():
-        db_name = module_choices[temp.upper()]
-        user_obedient = True
+if args.dbse is not None:
+    if args.dbse.upper() not in module_choices.keys():
+        raise ValidationError('Database %s not available.' % (args.dbse))
+    db_name = module_choices[args.dbse.upper()]
+else:
+    print('\n Choose your database.')
+    for item in module_choices.keys():
+        print("""    %-12s   %s""" % ('[' + module_choices[item] + ']', DBdocstrings[module_choices[item]]['general'][0].lstrip(' |')))
+    print('\n')
+
+    user_obedient = False
+    while not user_obedient:
+        temp = raw_input('    dbse = ').strip()
+        if temp.upper() in module_choices.keys():
+            db_name = module_choices[temp.upper()]
+            user_obedient = True
 
 # query database subset
 subset_choices = dict(zip([x.upper() for x in DBdocstrings[db_name]['subset'].keys()], DBdocstrings[db_name]['subset'].keys()))
 
-print('\n Choose your subset (multiple allowed).')
-for key, val in DBdocstrings[db_name]['subset'].items():
-    print("""    %-12s   %s""" % ('[' + key + ']', val))
-print('\n')
-
 subset = []
-user_obedient = False
-while not user_obedient:
-    temp = raw_input('    subset [all] = ').strip()
-    ltemp = temp.split()
-    if temp == "":
-        user_obedient = True
-    for item in ltemp:
-        if item.upper() in subset_choices.keys():
-            subset.append(subset_choices[item.upper()])
+if args.subset is not None:
+    for item in args.subset:
+        if item.upper() not in subset_choices.keys():
+            raise ValidationError('Subset %s not available for database %s.' % (item, db_name))
+        subset.append(subset_choices[item.upper()])
+elif interactive:
+    print('\n Choose your subset (multiple allowed).')
+    for key, val in DBdocstrings[db_name]['subset'].items():
+        print("""    %-12s   %s""" % ('[' + key + ']', val))
+    print('\n')
+
+    user_obedient = False
+    while not user_obedient:
+        temp = raw_input('    subset [all] = ').strip()
+        ltemp = temp.split()
+        if temp == "":
             user_obedient = True
-        else:
-            user_obedient = False
-            subset = []
-            break
+        for item in ltemp:
+            if item.upper() in subset_choices.keys():
+                subset.append(subset_choices[item.upper()])
+                user_obedient = True
+            else:
+                user_obedient = False
+                subset = []
+                break
 
 # query qc program
-print("""
+if args.qcprog is not None:
+    if args.qcprog.lower() not in ['molpro', 'psi4', 'molpro2', 'qchem']:
+        raise ValidationError('QC program %s not available.' % (args.qcprog))
+    qcprog = args.qcprog.lower()
+else:
+    print("""
  Choose your quantum chemistry program.
     [qchem]
     [molpro]       writes Molpro input files
@@ -100,12 +207,12 @@ print("""
     #[xyz]          writes basic xyz files only
 """)
 
-user_obedient = False
-while not user_obedient:
-    temp = raw_input('    qcprog = ').strip()
-    if temp.lower() in ['molpro', 'psi4', 'molpro2', 'qchem']:
-        qcprog = temp.lower()
-        user_obedient = True
+    user_obedient = False
+    while not user_obedient:
+        temp = raw_input('    qcprog = ').strip()
+        if temp.lower() in ['molpro', 'psi4', 'molpro2', 'qchem']:
+            qcprog = temp.lower()
+            user_obedient = True
 
 # Load module for QC program
 try:
@@ -122,93 +229,116 @@ else:
 # query quantum chemical method(s)
 method_choices = dict(zip([x.upper() for x in qcmtdIN.keys()], qcmtdIN.keys()))
 
-print('\n Choose your quantum chemical methods (multiple allowed).')
-for key, val in qcmtdIN.items():
-    print("""    %-12s""" % ('[' + key + ']'))
-print('\n')
-
 methods = []
-user_obedient = False
-while not user_obedient:
-    temp = raw_input('    methods = ').strip()
-    ltemp = temp.split()
-    for item in ltemp:
-        if item.upper() in method_choices:
-            methods.append(method_choices[item.upper()])
-            user_obedient = True
-        else:
-            user_obedient = False
-            methods = []
-            break
+if args.methods is not None:
+    for item in args.methods:
+        if item.upper() not in method_choices:
+            raise ValidationError('Method %s not available for QC program %s.' % (item, qcprog))
+        methods.append(method_choices[item.upper()])
+else:
+    print('\n Choose your quantum chemical methods (multiple allowed).')
+    for key, val in qcmtdIN.items():
+        print("""    %-12s""" % ('[' + key + ']'))
+    print('\n')
+
+    user_obedient = False
+    while not user_obedient:
+        temp = raw_input('    methods = ').strip()
+        ltemp = temp.split()
+        for item in ltemp:
+            if item.upper() in method_choices:
+                methods.append(method_choices[item.upper()])
+                user_obedient = True
+            else:
+                user_obedient = False
+                methods = []
+                break
 
 
 # query basis set(s)
-print("""
- Choose your basis set (multiple allowed).
-    e.g., aug-cc-pvdz or 6-31+G* or cc-pvtz may-cc-pvtz aug-cc-pvtz
-""")
-
 bases = []
-user_obedient = False
-while not user_obedient:
-    temp = raw_input('    bases = ').strip()
-    ltemp = temp.split()
-    for item in ltemp:
+if args.bases is not None:
+    for item in args.bases:
         btemp = qcdb.basislist.corresponding_basis(item, role='BASIS')
         if btemp:
             bases.append(btemp)
-            user_obedient = True
         else:
-            print('    Basis set %s not recognized.' % (item))
-            proceed = qcdb.query_yes_no('    Proceed anyway? =', False)
-            if proceed:
-                bases.append(item)
+            print('    Basis set %s not recognized. Proceeding anyway.' % (item))
+            bases.append(item)
+else:
+    print("""
+ Choose your basis set (multiple allowed).
+    e.g., aug-cc-pvdz or 6-31+G* or cc-pvtz may-cc-pvtz aug-cc-pvtz
+""")
+
+    user_obedient = False
+    while not user_obedient:
+        temp = raw_input('    bases = ').strip()
+        ltemp = temp.split()
+        for item in ltemp:
+            btemp = qcdb.basislist.corresponding_basis(item, role='BASIS')
+            if btemp:
+                bases.append(btemp)
                 user_obedient = True
             else:
-                bases = []
-                user_obedient = False
-                break
+                print('    Basis set %s not recognized.' % (item))
+                proceed = qcdb.query_yes_no('    Proceed anyway? =', False)
+                if proceed:
+                    bases.append(item)
+                    user_obedient = True
+                else:
+                    bases = []
+                    user_obedient = False
+                    break
 
 # query castup preference
-print("""
+# below, options['SCF']['BASIS_GUESS']['value'] = castup
+if args.castup is not None or not interactive:
+    castup = bool(args.castup)
+else:
+    print("""
  Do cast up from smaller basis set?
 """)
 
-user_obedient = False
-while not user_obedient:
     castup = qcdb.query_yes_no('    castup [F] = ', False)
-    user_obedient = True
-    # below, options['SCF']['BASIS_GUESS']['value'] = castup
 
 # query directory prefix
-print("""
+if args.dirprefix is not None or not interactive:
+    dirprefix = 'try' if args.dirprefix is None else args.dirprefix
+    if not dirprefix.isalnum():
+        raise ValidationError('Directory prefix %s not alphanumeric.' % (dirprefix))
+else:
+    print("""
  State your destination directory prefix.
 """)
 
-user_obedient = False
-while not user_obedient:
-    temp = raw_input('    dirprefix [try] = ').strip()
-    if temp == "":
-        dirprefix = 'try'
-        user_obedient = True
-    if temp.isalnum():
-        dirprefix = temp
-        user_obedient = True
+    user_obedient = False
+    while not user_obedient:
+        temp = raw_input('    dirprefix [try] = ').strip()
+        if temp == "":
+            dirprefix = 'try'
+            user_obedient = True
+        if temp.isalnum():
+            dirprefix = temp
+            user_obedient = True
 
 # query memory
-print("""
+if args.memory is not None or not interactive:
+    memory = 1600 if args.memory is None else args.memory
+else:
+    print("""
  Choose your memory usage in MB.
 """)
 
-user_obedient = False
-while not user_obedient:
-    temp = raw_input('    memory [1600] = ').strip()
-    if temp == "":
-        memory = 1600
-        user_obedient = True
-    if temp.isdigit():
-        memory = int(temp)
-        user_obedient = True
+    user_obedient = False
+    while not user_obedient:
+        temp = raw_input('    memory [1600] = ').strip()
+        if temp == "":
+            memory = 1600
+            user_obedient = True
+        if temp.isdigit():
+            memory = int(temp)
+            user_obedient = True
 
 # Load module for requested database
 try:
@@ -297,6 +427,25 @@ for rxn in HRXN:
         pass
 HSYS = qcdb.drop_duplicates(temp)
 
+# QC program may reorient but at least input file geometry will match database
+for system in HSYS:
+    GEOS[system].fix_orientation(True)
+    GEOS[system].PYmove_to_com = False
+    GEOS[system].tagline = 'index %s label %s' % (system, TAGL[system])
+    GEOS[system].update_geometry()
+
+# write one input per distinct calculation, recording the reagents it stands in for
+#   so herd-DB can hand its results to each
+if args.rmsdtol < 0.0:
+    GROUPS = collections.OrderedDict((system, [system]) for system in HSYS)
+else:
+    GROUPS = qcdb.molecule.group_equivalent_molecules([(system, GEOS[system]) for system in HSYS], tol=args.rmsdtol)
+aliases = {
+    'tolerance': args.rmsdtol,
+    'groups': [{'key': GEOS[rep].content_key(), 'system': rep, 'aliases': members[1:]}
+               for rep, members in GROUPS.items() if len(members) > 1]}
+print("""        %d distinct calculations among %d reagents\n""" % (len(GROUPS), len(HSYS)))
+
 # commence the file-writing loop
 tdir = '-'.join([dirprefix, dbse, qcprog])
 try:
@@ -304,6 +453,7 @@ try:
 except OSError:
     print('Warning: directory %s already present.' % (tdir))
 
+JOBS = []
 for basis in bases:
     # below, options['GLOBALS']['BASIS']['value'] = basis
     basdir = qcdb.basislist.sanitize_basisname(basis)
@@ -319,34 +469,34 @@ for basis in bases:
         except OSError:
             print('Warning: directory %s/%s already present.' % (tdir, subdir))
 
-        # TODO: forcing c1 symm skipped - still needed for xdm and molpro
-
-        for system in HSYS:
-            # set up options dict
-            options = collections.defaultdict(lambda: collections.defaultdict(dict))
-            options['GLOBALS']['BASIS']['value'] = basis
-            options['SCF']['BASIS_GUESS']['value'] = castup
-
-            # QC program may reorient but at least input file geometry will match database
-            GEOS[system].fix_orientation(True)
-            GEOS[system].PYmove_to_com = False
-            GEOS[system].tagline = 'index %s label %s' % (system, TAGL[system])
-            GEOS[system].update_geometry()
+        with open(tdir + '/' + subdir + '/imake-DB.aliases', 'w') as handle:
+            json.dump(aliases, handle, indent=1)
 
-            dertype = 0
-
-            try:
-                if qcprog == 'molpro':
-                    infile = qcmod.MolproIn(memory, method, basis, GEOS[system], system, castup).format_infile_string()
-
-                elif qcprog in ['psi4', 'molpro2', 'qchem']:
-                    infile = qcmod.Infile(memory, GEOS[system], method, dertype, options).format_infile_string()
+        # TODO: forcing c1 symm skipped - still needed for xdm and molpro
 
-            except FragmentCountError:
-                pass
-                # We're passing ACTV rgt list for SAPT methods so this error is to be expected
+        JOBS.append((subdir, basis, method))
 
-            else:
-                sfile = tdir + '/' + subdir + '/' + system + '.' + fext
-                with open(sfile, 'w') as handle:
-                    handle.write(infile)
+# write the input files of each reagent in turn across worker processes,
+#   leaving alone those unchanged since the last run
+MANIFEST = load_manifest(tdir + '/imake-DB.manifest')
+written = 0
+total = 0
+if args.jobs > 1 and len(GROUPS) > 1:
+    pool = multiprocessing.Pool(min(args.jobs, len(GROUPS)))
+    results = pool.imap_unordered(write_reagent_inputs, list(GROUPS.keys()))
+else:
+    pool = None
+    results = (write_reagent_inputs(system) for system in GROUPS)
+for entries, nwrote in results:
+    MANIFEST.update(entries)
+    written += nwrote
+    total += len(entries)
+if pool is not None:
+    pool.close()
+    pool.join()
+
+with open(tdir + '/imake-DB.manifest.tmp', 'w') as handle:
+    json.dump(MANIFEST, handle, indent=1, sort_keys=True)
+os.rename(tdir + '/imake-DB.manifest.tmp', tdir + '/imake-DB.manifest')
+print("""        wrote %d input files, %d unchanged since last run\n""" %
+      (written, total - written))
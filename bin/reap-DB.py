@@ -2,6 +2,9 @@ from __future__ import print_function
 import os
 import sys
 import glob
+import pickle
+import hashlib
+import inspect
 import argparse
 import itertools
 import collections
@@ -26,6 +29,8 @@ parser.add_argument('-p', '--project', help='select pre-configured project')
 parser.add_argument('-v', '--verbose', type=int, default=1, help='amount of printing')
 parser.add_argument('-o', '--outdir', default='.', help='directory to write output files')
 parser.add_argument('-i', '--usemedir', help='directory containing input data files, defaults to project value')
+parser.add_argument('-c', '--cachedir',
+                    help="directory of parsed usemefiles and derived frames reused across runs, defaults to {dbse}_{project}.reapcache in outdir, 'none' to disable")
 args = parser.parse_args()
 
 project = args.project
@@ -170,8 +175,156 @@ if verbose > 1:
     print('DFSTOICH\n', names[:maxrgt + 1], dfstoich.head(5))
 
 
+# <<< cache of parsed usemefiles and derived frames >>>
+
+#: format version of entries written by ReapCache, bump to invalidate all
+REAP_CACHE_VERSION = 1
+
+
+def digest(*items):
+    """Returns sha1 hex digest of *items*. DataFrame and Series items are
+    hashed on their index, columns, and values; numpy arrays on their bytes;
+    anything else on its repr.
+
+    """
+    sha = hashlib.sha1()
+    sha.update(repr(REAP_CACHE_VERSION).encode('utf-8'))
+    for item in items:
+        if isinstance(item, (pd.DataFrame, pd.Series)):
+            sha.update(repr(list(item.index.names)).encode('utf-8'))
+            if isinstance(item, pd.DataFrame):
+                sha.update(repr(item.columns.tolist()).encode('utf-8'))
+            sha.update(pd.util.hash_pandas_object(item, index=True).values.tostring())
+        elif isinstance(item, np.ndarray):
+            sha.update(item.tostring())
+        else:
+            sha.update(repr(item).encode('utf-8'))
+    return sha.hexdigest()
+
+
+def funcsignature(func):
+    """Returns source of *func* or its name if a builtin, so that editing a
+    function relating psivars invalidates the cached frames it produced.
+
+    """
+    try:
+        return inspect.getsource(func)
+    except (IOError, TypeError):
+        return func.__name__
+
+
+def digest_blocks(frame, levels):
+    """Returns dictionary of digests of the rows of *frame* under each
+    combination of index *levels*, hashing *frame* in one pass.
+
+    """
+    rowhash = pd.util.hash_pandas_object(frame, index=True)
+    columns = frame.columns.tolist()
+    return {blk: digest(columns, rows.values) for blk, rows in rowhash.groupby(level=levels)}
+
+
+class ReapCache(object):
+    """Pickled parsed usemefiles and derived frames in directory *cachedir*,
+    each keyed by a digest of everything it was computed from, so that a
+    rerun after adding or changing some usemefiles reparses only those and
+    recomputes only the frames depending on them. No cache if *cachedir*
+    is None.
+
+    """
+
+    def __init__(self, cachedir):
+        self.cachedir = cachedir
+        self.used = set()
+        self.hits = 0
+        self.misses = 0
+        if cachedir is not None and not os.path.isdir(cachedir):
+            os.makedirs(cachedir)
+
+    def fetch(self, key, compute):
+        """Returns the value stored under *key*, else computes it by calling
+        *compute* and stores it. Exceptions from *compute* propagate and
+        nothing is stored.
+
+        """
+        if self.cachedir is None:
+            return compute()
+        self.used.add(key)
+        filename = os.path.join(self.cachedir, key + '.pkl')
+        try:
+            with open(filename, 'rb') as handle:
+                value = pickle.load(handle)
+        except Exception:
+            # absent, or unreadable from an interrupted run or another pandas
+            pass
+        else:
+            self.hits += 1
+            return value
+        value = compute()
+        self.misses += 1
+        with open(filename + '.tmp', 'wb') as handle:
+            pickle.dump(value, handle, pickle.HIGHEST_PROTOCOL)
+        os.rename(filename + '.tmp', filename)
+        return value
+
+    def prune(self):
+        """Removes entries not fetched this run, i.e., those of usemefiles
+        since changed or removed and of frames derived from them.
+
+        """
+        if self.cachedir is None:
+            return
+        for filename in glob.glob(os.path.join(self.cachedir, '*.pkl')):
+            if os.path.basename(filename)[:-4] not in self.used:
+                os.remove(filename)
+
+
+if args.cachedir is None:
+    cache = ReapCache('%s/%s_%s.reapcache' % (homewrite, dbse, project))
+else:
+    cache = ReapCache(None if args.cachedir.lower() == 'none' else args.cachedir)
+
+
 # <<< read usemefiles and convert to giant DataFrame >>>
 
+def read_useme(useme, basis, piece, optns, cpmode):
+    """Returns list of (basis, psivar, optns, cpmode, frame) entries for
+    rawdata parsed from usemefile *useme*.
+
+    """
+    entries = []
+    if piece.endswith('usemedash'):
+        tmp = pd.read_csv('%s' % (useme), index_col=0, sep='\s+', comment='#', na_values='None', names=names[:maxrgt + 1])
+        entries.append((basis, useme2psivar[piece], optns, 'default', tmp.dropna(how='all')))
+        entries.append((basis, useme2psivar[piece], optns, 'CP', tmp.dropna(how='all')))
+    elif piece.endswith('usemesapt') or piece.endswith('usemedftsapt') or piece.endswith('usemempsapt'):
+        # moved labels to top, removed comment marker for labels line, col relabeled to mp2cDisp20 for mpsapt
+        tmp = pd.read_csv('%s' % (useme), index_col=0, sep='\s+', comment='#', na_values='None')
+        sapt_cols = tmp.columns.tolist()
+        tmp = pd.DataFrame(tmp.stack(), columns=['Rgt0'])
+        tmp['Rgt0'] *= 0.001  # useme in mHartree
+        tmp = tmp.reorder_levels([1, 0])
+        tmp.index.names = ['psivar', 'rxn']
+        for pv in sapt_cols:
+            try:
+                useme2psivar[pv]
+            except KeyError as e:
+                pass  # bypass extra columns
+            else:
+                try:
+                    tmp2 = tmp.xs(pv, level='psivar')
+                except KeyError as e:
+                    pass  # bypass empty columns
+                else:
+                    entries.append((basis, useme2psivar[pv], optns, 'SA', tmp2))
+    else:
+        tmp = pd.read_csv('%s' % (useme), index_col=0, sep='\s+', comment='#', na_values='None', names=names[:maxrgt + 1])
+        cpmode.replace('unCP', 'default')
+        entries.append((basis, useme2psivar[piece], optns, cpmode, tmp.dropna(how='all')))
+    if verbose > 1:
+        print(tmp.head(4))
+    return entries
+
+
 rawdata = collections.defaultdict(lambda: collections.defaultdict(lambda: collections.defaultdict(dict)))
 usemeglob = glob.glob('%s/%s*useme*' % (path, dbse))
 if len(usemeglob) == 0:
@@ -203,36 +356,12 @@ for useme in usemeglob:
     except KeyError as e:
         raise ValidationError('Error: useme %s needs adding to useme2psivar in psivarrosetta.py' % (e))
 
-    if piece.endswith('usemedash'):
-        tmp = pd.read_csv('%s' % (useme), index_col=0, sep='\s+', comment='#', na_values='None', names=names[:maxrgt + 1])
-        rawdata[basis][useme2psivar[piece]][optns]['default'] = tmp.dropna(how='all')
-        rawdata[basis][useme2psivar[piece]][optns]['CP'] = tmp.dropna(how='all')
-    elif piece.endswith('usemesapt') or piece.endswith('usemedftsapt') or piece.endswith('usemempsapt'):
-        # moved labels to top, removed comment marker for labels line, col relabeled to mp2cDisp20 for mpsapt
-        tmp = pd.read_csv('%s' % (useme), index_col=0, sep='\s+', comment='#', na_values='None')
-        sapt_cols = tmp.columns.tolist()
-        tmp = pd.DataFrame(tmp.stack(), columns=['Rgt0'])
-        tmp['Rgt0'] *= 0.001  # useme in mHartree
-        tmp = tmp.reorder_levels([1, 0])
-        tmp.index.names = ['psivar', 'rxn']
-        for pv in sapt_cols:
-            try:
-                useme2psivar[pv]
-            except KeyError as e:
-                pass  # bypass extra columns
-            else:
-                try:
-                    tmp2 = tmp.xs(pv, level='psivar')
-                except KeyError as e:
-                    pass  # bypass empty columns
-                else:
-                    rawdata[basis][useme2psivar[pv]][optns]['SA'] = tmp2
-    else:
-        tmp = pd.read_csv('%s' % (useme), index_col=0, sep='\s+', comment='#', na_values='None', names=names[:maxrgt + 1])
-        cpmode.replace('unCP', 'default')
-        rawdata[basis][useme2psivar[piece]][optns][cpmode] = tmp.dropna(how='all')
-    if verbose > 1:
-        print(tmp.head(4))
+    with open(useme, 'rb') as handle:
+        contents = handle.read()
+    key = digest('useme', contents, basis, piece, optns, cpmode, names[:maxrgt + 1],
+                 sorted(useme2psivar.items()), funcsignature(read_useme))
+    for entry in cache.fetch(key, lambda: read_useme(useme, basis, piece, optns, cpmode)):
+        rawdata[entry[0]][entry[1]][entry[2]][entry[3]] = entry[4]
 
 baszip = {}
 for baskey, basval in sorted(rawdata.iteritems()):
@@ -286,33 +415,114 @@ def cp2sa(rgts):
     return expanded_rgts
 
 
-def reactionate(cpmode, rgts):
-    """Apply the stoichiometry that turns reagent energies *rgts* into returned
-    reaction energies, according to active mode *cpmode*.
+def nansum_rows(products):
+    """Returns sums across the rows of array *products*, skipping NaN, with
+    rows that are entirely NaN (reactions lacking all reagents) left NaN.
 
     """
-    if cpmode == 'ave':
-        cp = pd.DataFrame(dfstoich['CP'] * rgts['CP'])
-        uncp = pd.DataFrame(dfstoich['default'] * rgts['default'])
-        ave = 0.5 * (cp + uncp)
-        if verbose > 2:
-            print(ave)
-        return ave.sum(axis=1)
-    else:
-        hjkl = pd.DataFrame(rgts[cpmode] * dfstoich[cpmode], index=rxns)
-        if verbose > 2:
-            print(hjkl)
-        return hjkl.sum(axis=1)
+    total = np.nansum(products, axis=1)
+    total[np.isnan(products).all(axis=1)] = np.nan
+    return total
+
+
+class ReagentArrays(object):
+    """Reagent energies of master DataFrame *frame* as a dictionary of
+    (bstrt, psivar, meta) to reactions x (mode, Rgt) float arrays aligned on
+    the reactions *rxns* and the columns of *frame*, NaN where absent, with
+    the stoichiometry DataFrame *stoich* aligned to match. Model chemistries
+    are composed from these by array arithmetic in place of DataFrame lookup
+    and alignment, with sums of leading pieces shared between model
+    chemistries (e.g., HF/atz + MP2/adtz) memoized.
+
+    """
+
+    def __init__(self, frame, stoich, rxns):
+        self.rxns = rxns
+        columns = frame.columns.tolist()
+        rxnpos = pd.Index(rxns).get_indexer(frame.index.get_level_values('rxn'))
+        values = frame.values.astype(float)
+        self.blocks = {}
+        for blk, rows in frame.groupby(level=['bstrt', 'psivar', 'meta']).indices.items():
+            rows = rows[rxnpos[rows] >= 0]
+            arr = np.full((len(rxns), len(columns)), np.nan)
+            arr[rxnpos[rows]] = values[rows]
+            self.blocks[blk] = arr
+        self.bstrts = set(blk[0] for blk in self.blocks)
+        self.bstrtpsivars = set(blk[:2] for blk in self.blocks)
+        self.stoich = stoich.reindex(index=rxns, columns=frame.columns).values.astype(float)
+        # dictionary of mode to OrderedDict of Rgt to column
+        self.modecols = collections.defaultdict(collections.OrderedDict)
+        stoichmodes = set(stoich.columns.get_level_values(0))
+        for icol, (mode, rgt) in enumerate(columns):
+            if mode in stoichmodes:
+                self.modecols[mode][rgt] = icol
+        self.sums = {}
+
+    def piece(self, bas, pcs, opt):
+        """Returns reagent array of psivar *pcs* in basis treatment *bas* with
+        options *opt*, raising KeyError for the first of these absent.
+
+        """
+        try:
+            return self.blocks[(bas, pcs, opt)]
+        except KeyError:
+            if bas not in self.bstrts:
+                raise KeyError(bas)
+            elif (bas, pcs) not in self.bstrtpsivars:
+                raise KeyError(pcs)
+            else:
+                raise KeyError(opt)
+
+    def compose(self, pieces):
+        """Returns sum of reagent arrays of *pieces*, a sequence of
+        (bas, pcs, opt) tuples, memoized on each leading subsequence.
+
+        """
+        pieces = tuple(pieces)
+        try:
+            return self.sums[pieces]
+        except KeyError:
+            pass
+        if len(pieces) == 1:
+            total = self.piece(*pieces[0])
+        else:
+            total = self.compose(pieces[:-1]) + self.piece(*pieces[-1])
+        self.sums[pieces] = total
+        return total
+
+    def products(self, cpmode, rgts):
+        """Returns OrderedDict of Rgt to stoichiometry-weighted reagent column
+        of array *rgts* for ACTV mode *cpmode*.
+
+        """
+        if cpmode not in self.modecols:
+            raise KeyError(cpmode)
+        return collections.OrderedDict((rgt, rgts[:, icol] * self.stoich[:, icol])
+                                       for rgt, icol in self.modecols[cpmode].items())
+
+    def reactionate(self, cpmode, rgts):
+        """Apply the stoichiometry that turns reagent energies array *rgts* into
+        returned Series of reaction energies, according to active mode *cpmode*.
+
+        """
+        if cpmode == 'ave':
+            cp = self.products('CP', rgts)
+            uncp = self.products('default', rgts)
+            nans = np.full(len(self.rxns), np.nan)
+            rgtcols = sorted(set(cp) | set(uncp))
+            products = np.column_stack([0.5 * (cp.get(rgt, nans) + uncp.get(rgt, nans)) for rgt in rgtcols])
+        else:
+            products = np.column_stack(list(self.products(cpmode, rgts).values()))
+        return pd.Series(nansum_rows(products), index=self.rxns)
 
 
 def categories(df, lvl):
     return sorted(set([tup[lvl] for tup in df.index.values]))
 
 
-def append_result_of_func_with_funcargs_to_master_DataFrame_atlevel_with_label(master, label, atlevel, func, funcargs):
+def compose_result_of_func_with_funcargs_atlevel_with_label(label, atlevel, func, data_rich_args):
     odr = {'psivar': [1, 3, 0, 2],
            'bstrt': [3, 1, 0, 2]}
-    data_rich_args = [master.xs(pv, level=atlevel) if isinstance(pv, basestring) else pv for pv in funcargs]
     multiopt = []
     for item in data_rich_args:
         try:
@@ -366,8 +576,53 @@ def append_result_of_func_with_funcargs_to_master_DataFrame_atlevel_with_label(m
     #print atlevel, 'QQpre', temp.index.values[0]
     temp = temp.reorder_levels(odr[atlevel])
     #print atlevel, 'WWpst', temp.index.values[0]
-    return master.append(temp, verify_integrity=True)
-    #return master.combine_first(temp)
+    return temp
+
+
+def append_results_of_funcs_to_master_DataFrame_atlevel(master, atlevel, actions):
+    """Appends to *master* the frame at each label within index level
+    *atlevel* computed by the 'func' from the 'args' of that label in
+    OrderedDict *actions*, string members of which are labels within
+    *atlevel*. Labels are computed in order, so later ones may use earlier.
+    Each computed frame is cached under a digest of the frames it is computed
+    from. Frames are joined to *master* in a single concatenation rather than
+    an append apiece that copies the growing *master* each time.
+
+    """
+    derived = collections.OrderedDict()
+
+    def xs_master_and_derived(label):
+        parts = []
+        try:
+            parts.append(master.xs(label, level=atlevel))
+        except KeyError:
+            pass
+        if label in derived:
+            parts.append(derived[label].xs(label, level=atlevel))
+        if not parts:
+            raise KeyError(label)
+        return parts[0] if len(parts) == 1 else pd.concat(parts)
+
+    for label, action in actions.items():
+        try:
+            if verbose > 0:
+                print("""building %s %s""" % (label, '.' * (50 - len(label))), end='')
+            data_rich_args = [xs_master_and_derived(pv) if isinstance(pv, basestring) else pv for pv in action['args']]
+            key = digest(label, atlevel, funcsignature(action['func']),
+                         funcsignature(compose_result_of_func_with_funcargs_atlevel_with_label), *data_rich_args)
+            temp = cache.fetch(key, lambda: compose_result_of_func_with_funcargs_atlevel_with_label(
+                label, atlevel, action['func'], data_rich_args))
+            temp.index.names = master.index.names
+            derived[label] = temp
+            if verbose > 0:
+                print("""SUCCESS""")
+        except KeyError as e:
+            if verbose > 0:
+                print("""FAILED, missing %s""" % (e))
+
+    if not derived:
+        return master
+    return pd.concat([master] + list(derived.values()), verify_integrity=True)
 
 
 # <<< define simple functions relating psi variables; follow args use in omega >>>
@@ -459,17 +714,7 @@ pv0['M11L TOTAL ENERGY'] = {'func': sum, 'args': ['M11L FUNCTIONAL TOTAL ENERGY'
 pv0['MP2 TOTAL ENERGY'] = {'func': sum, 'args': ['HF TOTAL ENERGY', 'MP2 CORRELATION ENERGY']}
 pv0['CCSD TOTAL ENERGY'] = {'func': sum, 'args': ['HF TOTAL ENERGY', 'CCSD CORRELATION ENERGY']}
 pv0['MP3 TOTAL ENERGY'] = {'func': sum, 'args': ['HF TOTAL ENERGY', 'MP3 CORRELATION ENERGY']}
-for pvar, action in pv0.iteritems():
-    try:
-        if verbose > 0:
-            print("""building %s %s""" % (pvar, '.' * (50 - len(pvar))), end='')
-        df = append_result_of_func_with_funcargs_to_master_DataFrame_atlevel_with_label(
-            master=df, label=pvar, atlevel=lvl, func=action['func'], funcargs=action['args'])
-        if verbose > 0:
-            print("""SUCCESS""")
-    except KeyError, e:
-        if verbose > 0:
-            print("""FAILED, missing %s""" % (e))
+df = append_results_of_funcs_to_master_DataFrame_atlevel(df, lvl, pv0)
 
 
 # <<< miscellaneous pre-computing >>>
@@ -954,17 +1199,7 @@ pv1['DFT-SAPT INDC ENERGY'] = {'func': sum, 'args': ['SAPT HF(2) ALPHA=0.0 ENERG
                                                      'DFT-SAPT IND20,R ENERGY', 'DFT-SAPT EXCH-IND20,R ENERGY']}
 pv1['DFT-SAPT DISP ENERGY'] = {'func': sum, 'args': ['DFT-SAPT DISP20 ENERGY', 'DFT-SAPT EXCH-DISP20 ENERGY']}
 pv1['DFT-SAPT TOTAL ENERGY'] = {'func': sum, 'args': ['DFT-SAPT ELST ENERGY', 'DFT-SAPT EXCH ENERGY', 'DFT-SAPT INDC ENERGY', 'DFT-SAPT DISP ENERGY']}
-for pvar, action in pv1.iteritems():
-    try:
-        if verbose > 0:
-            print("""building %s %s""" % (pvar, '.' * (50 - len(pvar))), end='')
-        df = append_result_of_func_with_funcargs_to_master_DataFrame_atlevel_with_label(
-            master=df, label=pvar, atlevel=lvl, func=action['func'], funcargs=action['args'])
-        if verbose > 0:
-            print("""SUCCESS""")
-    except KeyError, e:
-        if verbose > 0:
-            print("""FAILED, missing %s""" % (e))
+df = append_results_of_funcs_to_master_DataFrame_atlevel(df, lvl, pv1)
 
 #mlist = ['SAPT0 TOTAL ENERGY', 'SAPT0 DISP ENERGY', 'SAPT EXCHSCAL', 'SAPT HF(2) ENERGY']
 #mlist = ['MP2 CORRELATION ENERGY', 'MP2C CC CORRECTION ENERGY', 'MP2C CORRELATION ENERGY', 'MP2C TOTAL ENERGY']
@@ -1021,17 +1256,7 @@ pv2['hillcc_tqzf12'] = {'func': xtpl_power, 'args': [4.595995, 4, 'qzf12', 'tzf1
 # Hill xtpl for unscaled (T)-F12 from Table XI of JCP 131 194105 (2009)
 pv2['hillt_adtz'] = {'func': xtpl_power, 'args': [2.790300, 3, 'atz', 'adz']}
 pv2['hillt_dtzf12'] = {'func': xtpl_power, 'args': [2.615472, 3, 'tzf12', 'dzf12']}
-for pvar, action in pv2.iteritems():
-    try:
-        if verbose > 0:
-            print("""building %s %s""" % (pvar, '.' * (50 - len(pvar))), end='')
-        df = append_result_of_func_with_funcargs_to_master_DataFrame_atlevel_with_label(
-            master=df, label=pvar, atlevel=lvl, func=action['func'], funcargs=action['args'])
-        if verbose > 0:
-            print("""SUCCESS""")
-    except KeyError, e:
-        if verbose > 0:
-            print("""FAILED, missing %s""" % (e))
+df = append_results_of_funcs_to_master_DataFrame_atlevel(df, lvl, pv2)
 
 
 #     <<< SCS(MI)-MP2 & SCS(MI)-F12 >>>
@@ -1099,17 +1324,7 @@ pv3['SCS(MI)-MP2 CORRELATION ENERGY'] = {'func': spin_component_scaling, 'args':
 pv3['SCS(MI)-MP2 TOTAL ENERGY'] = {'func': sum, 'args': ['HF TOTAL ENERGY', 'SCS(MI)-MP2 CORRELATION ENERGY']}
 pv3['SCS(MI)-MP2-F12 CORRELATION ENERGY'] = {'func': spin_component_scaling, 'args': ['SCS(MI)-MP2-F12 SCS-OS', 'SCS(MI)-MP2-F12 SCS-SS', 'MP2-F12 CORRELATION ENERGY', 'MP2-F12 SAME-SPIN CORRELATION ENERGY']}
 pv3['SCS(MI)-MP2-F12 TOTAL ENERGY'] = {'func': sum, 'args': ['HF-CABS TOTAL ENERGY', 'SCS(MI)-MP2-F12 CORRELATION ENERGY']}
-for pvar, action in pv3.iteritems():
-    try:
-        if verbose > 0:
-            print("""building %s %s""" % (pvar, '.' * (50 - len(pvar))), end='')
-        df = append_result_of_func_with_funcargs_to_master_DataFrame_atlevel_with_label(
-            master=df, label=pvar, atlevel=lvl, func=action['func'], funcargs=action['args'])
-        if verbose > 0:
-            print("""SUCCESS""")
-    except KeyError, e:
-        if verbose > 0:
-            print("""FAILED, missing %s""" % (e))
+df = append_results_of_funcs_to_master_DataFrame_atlevel(df, lvl, pv3)
 
 
 # <<< define simple functions codifying cbs() piecing >>>
@@ -1167,7 +1382,7 @@ def build_from_lists(mtdlist, baslist, optlist=None):
         optlist = [''] * len(mtdlist)
     #return ie2(sum([df.loc[bas].loc[pcs].loc[opt] for pcs, bas, opt in zip(mtdlist, baslist, optlist)]))
     # TODO handle mode
-    return reactionate('CP', sum([df.loc[bas].loc[pcs].loc[opt] for pcs, bas, opt in zip(mtdlist, baslist, optlist)]))
+    return reagents.reactionate('CP', reagents.compose(zip(baslist, mtdlist, optlist)))
 
 
 def build(method, option, cpmode, basis):
@@ -1206,7 +1421,18 @@ def build(method, option, cpmode, basis):
         for pcs, bas, opt in zip(mtdlist, baslist, optlist):
             print(df.loc[bas].loc[pcs].loc[opt].loc['UBQ-ala28-asp32']) #'HBC1-FaOOFaNN-4.2'])  # ACONF-15'] #'NBC1-BzBz_S-5.0'] #'S22-2'] #'A24-1'] #'BBI-150LYS-158LEU-2'] #'S22-2']
     acting_cpmode = 'default' if cpmode == 'unCP' else cpmode
-    return reactionate(acting_cpmode, sum([df.loc[bas].loc[pcs].loc[opt] for pcs, bas, opt in zip(mtdlist, baslist, optlist)]))
+    # column depends only on the df blocks of its pieces, so absent pieces
+    #   are detected and unchanged columns reused without slicing df
+    blocks = []
+    for pcs, bas in zip(mtdlist, baslist):
+        try:
+            blocks.append(dfblocks[(bas, pcs)])
+        except KeyError:
+            raise KeyError(pcs if bas in dfbstrts else bas)
+    key = digest('build', acting_cpmode, mtdlist, baslist, optlist, blocks, dfstoich_digest,
+                 funcsignature(ReagentArrays))
+    return cache.fetch(key, lambda: reagents.reactionate(
+        acting_cpmode, reagents.compose(zip(baslist, mtdlist, optlist))))
 
 
 # <<< assemble all model chemistries into columns of new DataFrame >>>
@@ -1217,6 +1443,10 @@ mine.index.names = ['rxn']
 df.sortlevel(inplace=True)
 if verbose > 0:
     print('SORTEDNESS OF DF:', df.index.lexsort_depth)
+dfblocks = digest_blocks(df, ['bstrt', 'psivar'])
+dfbstrts = set(blk[0] for blk in dfblocks)
+dfstoich_digest = digest(dfstoich, rxns)
+reagents = ReagentArrays(df, dfstoich, rxns)
 
 if project == 'dft':
     mtds = ['B3LYP', 'B3LYPD2', 'B3LYPD3', 'B2PLYP', 'B2PLYPD2', 'B2PLYPD3',
@@ -1537,6 +1767,10 @@ with pd.get_store('%s/%s_%s.h5' % (homewrite, dbse, project)) as handle:
     handle['pdie'] = mine * h2kc
     print('Writing to %s/%s_%s.h5 ...' % (homewrite, dbse, project))
 
+if cache.cachedir is not None:
+    cache.prune()
+    print('Reused %d of %d cached frames from %s' % (cache.hits, cache.hits + cache.misses, cache.cachedir))
+
 
 # <<< SAPT components interlude >>>
 
@@ -0,0 +1,60 @@
+"""Writes the binary caches read by qcdb.WrappedDatabase.load_cached() and
+load_qcdata_cache_byproject(), the successors of the *_WDb.pickle and
+*_hrxn_*.pickle files written by nu_build_pickles.py.
+
+    python build_caches.py S22 NBC10:dft,saptone SSI
+
+Each argument is a database name, optionally followed by a colon and the
+comma-separated projects to cache. Without projects, all dbse_project.py
+modules in this directory that define load_project() are cached.
+
+"""
+from __future__ import print_function
+import os
+import sys
+import glob
+import time
+homewrite = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(homewrite))
+sys.path.append(os.path.dirname(homewrite) + '/databases')
+import qcdb.dbwrap
+
+
+def discover_projects(dbse):
+    """Returns projects with a dbse_project.py data module defining load_project()."""
+    projects = []
+    for modfile in sorted(glob.glob(homewrite + '/' + dbse + '_*.py')):
+        pj = os.path.basename(modfile)[len(dbse) + 1:-3]
+        with open(modfile) as handle:
+            if 'def load_' + pj + '(' in handle.read():
+                projects.append(pj)
+    return projects
+
+
+if __name__ == '__main__':
+    for arg in sys.argv[1:]:
+        db, _, lproj = arg.partition(':')
+        print('\n<<< %s >>>' % (db))
+        t0 = time.time()
+        asdf = qcdb.dbwrap.WrappedDatabase(db)
+        dbse = asdf.dbse
+        WDbfilename = asdf.write_cache(filename=homewrite + '/' + db + '_WDb.npz')
+        t1 = time.time()
+        print('%-70s %8.1f' % ('database.py --> database_WDb.npz', t1 - t0))
+
+        lproj = lproj.split(',') if lproj else discover_projects(dbse)
+        for pj in lproj:
+            t2 = time.time()
+            qwer = qcdb.dbwrap.WrappedDatabase.load_cached(db, path=homewrite)
+            qwer.load_qcdata_byproject(pj)
+            qwer.write_cache(filename=homewrite + '/' + dbse + '_hrxn_' + pj + '.npz', project=pj)
+            t3 = time.time()
+            print('%-70s %8.1f' % ('  * ' + pj + ' --> database_hrxn_project.npz', t3 - t2))
+
+        t4 = time.time()
+        zxcv = qcdb.Database(db, loadfromcache=True, path=homewrite)
+        for pj in lproj:
+            zxcv.load_qcdata_cache_byproject(pj, path=homewrite)
+        nmc = len(zxcv.fancy_mcs().keys())
+        t5 = time.time()
+        print('%-70s %8.1f' % ('  * caches --> Database + all projects ' + str(nmc), t5 - t4))
@@ -0,0 +1,35 @@
+"""Writes the tabular sidecars dbse_project.load_project.csv that
+qcdb.WrappedDatabase.load_qcdata() bulk loads in place of importing the
+dbse_project.py data modules.
+
+    python build_sidecars.py NBC10:pt2uncp,dft SSI
+
+Each argument is a database name, optionally followed by a colon and the
+comma-separated projects. Without projects, all dbse_project.py modules in
+this directory that define load_project() are converted.
+
+"""
+from __future__ import print_function
+import os
+import sys
+import time
+homewrite = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(homewrite))
+sys.path.append(os.path.dirname(homewrite) + '/databases')
+import qcdb.dbwrap
+from build_caches import discover_projects
+
+
+for arg in sys.argv[1:]:
+    db, _, lproj = arg.partition(':')
+    print('\n<<< %s >>>' % (db))
+    asdf = qcdb.dbwrap.WrappedDatabase(db)
+    dbse = asdf.dbse
+
+    lproj = lproj.split(',') if lproj else discover_projects(dbse)
+    for pj in lproj:
+        t0 = time.time()
+        qwer = qcdb.dbwrap.WrappedDatabase(db)
+        qwer.write_qcdata_sidecar(dbse + '_' + pj, 'load_' + pj, pythonpath=homewrite)
+        t1 = time.time()
+        print('%-70s %8.1f' % ('  * ' + pj + ' --> database_project.load_project.csv', t1 - t0))
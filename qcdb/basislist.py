@@ -35,9 +35,23 @@ with Psi4.
 from __future__ import absolute_import
 from __future__ import print_function
 import os
+from .exceptions import *
 
 
 basisfamily_list = []
+# sanitized ornate name --> first BasisFamily of that name in basisfamily_list
+basisfamily_index = {}
+# role (None for any) --> sanitized fitting basis name --> BasisFamily-s using it for role
+basisfamily_reverse_index = {}
+# length of basisfamily_list when the indices were built
+basisfamily_indexed = 0
+# BasisFamily attribute holding the gbs file name for each role
+basisfamily_roles = {'BASIS': 'orbital',
+                     'ORBITAL': 'orbital',
+                     'JFIT': 'jfit',
+                     'JKFIT': 'jkfit',
+                     'RIFIT': 'rifit',
+                     'DUALFIT': 'dualfit'}
 
 
 class BasisFamily(object):
@@ -166,9 +180,38 @@ def load_basis_families():
     if len(basisfamily_list) == 0:
         load_basfam_dunning()
         load_basfam_other()
+    if len(basisfamily_list) != basisfamily_indexed:
+        index_basis_families()
     return basisfamily_list
 
 
+def index_basis_families():
+    """Function to (re)build ``basisfamily_index`` and
+    ``basisfamily_reverse_index`` from ``basisfamily_list``. Called by
+    :py:func:`load_basis_families` whenever families have been appended;
+    call directly after changing the bases of existing families.
+
+    """
+    global basisfamily_indexed
+
+    basisfamily_index.clear()
+    basisfamily_reverse_index.clear()
+    for role in [None, 'JFIT', 'JKFIT', 'RIFIT', 'DUALFIT']:
+        basisfamily_reverse_index[role] = {}
+
+    for fam in basisfamily_list:
+        basisfamily_index.setdefault(sanitize_basisname(fam.ornate), fam)
+        for role in ['JFIT', 'JKFIT', 'RIFIT', 'DUALFIT']:
+            fit = getattr(fam, basisfamily_roles[role])
+            if fit is None:
+                continue
+            basisfamily_reverse_index[role].setdefault(fit, []).append(fam)
+            anyrole = basisfamily_reverse_index[None].setdefault(fit, [])
+            if fam not in anyrole:
+                anyrole.append(fam)
+    basisfamily_indexed = len(basisfamily_list)
+
+
 def print_basis_families():
     """Function to print to the output file a formatted summary
     of all the BasisFamily objects in ``basisfamily_list``, by
@@ -190,20 +233,32 @@ def corresponding_basis(name, role='BASIS'):
 
     """
     role = role.upper()
-    basisfamily_list = load_basis_families()
+    load_basis_families()
 
-    for fam in basisfamily_list:
-        if sanitize_basisname(fam.ornate) == sanitize_basisname(name):
-            if role == 'ORNATE':
-                return fam.ornate
-            elif role == 'BASIS' or role == 'ORBITAL':
-                return fam.orbital
-            elif role == 'JFIT':
-                return fam.jfit
-            elif role == 'JKFIT':
-                return fam.jkfit
-            elif role == 'RIFIT':
-                return fam.rifit
-            elif role == 'DUALFIT':
-                return fam.dualfit
-    return None
+    fam = basisfamily_index.get(sanitize_basisname(name))
+    if fam is None:
+        return None
+    if role == 'ORNATE':
+        return fam.ornate
+    try:
+        return getattr(fam, basisfamily_roles[role])
+    except KeyError:
+        return None
+
+
+def corresponding_families(name, role=None):
+    """Function to return the list of BasisFamily objects for which
+    the auxiliary basis *name* in coded or ornate form serves as fitting
+    basis *role* (JFIT, JKFIT, RIFIT, or DUALFIT), or as any of them if
+    *role* is ``None``. An empty list is returned if none is found.
+
+    """
+    load_basis_families()
+
+    if role is not None:
+        role = role.upper()
+    try:
+        index = basisfamily_reverse_index[role]
+    except KeyError:
+        raise ValidationError("""corresponding_families: role must be JFIT, JKFIT, RIFIT, or DUALFIT, not %s""" % (role))
+    return list(index.get(sanitize_basisname(name), []))
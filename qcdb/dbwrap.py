@@ -31,6 +31,9 @@ from __future__ import print_function
 import os
 import sys
 import math
+import csv
+import json
+import hashlib
 
 try:
     import cPickle as pickle
@@ -42,9 +45,17 @@ try:
     from collections import OrderedDict
 except ImportError:
     from oldpymodules import OrderedDict
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+try:
+    import numpy as np
+except ImportError:
+    np = None
 from .exceptions import *
 from .molecule import Molecule
-from .modelchems import Method, BasisSet, Error, methods, bases, errors, pubs
+from .modelchems import Method, BasisSet, Error, Publication, methods, bases, errors, pubs
 from . import psiutil
 from . import textables
 if sys.version_info >= (3, 0):
@@ -140,6 +151,56 @@ def average_errors(*args):
     return avgerror
 
 
+def columnar_errors(err, mask):
+    """From array *err* of shape (5, Nrxn, Nmc) holding linear, relative,
+    capped, balanced errors and balanced weight for each reaction and
+    model chemistry, computes the statistics of compute_statistics for
+    all model chemistries at once. Boolean array *mask* of shape (Nrxn,
+    Nmc) marks which reactions participate for each model chemistry.
+    Returns list over model chemistries of error dictionaries.
+
+    """
+    if mask.shape[0] == 0:
+        return [initialize_errors() for mc in range(mask.shape[1])]
+    tags = ['e', 'pe', 'pbe', 'pce']
+    Nrxn = mask.sum(axis=0)
+    # forms x reactions x modelchems, ordered as tags
+    forms = err[[0, 1, 3, 2]]
+    vals = np.where(mask, forms, 0.0)
+    absv = np.abs(vals)
+    sums = vals.sum(axis=1)
+    sqrs = (vals ** 2).sum(axis=1)
+    denom = np.tile(Nrxn.astype(float), (4, 1))
+    denom[2] = np.where(mask, err[4], 0.0).sum(axis=0)  # balanced weight
+    forms_ix = np.arange(4)[:, None]
+    cols_ix = np.arange(mask.shape[1])[None, :]
+
+    sweep = OrderedDict()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sweep['pex'] = np.where(mask, forms, -np.inf).max(axis=1)
+        sweep['nex'] = np.where(mask, forms, np.inf).min(axis=1)
+        sweep['max'] = vals[forms_ix, np.where(mask, absv, -1.0).argmax(axis=1), cols_ix]
+        sweep['min'] = vals[forms_ix, np.where(mask, absv, np.inf).argmin(axis=1), cols_ix]
+        sweep['m'] = sums / denom
+        sweep['ma'] = absv.sum(axis=1) / denom
+        sweep['rms'] = np.sqrt(sqrs / denom)
+        sweep['std'] = np.sqrt((sqrs - sums ** 2 / Nrxn) / Nrxn)
+
+    sweep = OrderedDict((m, arr.T.tolist()) for m, arr in sweep.items())
+    errors = []
+    for mc in range(mask.shape[1]):
+        if Nrxn[mc] == 0:
+            errors.append(initialize_errors())
+            continue
+        error = OrderedDict()
+        for ie, e in enumerate(tags):
+            for m, arr in sweep.items():
+                error[m + e] = arr[mc][ie]
+        error['stdpbe'] = None  # get math domain errors w/wt in denom
+        errors.append(error)
+    return errors
+
+
 def format_errors(err, mode=1):
     """From error dictionary *err*, returns a LaTeX-formatted string,
     after handling None entries.
@@ -290,6 +351,18 @@ def fancify_mc_tag(mc, latex=False):
     return text
 
 
+def _registered(library, cls, key):
+    """Returns the *cls* entry for *key* in modelchem *library*, registering
+    a bare one as WrappedDatabase does for reference values if absent.
+
+    """
+    try:
+        return library[key]
+    except KeyError:
+        library[key] = cls(name=key)
+        return library[key]
+
+
 class ReactionDatum(object):
     """Piece of quantum chemical information that describes a qcdb.Reaction object.
 
@@ -391,19 +464,21 @@ class Subset(object):
 
 class Reagent(object):
     """Chemical entity only slightly dresed up from qcdb.Molecule.
+    Geometry work on the molecule (update_geometry with its symmetry
+    detection, then NRE and psi4 string) is deferred until NRE or mol is
+    first accessed, so that statistics-only use of a database skips it.
 
     """
-    __slots__ = ('name', 'NRE', 'mol', 'tagl', 'charge')
+    __slots__ = ('name', '_NRE', '_mol', 'tagl', 'charge', 'molecule')
     def __init__(self, name, mol, tagl=None, comment=None):
         # full name, e.g., 'S22-2-dimer' or 'NBC1-BzMe-8.0-monoA-CP' or 'HTBH-HCl-reagent'
         self.name = name
-        # qcdb.Molecule
-        try:
-            self.NRE = mol.nuclear_repulsion_energy()
-        except AttributeError:
+        # qcdb.Molecule, held until NRE or mol needed, then released
+        if not hasattr(mol, 'nuclear_repulsion_energy'):
             raise ValidationError("""Reagent must be instantiated with qcdb.Molecule object.""")
-        else:
-            self.mol = mol.create_psi4_string_from_molecule()
+        self.molecule = mol
+        self._NRE = None
+        self._mol = None
         # description line
         self.tagl = tagl
         # # addl comments
@@ -416,7 +491,51 @@ class Reagent(object):
         # self.frchg = mol.fragment_charges
         # # frag multiplicity
         # self.frmult = mol.fragment_multiplicities
-        self.charge = mol.molecular_charge()
+        # charge as update_geometry would leave it, without the geometry work
+        if mol.nfragments() < 2:
+            self.charge = mol.molecular_charge()
+        else:
+            self.charge = sum([mol.fragment_charges[fr] for fr in range(mol.nfragments())
+                               if mol.fragment_types[fr] == 'Real'])
+
+    def _update(self):
+        """Updates the held molecule and takes its NRE and psi4 string."""
+        self.molecule.update_geometry()
+        self._NRE = self.molecule.nuclear_repulsion_energy()
+        self._mol = self.molecule.create_psi4_string_from_molecule()
+        self.molecule = None
+
+    @property
+    def NRE(self):
+        """nuclear repulsion energy"""
+        if self._NRE is None:
+            self._update()
+        return self._NRE
+
+    @NRE.setter
+    def NRE(self, value):
+        self._NRE = value
+
+    @property
+    def mol(self):
+        """psi4 string of the updated geometry"""
+        if self._mol is None:
+            self._update()
+        return self._mol
+
+    @mol.setter
+    def mol(self, value):
+        self._mol = value
+
+    def __getstate__(self):
+        # pickles in the eager format, with geometry work done
+        return (None, {'name': self.name, 'NRE': self.NRE, 'mol': self.mol,
+                       'tagl': self.tagl, 'charge': self.charge})
+
+    def __setstate__(self, state):
+        self.molecule = None
+        for attr, value in state[1].items():
+            setattr(self, attr, value)
 
     def __str__(self):
         text = ''
@@ -596,6 +715,381 @@ class Reaction(object):
             return filedict, htmlcode
 
 
+#: format version of binary database caches written by WrappedDatabase.write_cache
+CACHE_VERSION = 1
+
+
+def _source_signature(filename, cachedir):
+    """Returns [path relative to *cachedir*, size, mtime, sha1] of source
+    *filename* for recording in a binary cache.
+
+    """
+    with open(filename, 'rb') as handle:
+        sha1 = hashlib.sha1(handle.read()).hexdigest()
+    stat = os.stat(filename)
+    return [os.path.relpath(os.path.abspath(filename), cachedir), stat.st_size, stat.st_mtime, sha1]
+
+
+def _module_source(module):
+    """Returns the source filename of imported *module*."""
+    filename = os.path.abspath(module.__file__)
+    return filename[:-1] if filename.endswith('.pyc') else filename
+
+
+def _open_csv(filename, mode):
+    """Opens *filename* in read or write *mode* as the csv module expects."""
+    if sys.version_info >= (3, 0):
+        return open(filename, mode, newline='')
+    return open(filename, mode + 'b')
+
+
+def _stale_sources(signatures, cachedir):
+    """Returns the source files among *signatures* recorded in a binary
+    cache in *cachedir* that have since changed. Unchanged size and mtime
+    are trusted; otherwise contents are compared by hash. Sources no longer
+    present are not checkable and so not stale.
+
+    """
+    stale = []
+    for relpath, size, mtime, sha1 in signatures:
+        filename = os.path.normpath(os.path.join(cachedir, relpath))
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            continue
+        if stat.st_size == size and stat.st_mtime == mtime:
+            continue
+        with open(filename, 'rb') as handle:
+            if hashlib.sha1(handle.read()).hexdigest() != sha1:
+                stale.append(filename)
+    return stale
+
+
+class ReactionDataStore(object):
+    """Columnar backing store for the quantum chemical data of all
+    qcdb.Reaction-s in a qcdb.WrappedDatabase. Values are held in a
+    reactions x modelchems float matrix with NaN marking absent data,
+    indexed by reaction name and modelchem label, so that statistics
+    over many reactions and model chemistries can be computed in a single
+    vectorized pass. The qcdb.ReactionDatum objects carrying method,
+    basis, and citation information are kept alongside, per reaction.
+    Requires NumPy.
+
+    """
+
+    def __init__(self, hrxn, dbse=None):
+        # database name for qcdb.ReactionDatum-s formed on demand
+        self.dbse = dbse
+        # OrderedDict of reaction name to matrix row
+        self.rxnidx = OrderedDict()
+        for rxn in hrxn:
+            self.rxnidx[rxn] = len(self.rxnidx)
+        # array of reaction names by matrix row
+        self.rxns = list(self.rxnidx.keys())
+        # OrderedDict of modelchem label to matrix column
+        self.mcidx = OrderedDict()
+        # array of modelchem labels by matrix column
+        self.labels = []
+        # reactions x modelchems values, allocated in column blocks
+        self.values = np.full((len(self.rxnidx), 16), np.nan)
+        # per-reaction dictionaries of modelchem label to qcdb.ReactionDatum
+        self.datums = [OrderedDict() for rxn in self.rxnidx]
+        # reactions x modelchems x (method, mode, basis, citation) indices
+        #   into self.strings for data bulk loaded without qcdb.ReactionDatum
+        #   objects, None until first such load
+        self.codes = None
+        # string table for self.codes, with None at index 0
+        self.strings = [None]
+        self.stridx = {None: 0}
+
+    def __str__(self):
+        text = ''
+        text += """  ==> ReactionDataStore <==\n\n"""
+        text += """  Reactions:            %d\n""" % (len(self.rxnidx))
+        text += """  Model Chemistries:    %d\n""" % (len(self.mcidx))
+        text += """  Data:                 %d\n""" % (np.count_nonzero(~np.isnan(self.matrix())))
+        text += """\n"""
+        return text
+
+    def column(self, label):
+        """Returns the matrix column of modelchem *label*, registering
+        *label* and enlarging the matrix if necessary.
+
+        """
+        try:
+            return self.mcidx[label]
+        except KeyError:
+            col = len(self.mcidx)
+            if col == self.values.shape[1]:
+                grown = np.full((self.values.shape[0], 2 * col), np.nan)
+                grown[:, :col] = self.values
+                self.values = grown
+                if self.codes is not None:
+                    grown = np.zeros((self.codes.shape[0], 2 * col, 4), dtype=self.codes.dtype)
+                    grown[:, :col] = self.codes
+                    self.codes = grown
+            self.mcidx[label] = col
+            self.labels.append(label)
+            return col
+
+    def set_datum(self, row, label, datum):
+        """Stores qcdb.ReactionDatum *datum* as modelchem *label* of reaction *row*."""
+        col = self.column(label)
+        self.values[row, col] = datum.value
+        self.datums[row][label] = datum
+
+    def del_datum(self, row, label):
+        """Removes modelchem *label* from reaction *row*."""
+        if not self.has_datum(row, label):
+            raise KeyError(label)
+        self.datums[row].pop(label, None)
+        self.values[row, self.mcidx[label]] = np.nan
+
+    def has_datum(self, row, label):
+        """Returns whether reaction *row* has data for modelchem *label*."""
+        col = self.mcidx.get(label)
+        return col is not None and not np.isnan(self.values[row, col])
+
+    def datum(self, row, label):
+        """Returns the qcdb.ReactionDatum for modelchem *label* of reaction
+        *row*, forming it from the string table if bulk loaded.
+
+        """
+        try:
+            return self.datums[row][label]
+        except KeyError:
+            if not self.has_datum(row, label) or self.codes is None:
+                raise KeyError(label)
+        col = self.mcidx[label]
+        method, mode, basis, citation = [self.strings[code] for code in self.codes[row, col]]
+        datum = ReactionDatum(dbse=self.dbse, rxn=self.rxns[row],
+                              method=_registered(methods, Method, method),
+                              mode=mode,
+                              basis=_registered(bases, BasisSet, basis),
+                              citation=None if citation is None else _registered(pubs, Publication, citation),
+                              value=self.values[row, col])
+        self.datums[row][label] = datum
+        return datum
+
+    def row_labels(self, row):
+        """Returns the modelchem labels with data for reaction *row*."""
+        present = np.flatnonzero(~np.isnan(self.values[row, :len(self.labels)]))
+        return [self.labels[col] for col in present]
+
+    def intern(self, strings):
+        """Returns integer array of string table indices for array *strings*,
+        registering any not yet present.
+
+        """
+        codes = []
+        for item in strings:
+            try:
+                codes.append(self.stridx[item])
+            except KeyError:
+                self.stridx[item] = len(self.strings)
+                self.strings.append(item)
+                codes.append(self.stridx[item])
+        return np.array(codes, dtype=np.int32)
+
+    def ingest(self, rows, cols, values, codes):
+        """Stores *values* at matrix positions *rows* and *cols* without
+        forming qcdb.ReactionDatum objects. Array *codes* holds for each value
+        the (method, mode, basis, citation) indices returned by intern(),
+        from which the qcdb.ReactionDatum is formed when first accessed.
+        Supersedes any data already present at those positions.
+
+        """
+        if self.codes is None:
+            self.codes = np.zeros(self.values.shape + (4,), dtype=np.int32)
+        self.values[rows, cols] = values
+        self.codes[rows, cols] = codes
+        stale = [row for row in np.unique(rows) if self.datums[row]]
+        if stale:
+            hit = np.zeros(self.values.shape, dtype=bool)
+            hit[rows, cols] = True
+            for row in stale:
+                for label in [label for label in self.datums[row] if hit[row, self.mcidx[label]]]:
+                    del self.datums[row][label]
+
+    def matrix(self, modelchems=None):
+        """Returns the reactions x modelchems matrix of values, restricted
+        to and ordered by array *modelchems* if given. Labels never stored
+        give columns of NaN.
+
+        """
+        if modelchems is None:
+            return self.values[:, :len(self.mcidx)]
+        cols = [self.mcidx.get(mc, -1) for mc in modelchems]
+        block = self.values[:, [max(col, 0) for col in cols]]
+        block[:, [ix for ix, col in enumerate(cols) if col < 0]] = np.nan
+        return block
+
+    def rows(self, rxns):
+        """Returns integer array of matrix rows for reaction names *rxns*."""
+        return np.array([self.rxnidx[rxn] for rxn in rxns], dtype=int)
+
+    def modelchems(self, union=True):
+        """Returns the labels of model chemistries that have data for any
+        reaction if *union* is True or for all reactions if *union* is False.
+
+        """
+        present = ~np.isnan(self.matrix())
+        hits = present.any(axis=0) if union else present.all(axis=0)
+        return [mc for mc, col in self.mcidx.items() if hits[col]]
+
+
+class ReactionDataView(MutableMapping):
+    """Dictionary-like view of a single reaction's row in a
+    qcdb.ReactionDataStore, mapping modelchem labels to
+    qcdb.ReactionDatum objects. Installed as Reaction.data so that
+    reading and assigning data through the reaction keeps the columnar
+    store current. Pickles as a plain dictionary.
+
+    """
+    __slots__ = ('store', 'row')
+
+    def __init__(self, store, row):
+        self.store = store
+        self.row = row
+
+    def __getitem__(self, label):
+        return self.store.datum(self.row, label)
+
+    def __setitem__(self, label, datum):
+        self.store.set_datum(self.row, label, datum)
+
+    def __delitem__(self, label):
+        self.store.del_datum(self.row, label)
+
+    def __iter__(self):
+        return iter(self.store.row_labels(self.row))
+
+    def __len__(self):
+        return len(self.store.row_labels(self.row))
+
+    def __contains__(self, label):
+        return self.store.has_datum(self.row, label)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class ReactionStoichiometry(object):
+    """Sparse reactions x reagents stoichiometry matrix of ACTV mode *mode*
+    over the qcdb.Reaction-s of OrderedDict *hrxn*, gathered from each
+    Reaction.rxnm[*mode*] and held in compressed sparse row form. Maps
+    reagent energies to reaction energies for all reactions, and for all
+    model chemistries when given a reagents x modelchems matrix, in a
+    single sparse product rather than a Python loop over each reaction's
+    reagents. Requires NumPy.
+
+    >>> asdf.stoich['CP'].reactionate(rgtvals) * qcdb.psi_hartree2kcalmol
+    """
+
+    def __init__(self, hrxn, mode='default'):
+        # ACTV mode, e.g., 'default', 'CP', or 'SA'
+        self.mode = mode
+        # array of reaction names by matrix row
+        self.rxns = list(hrxn.keys())
+        # OrderedDict of reagent name to matrix column, in order of first appearance
+        self.rgtidx = OrderedDict()
+        indptr = [0]
+        indices = []
+        data = []
+        for rxn, orxn in hrxn.items():
+            try:
+                rxnm = orxn.rxnm[mode]
+            except KeyError:
+                raise ValidationError("""Reaction %s has no stoichiometry for mode %s.""" % (orxn.dbrxn, mode))
+            for orgt, coeff in rxnm.items():
+                indices.append(self.rgtidx.setdefault(orgt.name, len(self.rgtidx)))
+                data.append(coeff)
+            indptr.append(len(indices))
+        # array of reagent names by matrix column
+        self.rgts = list(self.rgtidx.keys())
+        # CSR arrays: the coefficients data[indptr[row]:indptr[row + 1]]
+        #   of reaction row fall in reagent columns indices[same]
+        self.indptr = np.array(indptr, dtype=int)
+        self.indices = np.array(indices, dtype=int)
+        self.data = np.array(data, dtype=float)
+        self.shape = (len(self.rxns), len(self.rgts))
+
+    def __str__(self):
+        text = ''
+        text += """  ==> %s ReactionStoichiometry <==\n\n""" % (self.mode)
+        text += """  Reactions:            %d\n""" % (self.shape[0])
+        text += """  Reagents:             %d\n""" % (self.shape[1])
+        text += """  Contributions:        %d\n""" % (len(self.data))
+        text += """\n"""
+        return text
+
+    def dense(self):
+        """Returns the reactions x reagents stoichiometry as a dense array."""
+        matrix = np.zeros(self.shape)
+        matrix[np.repeat(np.arange(self.shape[0]), np.diff(self.indptr)), self.indices] = self.data
+        return matrix
+
+    def reagent_values(self, energies):
+        """Returns array of shape (Nrgt) or (Nrgt, Nmc) ordered by
+        *self.rgts* from dictionary *energies* of reagent name to energy
+        or to array of Nmc energies. Reagents absent are NaN.
+
+        """
+        present = [energies[rgt] for rgt in self.rgts if rgt in energies]
+        shape = np.shape(present[0]) if present else ()
+        values = np.full((self.shape[1],) + shape, np.nan)
+        for col, rgt in enumerate(self.rgts):
+            if rgt in energies:
+                values[col] = energies[rgt]
+        return values
+
+    def reactionate(self, energies):
+        """Returns reaction energies in row order *self.rxns* as array of
+        shape (Nrxn) or (Nrxn, Nmc) from reagent energies *energies*, an
+        array of shape (Nrgt) or (Nrgt, Nmc) ordered by *self.rgts* or a
+        dictionary accepted by reagent_values(). A reaction is NaN if the
+        energy of any of its reagents is NaN. Units are those of *energies*.
+
+        """
+        if isinstance(energies, dict):
+            energies = self.reagent_values(energies)
+        energies = np.asarray(energies, dtype=float)
+        if energies.shape[0] != self.shape[1]:
+            raise ValidationError("""Reagent energies of length %d for %d reagents of mode %s.""" %
+                                  (energies.shape[0], self.shape[1], self.mode))
+        weighted = self.data.reshape((-1,) + (1,) * (energies.ndim - 1)) * energies[self.indices]
+        rxnvals = np.zeros((self.shape[0],) + energies.shape[1:])
+        # reduceat misreads empty segments, so sum only reactions with reagents
+        filled = np.diff(self.indptr) > 0
+        if filled.any():
+            rxnvals[filled] = np.add.reduceat(weighted, self.indptr[:-1][filled], axis=0)
+        return rxnvals
+
+
+class ReactionDatumRecorder(object):
+    """Stand-in for a qcdb.WrappedDatabase passed to the load functions of
+    data modules by WrappedDatabase.write_qcdata_sidecar(). Each
+    add_ReactionDatum call is passed through to the database, so validated
+    as usual, and recorded by reaction name in *records*.
+
+    """
+
+    def __init__(self, wdb):
+        self.wdb = wdb
+        self.records = []
+
+    def add_ReactionDatum(self, dbse, rxn, method, mode, basis, value, units='kcal/mol', citation=None, comment=None,
+                          overwrite=False):
+        if units != 'kcal/mol' or comment is not None or overwrite:
+            raise ValidationError("""ReactionDatum for %s not representable in sidecar.""" % (dbse + '-' + str(rxn)))
+        self.wdb.add_ReactionDatum(dbse=dbse, rxn=rxn, method=method, mode=mode, basis=basis, value=value,
+                                   citation=citation)
+        self.records.append((self.wdb._reaction_name(rxn), method, mode, basis, value, citation))
+
+
 class WrappedDatabase(object):
     """Wrapper class for raw Psi4 database modules that does some validation
     of contents, creates member data and accessors for database structures,
@@ -649,12 +1143,32 @@ class WrappedDatabase(object):
         #: object of defined reaction subsets.
         self.oss = None
 
+        #: columnar store of quantum chemical data behind each Reaction.data,
+        #: None if NumPy unavailable
+        #:
+        #: >>> print asdf.store.matrix().shape
+        #: (210, 3)
+        self.store = None
+
+        #: OrderedDict of ACTV mode to qcdb.ReactionStoichiometry over all
+        #: reactions, None if NumPy unavailable
+        #:
+        #: >>> print asdf.stoich['CP'].shape
+        #: (210, 630)
+        self.stoich = None
+
+        #: source files from which the database was formed, checked for
+        #: staleness when reading a binary cache written by write_cache()
+        self.sources = []
+
         # load database
         if pythonpath is not None:
             sys.path.insert(1, pythonpath)
         else:
             sys.path.append(os.path.dirname(__file__) + '/../databases')
-        database = psiutil.import_ignorecase(dbname)
+        # geometry work on extracted fragments is left to qcdb.Reagent
+        with Molecule.deferred_extract_update():
+            database = psiutil.import_ignorecase(dbname)
         if not database:
             print('\nPython module for database %s failed to load\n\n' % (dbname))
             print('\nSearch path that was tried:\n')
@@ -675,6 +1189,7 @@ class WrappedDatabase(object):
 
         # form database name
         self.dbse = database.dbse
+        self.sources.append(_module_source(database))
         try:
             self.tagl = database.TAGL['dbse']
         except KeyError:
@@ -693,7 +1208,6 @@ class WrappedDatabase(object):
         # form qcdb.Reagent objects from all defined geometries, GEOS
         oHRGT = {}
         for rgt, mol in database.GEOS.items():
-            mol.update_geometry()
             try:
                 tagl = database.TAGL[rgt]
             except KeyError:
@@ -713,6 +1227,7 @@ class WrappedDatabase(object):
         except ImportError:
             print("""Warning: DATA['SAPT * ENERGY'] missing b/c no file %s""" % (modname))
         else:
+            self.sources.append(_module_source(datamodule))
             try:
                 saptDATA = getattr(datamodule, 'DATA')
             except AttributeError:
@@ -743,6 +1258,7 @@ class WrappedDatabase(object):
                                   tagl=tagl)
         pieces.remove('HRXN')
         self.hrxn = oHRXN
+        self._attach_datastore()
 
         # list and align database stoichiometry modes, ACTV* and RXNM*
         oACTV = {}
@@ -765,6 +1281,7 @@ class WrappedDatabase(object):
                 for rgt in getattr(database, actvrxnm[0])[dbrxn]:
                     tdict[oHRGT[rgt]] = getattr(database, actvrxnm[1])[dbrxn][rgt]
                 oHRXN[rxn].rxnm[mode] = tdict
+        self._attach_stoichiometry()
 
         # list embedded quantum chem info per rxn, incl. BIND*
         arrsbind = [item for item in pieces if item.startswith('BIND_')]
@@ -913,6 +1430,51 @@ class WrappedDatabase(object):
         text += """\n"""
         return text
 
+    def __getstate__(self):
+        # store and stoich are reconstituted from the Reaction-s on unpickling
+        state = self.__dict__.copy()
+        state.pop('store', None)
+        state.pop('stoich', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._attach_datastore()
+        self._attach_stoichiometry()
+
+    def _attach_datastore(self):
+        """Forms a qcdb.ReactionDataStore over the reactions in *self.hrxn*
+        and replaces each Reaction.data with a view into it, adopting any
+        data already present. Leaves plain dictionaries in place when NumPy
+        is unavailable.
+
+        """
+        if np is None:
+            self.store = None
+            return
+        self.store = ReactionDataStore(self.hrxn.keys(), dbse=self.dbse)
+        for rxn, orxn in self.hrxn.items():
+            present = orxn.data
+            orxn.data = ReactionDataView(self.store, self.store.rxnidx[rxn])
+            orxn.data.update(present)
+
+    def _attach_stoichiometry(self):
+        """Forms a qcdb.ReactionStoichiometry over the reactions in
+        *self.hrxn* for each ACTV mode defined for all of them. Leaves None
+        when NumPy is unavailable.
+
+        """
+        if np is None:
+            self.stoich = None
+            return
+        modes = []
+        for orxn in self.hrxn.values():
+            modes.extend([mode for mode in sorted(orxn.rxnm) if mode not in modes])
+        self.stoich = OrderedDict()
+        for mode in modes:
+            if all(mode in orxn.rxnm for orxn in self.hrxn.values()):
+                self.stoich[mode] = ReactionStoichiometry(self.hrxn, mode)
+
     def add_ReactionDatum(self, dbse, rxn, method, mode, basis, value, units='kcal/mol', citation=None, comment=None,
                           overwrite=False):
         """Add a new quantum chemical value to *rxn* by creating a
@@ -922,16 +1484,7 @@ class WrappedDatabase(object):
 
         """
         if (self.dbse == dbse):
-            if rxn in self.hrxn:
-                rxnname = rxn  # rxn is proper reaction name
-            else:
-                try:
-                    if (rxn + 1 > 0) and (rxn == self.hrxn.items()[rxn - 1][1].indx):
-                        rxnname = self.hrxn.items()[rxn - 1][1].name  # rxn is reaction index (maybe dangerous?)
-                except (TypeError, IndexError):
-                    raise ValidationError(
-                        """Inconsistent to add ReactionDatum for %s to database %s with reactions %s.""" %
-                        (dbse + '-' + str(rxn), self.dbse, self.hrxn.keys()))
+            rxnname = self._reaction_name(rxn)
             label = '-'.join([method, mode, basis])
             if overwrite or (label not in self.hrxn[rxnname].data):
                 self.hrxn[rxnname].data[label] = ReactionDatum.library_modelchem(dbse=dbse, rxn=rxnname,
@@ -944,6 +1497,118 @@ class WrappedDatabase(object):
             raise ValidationError("""Inconsistent to add ReactionDatum for %s to database %s.""" %
                                   (dbse + '-' + str(rxn), self.dbse))
 
+    def _reaction_name(self, rxn):
+        """Returns the name of the reaction designated by *rxn*, which may be
+        actual Reaction.name or Reaction.indx.
+
+        """
+        if rxn in self.hrxn:
+            return rxn  # rxn is proper reaction name
+        try:
+            if rxn + 1 > 0:
+                if self.store is None:
+                    orxn = list(self.hrxn.values())[rxn - 1]
+                else:
+                    orxn = self.hrxn[self.store.rxns[rxn - 1]]
+                if rxn == orxn.indx:
+                    return orxn.name  # rxn is reaction index (maybe dangerous?)
+        except (TypeError, IndexError):
+            pass
+        raise ValidationError(
+            """Inconsistent to add ReactionDatum for %s to database %s with reactions %s.""" %
+            (self.dbse + '-' + str(rxn), self.dbse, self.hrxn.keys()))
+
+    def add_ReactionDatums(self, dbse, rxn, method, mode, basis, value, citation=None, overwrite=False):
+        """Add many new quantum chemical values at once. Arguments are
+        those of add_ReactionDatum, each either an array parallel to array
+        *value* or a single item applying to all values. Reactions are
+        resolved through one map of names and indices, and each distinct
+        method, basis, and citation is validated once. Rather than raising
+        on the first problem, values that can't be added are skipped and
+        returned as a list of (dbrxn, label, reason) tuples, empty if all
+        were added. Values already present or repeated are conflicts unless
+        *overwrite*, in which case the last one wins.
+
+        >>> asdf.add_ReactionDatums('S22', [1, 2], 'B3LYP', 'CP', 'adz', [-2.1008, -4.4156], citation='dft')
+        []
+
+        """
+        if self.dbse != dbse:
+            raise ValidationError("""Inconsistent to add ReactionDatums for %s to database %s.""" %
+                                  (dbse, self.dbse))
+        nval = len(value)
+        rxn, method, mode, basis, citation = [[item] * nval if isinstance(item, basestring) or not hasattr(item, '__len__')
+                                              else list(item) for item in [rxn, method, mode, basis, citation]]
+        if self.store is None:
+            conflicts = []
+            for args in zip(rxn, method, mode, basis, value, citation):
+                try:
+                    self.add_ReactionDatum(dbse, *args[:5], citation=args[5], overwrite=overwrite)
+                except ValidationError as e:
+                    conflicts.append((dbse + '-' + str(args[0]), '-'.join(args[1:4]), e.msg))
+            return conflicts
+
+        # reaction names and indices through one map
+        names = OrderedDict()
+        for pos, (rxnname, orxn) in enumerate(self.hrxn.items()):
+            if orxn.indx == pos + 1:
+                names[orxn.indx] = rxnname
+        for rxnname in self.hrxn:
+            names[rxnname] = rxnname
+
+        # one validation per distinct string against the modelchem libraries
+        keys = {}
+        for library, kind, items, case in [(methods, 'method', method, str.upper),
+                                           (bases, 'basis', basis, str.lower),
+                                           (pubs, 'publication', citation, str.lower)]:
+            for item in set(items):
+                if item is None and kind == 'publication':
+                    keys[(kind, item)] = None
+                elif case(str(item)) in library:
+                    keys[(kind, item)] = case(str(item))
+
+        labels = ['-'.join(mc) for mc in zip(method, mode, basis)]
+        reasons = []
+        for rx, mtd, bas, cit in zip(rxn, method, basis, citation):
+            if rx not in names:
+                reasons.append('reaction not in database')
+            elif ('method', mtd) not in keys:
+                reasons.append('method %s not in library' % (mtd))
+            elif ('basis', bas) not in keys:
+                reasons.append('basis %s not in library' % (bas))
+            elif ('publication', cit) not in keys:
+                reasons.append('citation %s not in library' % (cit))
+            else:
+                reasons.append(None)
+        good = [ix for ix, reason in enumerate(reasons) if reason is None]
+
+        rows = self.store.rows([names[rxn[ix]] for ix in good])
+        cols = np.array([self.store.column(labels[ix]) for ix in good], dtype=int)
+        flat = rows * self.store.values.shape[1] + cols
+        # last of repeats wins if overwriting, else first
+        repeat = np.ones(len(good), dtype=bool)
+        if overwrite:
+            repeat[len(good) - 1 - np.unique(flat[::-1], return_index=True)[1]] = False
+        else:
+            repeat[np.unique(flat, return_index=True)[1]] = False
+            present = ~np.isnan(self.store.values[rows, cols])
+            for ix in np.flatnonzero(present & ~repeat):
+                reasons[good[ix]] = 'already present in database'
+        for ix in np.flatnonzero(repeat):
+            reasons[good[ix]] = 'repeated'
+        keep = np.array([reasons[ix] is None for ix in good], dtype=bool)
+        good = [ix for ix in good if reasons[ix] is None]
+
+        codes = np.column_stack([self.store.intern([keys[('method', method[ix])] for ix in good]),
+                                 self.store.intern([mode[ix] for ix in good]),
+                                 self.store.intern([keys[('basis', basis[ix])] for ix in good]),
+                                 self.store.intern([keys[('publication', citation[ix])] for ix in good])])
+        self.store.ingest(rows[keep], cols[keep], np.array([value[ix] for ix in good], dtype=float),
+                          codes.reshape(-1, 4))
+
+        return [(dbse + '-' + str(rxn[ix]), labels[ix], reason) for ix, reason in enumerate(reasons)
+                if reason is not None]
+
     def add_Subset(self, name, func):
         """Define a new subset labeled *name* by providing a function
         *func* that filters *self.hrxn*.
@@ -969,12 +1634,10 @@ class WrappedDatabase(object):
                                  tagl=tagl)
         print("""WrappedDatabase %s: Subset %s formed: %d""" % (self.dbse, label, len(self.sset[label].keys())))
 
-    def compute_errors(self, modelchem, benchmark='default', sset='default', failoninc=True, verbose=False):
-        """For full database or subset *sset*, computes raw reaction
-        errors between *modelchem* and *benchmark* model chemistries.
-        Returns error if model chemistries are missing for any reaction in
-        subset unless *failoninc* set to False, whereupon returns partial.
-        Returns dictionary of reaction labels and error forms.
+    def _resolve_subset(self, sset):
+        """Returns OrderedDict of reaction names and qcdb.Reaction objects
+        for subset *sset*, which may be a subset name, a function that
+        generates a subset of HRXN from *self*, or an array of reactions.
 
         """
         if isinstance(sset, basestring):
@@ -995,6 +1658,101 @@ class WrappedDatabase(object):
             lsset = OrderedDict()
             for rxn in lsslist:
                 lsset[rxn] = self.hrxn[rxn]
+        return lsset
+
+    def _columnar_values(self, modelchems, benchmark, rxns):
+        """Gathers from the columnar store the values of each of array
+        *modelchems* and of *benchmark* for reaction names *rxns*. Returns
+        array of shape (Nrxn, Nmc) and array of shape (Nrxn), the latter
+        None when *benchmark* is 'ZEROS'. Absent data are NaN.
+
+        """
+        rows = self.store.rows(rxns)
+        mcval = self.store.matrix(modelchems)[rows]
+        if benchmark == 'ZEROS':
+            return mcval, None
+        lbench = [self.hrxn[rxn].benchmark if benchmark == 'default' else benchmark for rxn in rxns]
+        bms = sorted(set(lbench), key=lbench.index)
+        bmval = self.store.matrix(bms)[rows, [bms.index(bm) for bm in lbench]]
+        return mcval, bmval
+
+    @staticmethod
+    def _columnar_errors_from_values(rxns, modelchems, mcval, bmval, failoninc=True):
+        """Forms raw reaction errors from values *mcval* and *bmval* as
+        gathered by _columnar_values for reaction names *rxns* and array
+        *modelchems*. Returns array of shape (5, Nrxn, Nmc) of error forms
+        as in compute_errors and boolean array of shape (Nrxn, Nmc) marking
+        the reactions for which both modelchem and benchmark are present.
+
+        """
+        mcpresent = ~np.isnan(mcval)
+        if failoninc and not mcpresent.all():
+            mcix = np.flatnonzero(~mcpresent.all(axis=0))[0]
+            rxnix = np.flatnonzero(~mcpresent[:, mcix])[0]
+            raise ValidationError("""Reaction %s missing datum %s.""" % (str(rxns[rxnix]), repr(modelchems[mcix])))
+
+        err = np.zeros((5,) + mcval.shape)
+        err[4] = 1.0  # FAKE
+        if bmval is None:
+            err[0] = mcval
+            return err, mcpresent
+
+        bmpresent = ~np.isnan(bmval)
+        for rxnix in np.flatnonzero(~bmpresent & mcpresent.any(axis=1)):
+            print("""Reaction %s missing benchmark""" % (str(rxns[rxnix])))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            err[0] = mcval - bmval[:, None]
+            err[1] = err[0] / np.abs(bmval)[:, None]
+            err[2] = err[1]  # FAKE
+            err[3] = err[1]  # FAKE
+        return err, mcpresent & bmpresent[:, None]
+
+    def _columnar_errors(self, modelchems, benchmark='default', sset='default', failoninc=True):
+        """For full database or subset *sset*, computes from the columnar
+        store raw reaction errors between each of array *modelchems* and
+        *benchmark* model chemistries. Returns list of reaction names,
+        array of shape (5, Nrxn, Nmc) of error forms as in compute_errors,
+        and boolean array of shape (Nrxn, Nmc) marking the reactions for
+        which both modelchem and benchmark are present.
+
+        """
+        rxns = list(self._resolve_subset(sset).keys())
+        mcval, bmval = self._columnar_values(modelchems, benchmark, rxns)
+        err, mask = self._columnar_errors_from_values(rxns, modelchems, mcval, bmval, failoninc=failoninc)
+        return rxns, err, mask
+
+    @staticmethod
+    def _errors_by_reaction(rxns, cerr, mask, verbose=False):
+        """Repackages the columnar errors *cerr* of shape (5, Nrxn) of a
+        single model chemistry into the dictionary of reaction labels and
+        error forms returned by compute_errors, keeping reactions *rxns*
+        marked in *mask*.
+
+        """
+        err = {}
+        for rxnix in np.flatnonzero(mask):
+            rxn = rxns[rxnix]
+            err[rxn] = [float(val) for val in cerr[:, rxnix]]
+            if verbose:
+                print("""p = %8.4f, pe = %8.3f%%, pbe = %8.3f%% pce = %8.3f%% reaction %s.""" %
+                 (err[rxn][0], 100 * err[rxn][1], 100 * err[rxn][3], 100 * err[rxn][2], str(rxn)))
+        return err
+
+    def compute_errors(self, modelchem, benchmark='default', sset='default', failoninc=True, verbose=False):
+        """For full database or subset *sset*, computes raw reaction
+        errors between *modelchem* and *benchmark* model chemistries.
+        Returns error if model chemistries are missing for any reaction in
+        subset unless *failoninc* set to False, whereupon returns partial.
+        Returns dictionary of reaction labels and error forms.
+
+        """
+        if self.store is not None:
+            rxns, cerr, mask = self._columnar_errors([modelchem], benchmark=benchmark, sset=sset,
+                                                     failoninc=failoninc)
+            return self._errors_by_reaction(rxns, cerr[:, :, 0], mask[:, 0], verbose=verbose)
+
+        lsset = self._resolve_subset(sset)
 
 #        cureinfo = self.get_pec_weightinfo()
         err = {}
@@ -1053,6 +1811,24 @@ class WrappedDatabase(object):
         statistics labels and values.
 
         """
+        if self.store is not None:
+            rxns, cerr, mask = self._columnar_errors([modelchem], benchmark=benchmark, sset=sset,
+                                                     failoninc=failoninc)
+            error = columnar_errors(cerr, mask)[0]
+            err = None
+            if returnindiv or verbose:
+                err = self._errors_by_reaction(rxns, cerr[:, :, 0], mask[:, 0], verbose=verbose)
+            if verbose:
+                if len(err) == 0:
+                    print("""Warning: nothing to compute.""")
+                else:
+                    print("""%d systems in %s for %s vs. %s, subset %s.\n%s""" %
+                          (len(err), self.dbse, modelchem, benchmark, sset, format_errors(error, mode=2)))
+            if returnindiv:
+                return error, err
+            else:
+                return error
+
         err = self.compute_errors(modelchem, benchmark=benchmark, sset=sset, failoninc=failoninc, verbose=verbose)
         if len(err) == 0:
             error = initialize_errors()
@@ -1113,8 +1889,18 @@ class WrappedDatabase(object):
     def load_qcdata(self, modname, funcname, pythonpath=None, failoninc=True):
         """Loads qcdb.ReactionDatums from module *modname* function
         *funcname*. Module search path can be prepended with *pythonpath*.
+        If a current tabular sidecar modname.funcname.csv written by
+        write_qcdata_sidecar() is alongside, its values are bulk loaded
+        instead of importing the module.
 
         """
+        if self.store is not None:
+            sidecar = os.path.abspath(os.path.dirname(__file__) + '/../data' if pythonpath is None else pythonpath) + \
+                os.sep + modname + '.' + funcname + '.csv'
+            if os.path.isfile(sidecar) and self._load_qcdata_sidecar(sidecar):
+                print("""WrappedDatabase %s: %s %s results loaded from sidecar""" % (self.dbse, modname, funcname))
+                return
+
         if pythonpath is not None:
             sys.path.insert(1, pythonpath)
         else:
@@ -1141,6 +1927,73 @@ class WrappedDatabase(object):
 
         print("""WrappedDatabase %s: %s %s results loaded""" % (self.dbse, modname, funcname))
 
+    def write_qcdata_sidecar(self, modname, funcname, pythonpath=None, filename=None):
+        """Loads qcdb.ReactionDatums from module *modname* function
+        *funcname* as load_qcdata() does and writes them to tabular sidecar
+        *filename*, by default modname.funcname.csv alongside the module,
+        for later bulk loading by load_qcdata(). The module is recorded so
+        that the sidecar is disregarded once the module changes. Returns
+        *filename*.
+
+        """
+        if pythonpath is not None:
+            sys.path.insert(1, pythonpath)
+        else:
+            sys.path.append(os.path.dirname(__file__) + '/../data')
+        try:
+            datamodule = __import__(modname)
+        except ImportError:
+            raise ValidationError("""Python module loading problem for database data """ + str(modname))
+        source = _module_source(datamodule)
+        if filename is None:
+            filename = source[:-3] + '.' + funcname + '.csv'
+
+        recorder = ReactionDatumRecorder(self)
+        getattr(datamodule, funcname)(recorder)
+
+        header = OrderedDict()
+        header['version'] = CACHE_VERSION
+        header['dbse'] = self.dbse
+        header['sources'] = [_source_signature(source, os.path.dirname(os.path.abspath(filename)))]
+        with _open_csv(filename, 'w') as handle:
+            handle.write('# ' + json.dumps(header) + '\n')
+            writer = csv.writer(handle, lineterminator='\n')
+            writer.writerow(['rxn', 'method', 'mode', 'basis', 'value', 'citation'])
+            for rxn, mtd, mode, bas, value, citation in recorder.records:
+                writer.writerow([rxn, mtd, mode, bas, repr(float(value)), '' if citation is None else citation])
+        print("""WrappedDatabase %s: %s %s results written to sidecar %s""" % (self.dbse, modname, funcname, filename))
+        return filename
+
+    def _load_qcdata_sidecar(self, filename):
+        """Bulk loads the values of tabular sidecar *filename* written by
+        write_qcdata_sidecar(). Returns False without loading if the
+        sidecar is of an old format or stale with respect to its module.
+
+        """
+        with _open_csv(filename, 'r') as handle:
+            header = json.loads(handle.readline()[1:])
+            if header['version'] != CACHE_VERSION:
+                print("""Warning: Sidecar %s has format version %s, not %s.""" %
+                      (filename, header['version'], CACHE_VERSION))
+                return False
+            stale = _stale_sources(header['sources'], os.path.dirname(os.path.abspath(filename)))
+            if stale:
+                print("""Warning: Sidecar %s is stale with respect to %s.""" % (filename, ', '.join(stale)))
+                return False
+            reader = csv.reader(handle)
+            next(reader)
+            columns = list(zip(*reader)) or [()] * 6
+
+        names = dict((str(rxn), rxn) for rxn in self.hrxn)
+        conflicts = self.add_ReactionDatums(dbse=self.dbse, rxn=[names.get(rxn, rxn) for rxn in columns[0]],
+                                            method=columns[1], mode=columns[2], basis=columns[3],
+                                            value=[float(value) for value in columns[4]],
+                                            citation=[citation if citation else None for citation in columns[5]])
+        if conflicts:
+            raise ValidationError("""Sidecar %s has %d ReactionDatums not added, the first %s %s: %s.""" %
+                                  ((filename, len(conflicts)) + conflicts[0]))
+        return True
+
     def load_qcdata_byproject(self, project, pythonpath=None):
         """Loads qcdb.ReactionDatums from standard location for *project*
         :module dbse_project and function load_project. Module search path
@@ -1232,6 +2085,198 @@ class WrappedDatabase(object):
             instance = pickle.load(handle)
         return instance
 
+    def write_cache(self, filename=None, project=None, sources=None):
+        """Writes the reactions, reagents, subsets, and quantum chemical data
+        of the database to binary cache *filename*, by default
+        qcdb/data/dbse_WDb.npz. If *project* is given, writes instead only
+        the data to qcdb/data/dbse_hrxn_project.npz, the counterpart of the
+        reactions pickle. Files in array *sources*, by default those the
+        database was formed from or the dbse_project.py data module, are
+        recorded so that stale caches are refused on reading.
+
+        The cache is an uncompressed NPZ archive of a JSON header
+        (version, structure, reaction and modelchem labels, string table)
+        and flat arrays of each datum's matrix position, value, and
+        (method, mode, basis, citation) string indices. Returns *filename*.
+
+        """
+        if np is None:
+            raise ValidationError("""NumPy must be available to write binary cache.""")
+        datapath = os.path.abspath(os.path.dirname(__file__) + '/../data')
+        if filename is None:
+            filename = datapath + os.sep + self.dbse + ('_WDb.npz' if project is None else '_hrxn_' + project + '.npz')
+        if sources is None:
+            if project is None:
+                sources = getattr(self, 'sources', [])
+            else:
+                sources = [datapath + os.sep + self.dbse + '_' + project + '.py']
+        cachedir = os.path.dirname(os.path.abspath(filename))
+
+        header = OrderedDict()
+        header['version'] = CACHE_VERSION
+        header['dbse'] = self.dbse
+        header['project'] = project
+        header['sources'] = [_source_signature(src, cachedir) for src in sources if os.path.isfile(src)]
+        header['structure'] = self._cache_structure() if project is None else None
+
+        # registry keys rather than names, which differ in case for references
+        keys = {}
+        for library in [methods, bases, pubs]:
+            for key, obj in library.items():
+                keys[id(obj)] = key
+
+        labels = self.store.modelchems()
+        rows, cols = np.nonzero(~np.isnan(self.store.matrix(labels)))
+        strings = OrderedDict([(None, 0)])
+        codes = np.zeros((len(rows), 4), dtype=np.int32)
+        for ix, (row, col) in enumerate(zip(rows, cols)):
+            datum = self.store.datum(row, labels[col])
+            for ifield, item in enumerate([keys.get(id(datum.method), datum.method.name),
+                                           datum.mode,
+                                           keys.get(id(datum.basis), datum.basis.name),
+                                           None if datum.citation is None else
+                                           keys.get(id(datum.citation), datum.citation.name)]):
+                codes[ix, ifield] = strings.setdefault(item, len(strings))
+        header['rxns'] = self.store.rxns
+        header['modelchems'] = labels
+        header['strings'] = list(strings.keys())
+
+        with open(filename, 'wb') as handle:
+            np.savez(handle, header=np.array(json.dumps(header)),
+                     rows=rows.astype(np.int32), cols=cols.astype(np.int32),
+                     values=self.store.matrix(labels)[rows, cols], codes=codes)
+        return filename
+
+    def _cache_structure(self):
+        """Returns JSON-ready reagents, reactions, and subsets for write_cache()."""
+        structure = OrderedDict()
+        structure['tagl'] = self.tagl
+        structure['hrgt'] = [[orgt.name, orgt.NRE, orgt.mol, orgt.tagl, orgt.charge]
+                             for orgt in self.hrgt.values()]
+        structure['hrxn'] = []
+        for rxn, orxn in self.hrxn.items():
+            rxnm = [[mode, [[orgt.name, coeff] for orgt, coeff in tdict.items()]]
+                    for mode, tdict in orxn.rxnm.items()]
+            structure['hrxn'].append([rxn, orxn.indx, orxn.tagl, orxn.latex, orxn.comment,
+                                      orxn.color, orxn.benchmark, rxnm])
+        structure['sset'] = [[label, list(rxns.keys()), self.oss[label].tagl, list(self.oss[label].axis.items())]
+                             for label, rxns in self.sset.items()]
+        structure['sources'] = getattr(self, 'sources', [])
+        return structure
+
+    def _restore_structure(self, structure):
+        """Sets reagents, reactions, and subsets from *structure* of a
+        binary cache, as an alternative to __init__.
+
+        """
+        self.tagl = structure['tagl']
+        self.sources = structure['sources']
+        self.hrgt = {}
+        for name, NRE, mol, tagl, charge in structure['hrgt']:
+            orgt = Reagent.__new__(Reagent)
+            orgt.__setstate__((None, {'name': name, 'NRE': NRE, 'mol': mol, 'tagl': tagl, 'charge': charge}))
+            self.hrgt[name] = orgt
+
+        self.hrxn = OrderedDict()
+        for rxn, indx, tagl, latex, comment, color, benchmark, rxnm in structure['hrxn']:
+            orxn = Reaction(name=rxn, dbse=self.dbse, indx=indx, tagl=tagl, latex=latex, color=color,
+                            comment=comment)
+            for mode, contributions in rxnm:
+                orxn.rxnm[mode] = OrderedDict([(self.hrgt[rgt], coeff) for rgt, coeff in contributions])
+            orxn.benchmark = benchmark
+            self.hrxn[rxn] = orxn
+        self._attach_datastore()
+        self._attach_stoichiometry()
+
+        self.sset = OrderedDict()
+        self.oss = OrderedDict()
+        for label, rxns, tagl, axes in structure['sset']:
+            self.sset[label] = OrderedDict([(rxn, self.hrxn[rxn]) for rxn in rxns])
+            self.oss[label] = Subset(name=label,
+                                     hrxn=self.sset[label].keys(),
+                                     tagl=tagl)
+            for axis, floats in axes:
+                self.oss[label].axis[axis] = floats
+
+    @staticmethod
+    def _read_cache_header(handle, cachefile, check=True):
+        """Returns the header of open binary cache *handle* read from
+        *cachefile*, refusing outdated formats and, if *check*, caches
+        older than their sources.
+
+        """
+        header = handle['header'][()]
+        if isinstance(header, bytes):
+            header = header.decode('utf-8')
+        header = json.loads(header, object_pairs_hook=OrderedDict)
+        if header['version'] != CACHE_VERSION:
+            raise ValidationError("""Binary cache file %s has format version %s, not %s. Rebuild it.""" %
+                                  (cachefile, header['version'], CACHE_VERSION))
+        if check:
+            stale = _stale_sources(header['sources'], os.path.dirname(os.path.abspath(cachefile)))
+            if stale:
+                raise ValidationError("""Binary cache file %s is stale with respect to %s. Rebuild it.""" %
+                                      (cachefile, ', '.join(stale)))
+        return header
+
+    def _ingest_cache(self, header, handle):
+        """Loads the data of open binary cache *handle* with *header* into
+        the store. qcdb.ReactionDatum objects are formed only upon access.
+
+        """
+        rowmap = self.store.rows(header['rxns'])
+        colmap = np.array([self.store.column(mc) for mc in header['modelchems']], dtype=int)
+        strmap = self.store.intern(header['strings'])
+        self.store.ingest(rowmap[handle['rows']], colmap[handle['cols']],
+                          handle['values'], strmap[handle['codes']])
+
+    @staticmethod
+    def load_cached(dbname, path=None, check=True):
+        """Returns a WrappedDatabase read from binary cache
+        path/dbname_WDb.npz written by write_cache(), where *dbname* is
+        case insensitive and *path* defaults to qcdb/data. Raises
+        ValidationError if the cache is missing, of an old format, or, if
+        *check*, stale with respect to its source database module.
+
+        """
+        if np is None:
+            raise ValidationError("""NumPy must be available to read binary cache.""")
+        if path is None:
+            path = os.path.dirname(__file__) + '/../data'
+        cachefile = psiutil.findfile_ignorecase(dbname,
+                                                pre=os.path.abspath(path) + os.sep, post='_WDb.npz')
+        if not cachefile:
+            raise ValidationError("Binary cache file for loading database from file %s does not exist" % (
+                os.path.abspath(path) + os.sep + dbname + '_WDb.npz'))
+        with np.load(cachefile) as handle:
+            header = WrappedDatabase._read_cache_header(handle, cachefile, check=check)
+            instance = WrappedDatabase.__new__(WrappedDatabase)
+            instance.dbse = header['dbse']
+            instance._restore_structure(header['structure'])
+            instance._ingest_cache(header, handle)
+        return instance
+
+    def load_qcdata_cache_byproject(self, project, path=None, check=True):
+        """Loads quantum chemical data for *project* from binary cache
+        path/dbse_hrxn_project.npz written by write_cache(), where *path*
+        defaults to qcdb/data. Raises ValidationError if the cache is
+        missing, of an old format, or, if *check*, stale with respect to
+        its source data module.
+
+        """
+        if self.store is None:
+            raise ValidationError("""NumPy must be available to read binary cache.""")
+        if path is None:
+            path = os.path.dirname(__file__) + '/../data'
+        cachefile = os.path.abspath(path) + os.sep + self.dbse + '_hrxn_' + project + '.npz'
+        if not os.path.isfile(cachefile):
+            raise ValidationError(
+                "Binary cache file for loading database data from file %s does not exist" % (cachefile))
+        with np.load(cachefile) as handle:
+            header = self._read_cache_header(handle, cachefile, check=check)
+            self._ingest_cache(header, handle)
+        print("""WrappedDatabase %s: %s results loaded from cache""" % (self.dbse, project))
+
     def available_modelchems(self, union=True):
         """Returns all the labels of model chemistries that have been
         loaded. Either all modelchems that have data for any reaction if
@@ -1239,6 +2284,8 @@ class WrappedDatabase(object):
         if *union* is False.
 
         """
+        if self.store is not None:
+            return sorted(self.store.modelchems(union=union))
         mcs = [set(v.data) for v in self.hrxn.values()]
         if union:
             return sorted(set.union(*mcs))
@@ -1361,7 +2408,8 @@ class Database(object):
     >>> qwer = qcdb.Database('s22')
     """
 
-    def __init__(self, dbnamelist, dbse=None, pythonpath=None, loadfrompickle=False, path=None):
+    def __init__(self, dbnamelist, dbse=None, pythonpath=None, loadfrompickle=False, path=None,
+                 loadfromcache=False):
         #: internal name of database collection
         #:
         #: >>> print asdf.dbse
@@ -1400,6 +2448,12 @@ class Database(object):
         for db in dbnamelist:
             if loadfrompickle:
                 tmp = WrappedDatabase.load_pickled(db, path=path)
+            elif loadfromcache:
+                try:
+                    tmp = WrappedDatabase.load_cached(db, path=path)
+                except ValidationError as e:
+                    print("""Warning: %s Loading from module instead.""" % (str(e)))
+                    tmp = WrappedDatabase(db, pythonpath=pythonpath)
             else:
                 tmp = WrappedDatabase(db, pythonpath=pythonpath)
             self.dbdict[tmp.dbse] = tmp
@@ -1533,21 +2587,40 @@ class Database(object):
             odb.load_qcdata_hrxn_byproject(project, path=path)
         self._intersect_modelchems()
 
-    def available_projects(self, path=None):
-        """"""
+    def load_qcdata_cache_byproject(self, project, path=None, pythonpath=None):
+        """For each component database, loads qcdb.ReactionDatums for
+        *project* from binary cache at path/dbse_hrxn_project.npz, falling
+        back to the dbse_project module (search path can be prepended with
+        *pythonpath*) if the cache is missing or stale.
+
+        """
+        for db, odb in self.dbdict.items():
+            try:
+                odb.load_qcdata_cache_byproject(project, path=path)
+            except ValidationError as e:
+                print("""Warning: %s Loading from module instead.""" % (str(e)))
+                odb.load_qcdata_byproject(project, pythonpath=pythonpath)
+        self._intersect_modelchems()
+
+    def available_projects(self, path=None, ext='pickle'):
+        """Returns projects for which reactions files dbse_hrxn_project.ext
+        exist in *path* for all component databases, where *ext* is
+        'pickle' or 'npz' for binary caches.
+
+        """
         import glob
 
         if path is None:
             path = os.path.dirname(__file__) + '/../data'
 
         projects = []
-        for pjfn in glob.glob(path + '/*_hrxn_*.pickle'):
-            pj = pjfn[:-7].split('_')[-1]
+        for pjfn in glob.glob(path + '/*_hrxn_*.' + ext):
+            pj = pjfn[:-(len(ext) + 1)].split('_')[-1]
             projects.append(pj)
 
         complete_projects = []
         for pj in set(projects):
-            if all([os.path.isfile(path + '/' + db + '_hrxn_' + pj + '.pickle') for db in self.dbdict.keys()]):
+            if all([os.path.isfile(path + '/' + db + '_hrxn_' + pj + '.' + ext) for db in self.dbdict.keys()]):
                 complete_projects.append(pj)
 
         return complete_projects
@@ -1724,6 +2797,86 @@ class Database(object):
         else:
             return errors
 
+    def _batch_statistics(self, modelchems, subsets, benchmark='default', failoninc=True, verbose=False):
+        """Computes summary statistics for each model chemistry in array
+        *modelchems* versus *benchmark* over each subset in array *subsets*
+        over all component databases. Each component database's values and
+        benchmark are gathered once, and all model chemistries for a subset
+        are evaluated in a single vectorized sweep. Returns nested
+        OrderedDict errors[mc][ss] where each entry is laid out like the
+        return of compute_statistics.
+
+        """
+        errors = OrderedDict()
+        for mc in modelchems:
+            errors[mc] = OrderedDict()
+            for ss in subsets:
+                errors[mc][ss] = OrderedDict()
+
+        for dbix, (db, odb) in enumerate(self.dbdict.items()):
+            lmcs = [self.mcs[mc][dbix] for mc in modelchems]
+            lbm = 'ZEROS' if benchmark == 'ZEROS' else self.mcs[benchmark][dbix]
+            if odb.store is not None:
+                rxns = list(odb.sset['default'].keys())
+                rxnpos = dict((rxn, ix) for ix, rxn in enumerate(rxns))
+                mcval, bmval = odb._columnar_values(lmcs, lbm, rxns)
+
+            for ss in subsets:
+                lss = self.sset[ss][dbix]
+                if lss is None:
+                    for mc in modelchems:
+                        errors[mc][ss][db] = None
+                    continue
+                if odb.store is None:
+                    for mc, lmc in zip(modelchems, lmcs):
+                        errors[mc][ss][db] = odb.compute_statistics(lmc, benchmark=lbm, sset=lss,
+                                                                    failoninc=failoninc, verbose=verbose)
+                    continue
+
+                ssrxns = list(odb._resolve_subset(lss).keys())
+                ix = [rxnpos[rxn] for rxn in ssrxns]
+                err, mask = odb._columnar_errors_from_values(ssrxns, lmcs, mcval[ix],
+                                                             None if bmval is None else bmval[ix],
+                                                             failoninc=failoninc)
+                for mcix, error in enumerate(columnar_errors(err, mask)):
+                    errors[modelchems[mcix]][ss][db] = error
+                    if verbose:
+                        print("""%d systems in %s for %s vs. %s, subset %s.\n%s""" %
+                              (mask[:, mcix].sum(), odb.dbse, lmcs[mcix], lbm, lss, format_errors(error, mode=2)))
+
+        for mc in modelchems:
+            for ss in subsets:
+                errors[mc][ss][self.dbse] = average_errors(*[err for err in errors[mc][ss].values() if err is not None])
+        return errors
+
+    def compute_statistics_batch(self, modelchems, subsets=None, benchmark='default', failoninc=True, verbose=False):
+        """Computes summary statistics for every model chemistry in array
+        *modelchems* versus *benchmark* over every subset in array *subsets*
+        (all Database subsets if None) over all component databases in a
+        single sweep, rather than one compute_statistics call apiece.
+        Returns pandas DataFrame with one row per (modelchem, subset, db)
+        and one column per statistic, where db runs over the component
+        databases where the subset is defined and, last, *self.dbse* for
+        the cross-database summary.
+
+        >>> asdf.compute_statistics_batch(['MP2-CP-adz', 'MP2-CP-atz'], ['default', 'hb'])
+        """
+        import pandas as pd
+
+        subsets = list(self.sset.keys()) if subsets is None else subsets
+        errors = self._batch_statistics(modelchems, subsets, benchmark=benchmark,
+                                        failoninc=failoninc, verbose=verbose)
+        index = []
+        table = []
+        for mc in modelchems:
+            for ss in subsets:
+                for db, error in errors[mc][ss].items():
+                    if error is not None:
+                        index.append((mc, ss, db))
+                        table.append(list(error.values()))
+        return pd.DataFrame(table, columns=list(initialize_errors().keys()), dtype=float,
+                            index=pd.MultiIndex.from_tuples(index, names=['modelchem', 'subset', 'db']))
+
     def analyze_modelchems(self, modelchem, benchmark='default', failoninc=True, verbose=False):
         """For each component database, compute and print nicely formatted
         summary error statistics for each model chemistry in array
@@ -1731,12 +2884,8 @@ class Database(object):
 
         """
         # compute errors
-        errors = {}
-        for mc in modelchem:
-            errors[mc] = {}
-            for ss in self.sset.keys():
-                errors[mc][ss] = self.compute_statistics(mc, benchmark=benchmark, sset=ss,
-                                                         failoninc=failoninc, verbose=verbose, returnindiv=False)
+        errors = self._batch_statistics(modelchem, list(self.sset.keys()), benchmark=benchmark,
+                                        failoninc=failoninc, verbose=verbose)
         # present errors
         pre, suf, mid = string_contrast(modelchem)
         text = """\n  ==> %s %s[]%s Errors <==\n""" % (self.dbse, pre, suf)
@@ -2150,6 +3299,18 @@ reinitialize
 
         return rhrgt
 
+    def get_stoichiometry(self, sset='default', actv='default'):
+        """Returns qcdb.ReactionStoichiometry of ACTV mode *actv* over the
+        reactions in *sset* from each WrappedDatabase, rows named by
+        database reaction name (e.g., 'S22-2') as in get_hrxn() and columns
+        by reagent name as in get_hrgt(). Requires NumPy.
+
+        >>> asdf.get_stoichiometry(actv='CP').reactionate(rgtvals)
+        """
+        if np is None:
+            raise ValidationError("""NumPy must be available to form stoichiometry matrix.""")
+        return ReactionStoichiometry(self.get_hrxn(sset=sset), mode=actv)
+
     def get_reactions(self, modelchem, sset='default', benchmark='default',
                       failoninc=True):
         """Collects the reactions present in *sset* from each WrappedDatabase,
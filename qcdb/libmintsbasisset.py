@@ -35,22 +35,76 @@ import sys
 import string
 import hashlib
 import itertools
+import math
 from collections import defaultdict
 try:
     from collections import OrderedDict
 except ImportError:
     from .oldpymodules import OrderedDict
+try:
+    import numpy as np
+except ImportError:
+    np = None
 from .exceptions import *
 from .psiutil import search_file
 from .molecule import Molecule
 from .periodictable import *
-from .libmintsgshell import GaussianShell
+from .libmintsgshell import GaussianShell, INT_NCART, INT_NPURE
 from .libmintsbasissetparser import Gaussian94BasisSetParser
 from .basislist import corresponding_basis
 if sys.version_info >= (3,0):
     basestring = str
 
 
+def _binomial(n, k):
+    """Returns n choose k, zero outside 0 <= k <= n."""
+    if k < 0 or k > n:
+        return 0
+    return math.factorial(n) // (math.factorial(k) * math.factorial(n - k))
+
+
+def _cartesian_powers(am):
+    """Returns list of (x, y, z) exponents of the Cartesian functions of
+    angular momentum *am* in libmints order (xx, xy, xz, yy, yz, zz).
+
+    """
+    return [(am - i, i - j, j) for i in range(am + 1) for j in range(i + 1)]
+
+
+_solid_harmonics = {}
+
+
+def solid_harmonic_transform(am):
+    """Returns INT_NPURE(*am*) x INT_NCART(*am*) list of coefficients
+    taking Cartesian functions in _cartesian_powers order to real solid
+    harmonics in Psi4 order (m = 0, 1, -1, 2, -2, ...), after Helgaker,
+    Jorgensen, and Olsen eq. 6.4.47. Cartesian components are taken to
+    share the normalization of x^am, as in ShellInfo.
+
+    """
+    try:
+        return _solid_harmonics[am]
+    except KeyError:
+        pass
+    cartindex = dict((lxyz, cart) for cart, lxyz in enumerate(_cartesian_powers(am)))
+    transform = []
+    for m in [0] + [sign * mm for mm in range(1, am + 1) for sign in (1, -1)]:
+        row = [0.0] * INT_NCART(am)
+        absm = abs(m)
+        norm = math.sqrt(2.0 * math.factorial(am + absm) * math.factorial(am - absm) / (2.0 if m == 0 else 1.0)) / \
+            (2 ** absm * math.factorial(am))
+        for t in range((am - absm) // 2 + 1):
+            for u in range(t + 1):
+                # k is 2v of eq. 6.4.47, even for cosine-like and odd for sine-like m
+                for k in range(0 if m >= 0 else 1, absm + 1, 2):
+                    coef = (-1) ** (t + k // 2) * 0.25 ** t * _binomial(am, t) * _binomial(am - t, absm + t) * \
+                        _binomial(t, u) * _binomial(absm, k)
+                    row[cartindex[(2 * t + absm - 2 * u - k, 2 * u + k, am - 2 * t - absm)]] += norm * coef
+        transform.append(row)
+    _solid_harmonics[am] = transform
+    return transform
+
+
 class BasisSet(object):
     """Basis set container class
     Reads the basis set from a checkpoint file object. Also reads the molecule
@@ -473,6 +527,39 @@ class BasisSet(object):
         """
         return BasisSet(self, center)
 
+    def atomic_basis_hash(self, center):
+        """Returns the SHA1 hash identifying the basis on *center*, the
+        same as that of print_detail(numbersonly=True) of the one-atom
+        BasisSet(self, center) but without constructing it.
+
+        """
+        first_shell = self.center_to_shell[center]
+        n_shell = self.center_to_nshell[center]
+        shells = self.shells[first_shell:first_shell + n_shell]
+        text = """    spherical\n""" if (shells and shells[-1].is_pure()) else """    cartesian\n"""
+        text += """    ****\n"""
+        for shell in shells:
+            text += shell.pyprint(outfile=None)
+        text += """    ****\n"""
+        text += """\n"""
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def atomic_basis_hashes(self, role):
+        """Returns list of atomic_basis_hash for each atom of the molecule.
+        Atoms sharing a label and *role* basis share their shells, so each
+        such pair is hashed only once.
+
+        """
+        hashes = []
+        memo = {}
+        for at in range(self.molecule.natom()):
+            atom = self.molecule.atom_entry(at)
+            key = (atom.label(), atom.basisset(role))
+            if key not in memo:
+                memo[key] = self.atomic_basis_hash(at)
+            hashes.append(memo[key])
+        return hashes
+
     @staticmethod
     def build(molecule, shells):
         """Builder factory method
@@ -531,11 +618,8 @@ class BasisSet(object):
         # Construct the grand BasisSet for mol
         basisset = BasisSet("CABS", mol, combined_atom_basis_shell)
 
-        # Construct all the one-atom BasisSet-s for mol's CoordEntry-s
-        for at in range(mol.natom()):
-            oneatombasis = BasisSet(basisset, at)
-            oneatombasishash = hashlib.sha1(oneatombasis.print_detail(numbersonly=True).encode('utf-8')).hexdigest()
-            mol.set_shell_by_number(at, oneatombasishash, role="CABS")
+        # Hash the one-atom basis of each of mol's CoordEntry-s
+        mol.set_shells(basisset.atomic_basis_hashes("CABS"), role="CABS")
         mol.update_geometry()  # re-evaluate symmetry taking basissets into account
 
         text = """   => Creating Basis Set <=\n\n"""
@@ -678,6 +762,7 @@ class BasisSet(object):
         # Map of GaussianShells
         atom_basis_shell = OrderedDict()
         names = {}
+        located = {}
         summary = []
 
         for at in range(mol.natom()):
@@ -737,14 +822,16 @@ class BasisSet(object):
                         names[index] = basstrings[filename[:-4]].split('\n')
                 else:
                     # -- Else seek bas.gbs file in path
-                    fullfilename = search_file(filename, seek['path'])
+                    if (filename, seek['path']) not in located:
+                        located[(filename, seek['path'])] = search_file(filename, seek['path'])
+                    fullfilename = located[(filename, seek['path'])]
                     if fullfilename is None:
                         # -- Else skip to next bas
                         continue
-                    # Store contents so not reloading files
+                    # Store contents so not reloading files, compiled library first
                     index = 'file %s' % (fullfilename)
                     if index not in names:
-                        names[index] = parser.load_file(fullfilename)
+                        names[index] = parser.load_library_file(fullfilename)
 
                 lines = names[index]
 
@@ -778,11 +865,8 @@ class BasisSet(object):
         # Construct the grand BasisSet for mol
         basisset = BasisSet(role, mol, atom_basis_shell)
 
-        # Construct all the one-atom BasisSet-s for mol's CoordEntry-s
-        for at in range(mol.natom()):
-            oneatombasis = BasisSet(basisset, at)
-            oneatombasishash = hashlib.sha1(oneatombasis.print_detail(numbersonly=True).encode('utf-8')).hexdigest()
-            mol.set_shell_by_number(at, oneatombasishash, role=role)
+        # Hash the one-atom basis of each of mol's CoordEntry-s
+        mol.set_shells(basisset.atomic_basis_hashes(role), role=role)
         mol.update_geometry()  # re-evaluate symmetry taking basissets into account
 
 #TODO fix name
@@ -1307,36 +1391,106 @@ class BasisSet(object):
         """Returns the vector of sorted shell list. Defunct"""
         raise FeatureNotImplemented('BasisSet::get_ao_sorted_list')
 
-    def compute_phi(self, phi_ao, x, y, z):
-        """Returns the values of the basis functions at a point"""
+    def compute_phi(self, points, deriv=0, puream=None, cutoff=1.0e-12):
+        """Returns the values of the basis functions at *points*, an M x 3
+        array of Cartesian coordinates in Bohr, as an M x nbf NumPy array.
+        Functions are spherical or Cartesian according to each shell
+        unless *puream* is True (all spherical) or False (all Cartesian,
+        M x nao). With *deriv* of 1, returns instead the tuple (phi,
+        phi_x, phi_y, phi_z) of values and gradient components.
+
+        Evaluation proceeds a shell at a time over all points. Points
+        farther from a shell's center than where its most diffuse
+        primitive falls below *cutoff* are left at zero.
 
-        phi_ao = [0.0] * self.nao()
-        ao = 0
-        for ns in range(self.nshell()):
-            shell = self.shells[ns]
+        """
+        if np is None:
+            raise ValidationError("""NumPy must be available to compute basis functions.""")
+        if deriv not in [0, 1]:
+            raise ValidationError("""BasisSet::compute_phi: deriv must be 0 or 1, not %s""" % (deriv))
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        npoint = points.shape[0]
+        geom = np.asarray(self.molecule.geometry())
+
+        nfunc = 0
+        for shell in self.shells:
+            pure = shell.is_pure() if puream is None else puream
+            nfunc += INT_NPURE(shell.am()) if pure else INT_NCART(shell.am())
+        phi = np.zeros((npoint, nfunc))
+        grad = [np.zeros((npoint, nfunc)) for xyz in range(3)] if deriv else []
+
+        # Distances to the current center are recomputed only when the center changes
+        center = None
+        offset = 0
+        for shell in self.shells:
             am = shell.am()
-            nprim = shell.nprimitive()
-            a = shell.exps()
-            c = shell.coefs()
-
-            xyz = shell.center()
-            dx = x - xyz[0]
-            dy = y - xyz[1]
-            dz = z - xyz[2]
-            rr = dx * dx + dy * dy + dz * dz
-
-            cexpr = 0
-            for np in range(nprim):
-                cexpr += c[np] * math.exp(-a[np] * rr)
-
-            for l in range(INT_NCART(am)):
-                components = exp_ao[am][l]
-                phi_ao[ao + l] += pow(dx, components[0]) * \
-                                pow(dy, components[1]) * \
-                                pow(dz, components[2]) * \
-                                cexpr
-
-            ao += INT_NCART(am)
+            pure = shell.is_pure() if puream is None else puream
+            width = INT_NPURE(am) if pure else INT_NCART(am)
+
+            if shell.ncenter() != center:
+                center = shell.ncenter()
+                delta = points - geom[center]
+                rr = np.einsum('ij,ij->i', delta, delta)
+
+            # Screen by radius past which the most diffuse primitive is negligible
+            exps = np.asarray(shell.exps()[:shell.nprimitive()])
+            coefs = np.asarray(shell.coefs()[:shell.nprimitive()])
+            amin = exps.min()
+            lnc = math.log(max(np.abs(coefs).sum(), 1.0)) - math.log(cutoff)
+            r2max = lnc / amin
+            for i in range(3):
+                r2max = (lnc + 0.5 * am * math.log(max(r2max, 1.0))) / amin
+            near = np.nonzero(rr <= r2max)[0]
+            if len(near) == 0:
+                offset += width
+                continue
+
+            d = delta[near]
+            r2 = rr[near]
+            expo = np.exp(-np.outer(r2, exps))
+            radial = expo.dot(coefs)
+
+            # Powers x^n, y^n, z^n for n <= am, with [n] indexing the power
+            powers = [np.ones((len(near), am + 1)) for xyz in range(3)]
+            for xyz in range(3):
+                for n in range(1, am + 1):
+                    powers[xyz][:, n] = powers[xyz][:, n - 1] * d[:, xyz]
+
+            cartesians = _cartesian_powers(am)
+            angular = np.empty((len(near), INT_NCART(am)))
+            for cart, lxyz in enumerate(cartesians):
+                angular[:, cart] = powers[0][:, lxyz[0]] * powers[1][:, lxyz[1]] * powers[2][:, lxyz[2]]
+            block = angular * radial[:, None]
+
+            if deriv:
+                # d/dx (x^a y^b z^c R) = (a x^(a-1) R + x^a x dR/(r dr)) y^b z^c
+                dradial = expo.dot(-2.0 * exps * coefs)
+                dblock = []
+                for xyz in range(3):
+                    lowered = np.zeros_like(angular)
+                    for cart, lxyz in enumerate(cartesians):
+                        if lxyz[xyz] == 0:
+                            continue
+                        low = list(lxyz)
+                        low[xyz] -= 1
+                        lowered[:, cart] = lxyz[xyz] * powers[0][:, low[0]] * powers[1][:, low[1]] * powers[2][:, low[2]]
+                    dblock.append(lowered * radial[:, None] + angular * (d[:, xyz] * dradial)[:, None])
+            else:
+                dblock = []
+
+            if pure:
+                transform = np.asarray(solid_harmonic_transform(am)).T
+                block = block.dot(transform)
+                dblock = [db.dot(transform) for db in dblock]
+
+            phi[near, offset:offset + width] = block
+            for xyz in range(len(dblock)):
+                grad[xyz][near, offset:offset + width] = dblock[xyz]
+            offset += width
+
+        if deriv:
+            return (phi,) + tuple(grad)
+        return phi
 
     def concatenate(self, b):
         """Concatenates two basis sets together into a new basis without
@@ -32,17 +32,103 @@ from __future__ import division
 import os
 import re
 import sys
+import glob
+import json
+import hashlib
+try:
+    from collections import OrderedDict
+except ImportError:
+    from .oldpymodules import OrderedDict
+try:
+    import numpy as np
+except ImportError:
+    np = None
 from .exceptions import *
 from .libmintsgshell import *
 if sys.version_info >= (3,0):
     basestring = str
 
+# Regular expressions that we'll be checking for.
+_cartesian = re.compile(r'^\s*cartesian\s*', re.IGNORECASE)
+_spherical = re.compile(r'^\s*spherical\s*', re.IGNORECASE)
+_comment = re.compile(r'^\s*\!.*')  # line starts with !
+_separator = re.compile(r'^\s*\*\*\*\*')  # line starts with ****
+_ATOM = '(([A-Z]{1,3}\d*)|([A-Z]{1,3}_\w+))'  # match 'C 0', 'Al c 0', 'P p88 p_pass 0' not 'Ofail 0', 'h99_text 0'
+_atom_array = re.compile(r'^\s*((' + _ATOM + '\s+)+)0\s*$', re.IGNORECASE)  # array of atomic symbols terminated by 0
+_shell = re.compile(r'^\s*(\w+)\s*(\d+)\s*(-?\d+\.\d+)')  # Match beginning of contraction
+_blank = re.compile(r'^\s*$')
+_NUMBER = "((?:[-+]?\\d*\\.\\d+(?:[DdEe][-+]?\\d+)?)|(?:[-+]?\\d+\\.\\d*(?:[DdEe][-+]?\\d+)?))"
+_primitives1 = re.compile(r'^\s*' + _NUMBER + '\s+' + _NUMBER + '.*')  # Match s, p, d, f, g, ... functions
+_primitives2 = re.compile(r'^\s*' + _NUMBER + '\s+' + _NUMBER + '\s+' + _NUMBER + '.*')  # match sp functions
+
+#                a  b  c  d  e  f  g  h  i  j  k  l  m  n  o  p  q  r  s  t  u  v  w  x  y  z
+#shell_to_am = [-1,-1,-1, 2,-1, 3, 4, 5, 6,-1, 7, 8, 9,10,11, 1,12,13, 0,14,15,16,17,18,19,20]
+_alpha = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L',
+    'M', 'N', 'O', 'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'X', 'Y', 'Z']
+_angmo = [-1, -1, -1, 2, -1, 3, 4, 5, 6, -1, 7, 8,
+    9, 10, 11, 1, 12, 13, 0, 14, 15, 16, 17, 18, 19, 20]
+_shell_to_am = dict(zip(_alpha, _angmo))
+
+#: format version of compiled basis library archives written by compile_basis_library
+ARCHIVE_VERSION = 1
+#: name of the compiled archive of a directory's .gbs files, kept alongside them
+ARCHIVE_NAME = 'basis_library.npz'
+
+
+class BasisSetLines(list):
+    """List of the lines of a basis set file as returned by
+    :py:func:`Gaussian94BasisSetParser.load_file`, carrying *key*, which
+    identifies the contents so that parsed entries can be cached.
+
+    """
+
+    def __init__(self, lines, key):
+        list.__init__(self, lines)
+        self.key = key
+
+
+def _lru_get(cache, key):
+    """Returns value of *key* in OrderedDict *cache*, marking it most
+    recently used, else None.
+
+    """
+    try:
+        value = cache.pop(key)
+    except KeyError:
+        return None
+    cache[key] = value
+    return value
+
+
+def _lru_put(cache, key, value, size):
+    """Stores *value* for *key* in OrderedDict *cache*, dropping least
+    recently used entries beyond *size*.
+
+    """
+    cache[key] = value
+    while len(cache) > size:
+        cache.popitem(last=False)
+
+
 class Gaussian94BasisSetParser(object):
     """Class for parsing basis sets from a text file in Gaussian 94
     format. Translated directly from the Psi4 libmints class written
-    by Justin M. Turney and Andrew C. Simmonett.
+    by Justin M. Turney and Andrew C. Simmonett. Loaded files, their
+    indices of atom entries, and parsed entries are shared by all
+    parsers in the process.
 
     """
+    # file contents keyed by (filename, basisname, mtime, size)
+    file_cache = OrderedDict()
+    file_cache_size = 64
+    # {symbol: (lineno, gaussian_type)} of first entry, keyed by contents
+    index_cache = OrderedDict()
+    index_cache_size = 256
+    # (ShellInfo list, msg) keyed by (contents, symbol, puream forcing)
+    shell_cache = OrderedDict()
+    shell_cache_size = 4096
+    # (archive signature, BasisSetArchive or None) keyed by directory
+    archive_cache = {}
 
     def __init__(self, forced_puream=None):
         """Constructor"""
@@ -57,11 +143,71 @@ class Gaussian94BasisSetParser(object):
         """Load and return the file to be used by parse.  Return only
         portion of *filename* pertaining to *basisname* if specified (for
         multi-basisset files) otherwise entire file as list of strings.
+        Files are read once per process unless modified.
 
         """
         # string filename
         self.filename = filename
 
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            raise BasisSetFileNotFound("""BasisSetParser::parse: Unable to open basis set file: %s""" % (filename))
+        key = (os.path.abspath(filename), basisname, stat.st_mtime, stat.st_size)
+        lines = _lru_get(self.file_cache, key)
+        if lines is None:
+            lines = BasisSetLines(self.read_file(filename, basisname), key)
+            _lru_put(self.file_cache, key, lines, self.file_cache_size)
+        return lines
+
+    def load_library_file(self, filename):
+        """Returns basis set file *filename* for parse, taken from the
+        compiled archive in its directory if that holds its current
+        contents, else loaded as by load_file.
+
+        """
+        archive = self.archive(os.path.dirname(os.path.abspath(filename)))
+        if archive is not None:
+            entries = archive.entries(filename)
+            if entries is not None:
+                self.filename = filename
+                return ArchivedBasisSet(archive, filename, entries)
+        return self.load_file(filename)
+
+    def archive(self, directory):
+        """Returns the BasisSetArchive compiled for *directory*, reloaded
+        whenever rewritten, or None if absent, unreadable, or NumPy is not
+        available.
+
+        """
+        filename = os.path.join(directory, ARCHIVE_NAME)
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        signature = (stat.st_mtime, stat.st_size)
+        try:
+            cached_signature, archive = self.archive_cache[directory]
+        except KeyError:
+            pass
+        else:
+            if cached_signature == signature:
+                return archive
+
+        archive = None
+        if np is not None:
+            try:
+                archive = BasisSetArchive(filename)
+            except (IOError, ValueError, KeyError, ValidationError) as err:
+                print("""Warning: Basis set archive %s unusable, reading basis set files: %s""" % (filename, err))
+        self.archive_cache[directory] = (signature, archive)
+        return archive
+
+    def read_file(self, filename, basisname=None):
+        """Read and return lines of *filename* as for load_file, without
+        consulting the cache.
+
+        """
         given_basisname = False if basisname is None else True
         found_basisname = False
         basis_separator = re.compile(r'^\s*\[\s*(.*?)\s*\]\s*$')
@@ -97,6 +243,31 @@ class Gaussian94BasisSetParser(object):
 
         return lines
 
+    def index(self, lines):
+        """Returns dictionary of each atom symbol (uppercase) with an entry
+        in *lines* to the number of the line after its first entry's atom
+        line and the basis type ('Pure' or 'Cartesian') declared there.
+
+        """
+        gaussian_type = 'Pure'
+        entries = {}
+        for lineno, line in enumerate(lines):
+            if _blank.match(line):
+                continue
+            if _cartesian.match(line):
+                gaussian_type = 'Cartesian'
+                continue
+            elif _spherical.match(line):
+                gaussian_type = 'Pure'
+                continue
+            if _comment.match(line) or _separator.match(line):
+                continue
+            what = _atom_array.match(line)
+            if what:
+                for x in what.group(1).split():
+                    entries.setdefault(x.upper(), (lineno + 1, gaussian_type))
+        return entries
+
     def parse(self, symbol, dataset):
         """Given a string, parse for the basis set needed for atom.
         * @param symbol atom symbol to look for in dataset
@@ -109,174 +280,307 @@ class Gaussian94BasisSetParser(object):
         else:
             lines = dataset
 
-        # Regular expressions that we'll be checking for.
-        cartesian = re.compile(r'^\s*cartesian\s*', re.IGNORECASE)
-        spherical = re.compile(r'^\s*spherical\s*', re.IGNORECASE)
-        comment = re.compile(r'^\s*\!.*')  # line starts with !
-        separator = re.compile(r'^\s*\*\*\*\*')  # line starts with ****
-        ATOM = '(([A-Z]{1,3}\d*)|([A-Z]{1,3}_\w+))'  # match 'C 0', 'Al c 0', 'P p88 p_pass 0' not 'Ofail 0', 'h99_text 0'
-        atom_array = re.compile(r'^\s*((' + ATOM + '\s+)+)0\s*$', re.IGNORECASE)  # array of atomic symbols terminated by 0
-        shell = re.compile(r'^\s*(\w+)\s*(\d+)\s*(-?\d+\.\d+)')  # Match beginning of contraction
-        blank = re.compile(r'^\s*$')
-        NUMBER = "((?:[-+]?\\d*\\.\\d+(?:[DdEe][-+]?\\d+)?)|(?:[-+]?\\d+\\.\\d*(?:[DdEe][-+]?\\d+)?))"
-        primitives1 = re.compile(r'^\s*' + NUMBER + '\s+' + NUMBER + '.*')  # Match s, p, d, f, g, ... functions
-        primitives2 = re.compile(r'^\s*' + NUMBER + '\s+' + NUMBER + '\s+' + NUMBER + '.*')  # match sp functions
-
-        # s, p and s, p, d can be grouped together in Pople-style basis sets
-        sp = 'SP'
-        spd = 'SPD'
-
-        #                a  b  c  d  e  f  g  h  i  j  k  l  m  n  o  p  q  r  s  t  u  v  w  x  y  z
-        #shell_to_am = [-1,-1,-1, 2,-1, 3, 4, 5, 6,-1, 7, 8, 9,10,11, 1,12,13, 0,14,15,16,17,18,19,20]
-        alpha = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L',
-            'M', 'N', 'O', 'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'X', 'Y', 'Z']
-        angmo = [-1, -1, -1, 2, -1, 3, 4, 5, 6, -1, 7, 8,
-            9, 10, 11, 1, 12, 13, 0, 14, 15, 16, 17, 18, 19, 20]
-        shell_to_am = dict(zip(alpha, angmo))
-
-        # Basis type.
-        gaussian_type = 'Pure'
+        # Locate entry through index of archive, file, or other contents
+        if isinstance(lines, ArchivedBasisSet):
+            key = lines.key
+            entries = lines.entries
+        else:
+            key = lines.key if isinstance(lines, BasisSetLines) else tuple(lines)
+            entries = _lru_get(self.index_cache, key)
+            if entries is None:
+                entries = self.index(lines)
+                _lru_put(self.index_cache, key, entries, self.index_cache_size)
+        if symbol not in entries:
+            #raise BasisSetNotFound("Gaussian94BasisSetParser::parser: Unable to find the basis set for %s in %s" % \
+            #   (symbol, self.filename), silent=True)
+            return None, None
 
-        if self.force_puream_or_cartesian:
-            if self.forced_is_puream == False:
-                gaussian_type = 'Cartesian'
+        force = (self.force_puream_or_cartesian, self.forced_is_puream)
+        found = _lru_get(self.shell_cache, (key, symbol, force))
+        if found is None:
+            forced_type = None
+            if self.force_puream_or_cartesian:
+                forced_type = 'Pure' if self.forced_is_puream else 'Cartesian'
+            if isinstance(lines, ArchivedBasisSet):
+                found = lines.archive.shells(entries[symbol], forced_type)
+            else:
+                lineno, gaussian_type = entries[symbol]
+                found = self.parse_entry(lines, lineno, gaussian_type if forced_type is None else forced_type)
+            _lru_put(self.shell_cache, (key, symbol, force), found, self.shell_cache_size)
+
+        shell_list, msg = found
+        return list(shell_list), msg
+
+    def parse_entry(self, lines, lineno, gaussian_type):
+        """Returns list of ShellInfo and location message for the entry
+        whose atom line precedes line number *lineno* of *lines*, with
+        shells of *gaussian_type*.
 
+        """
         # Need a dummy center for the shell.
         center = [0.0, 0.0, 0.0]
 
         shell_list = []
-        lineno = 0
-        found = False
+        msg = """line %5d""" % (lineno)
 
-        while lineno < len(lines):
-            line = lines[lineno]
-            lineno += 1
+        # Read in the next line
+        line = lines[lineno]
+        lineno += 1
 
-            # Ignore blank lines
-            if blank.match(line):
-                continue
+        # Need to do the following until we match a "****" which is the end of the basis set
+        while not _separator.match(line):
+            # Match shell information
+            if _shell.match(line):
+                what = _shell.match(line)
+                shell_type = str(what.group(1)).upper()
+                nprimitive = int(what.group(2))
+                scale = float(what.group(3))
 
-            # Look for Cartesian or Spherical
-            if not self.force_puream_or_cartesian:
-                if cartesian.match(line):
-                    gaussian_type = 'Cartesian'
-#TODO                    if psi4.get_global_option('PUREAM').has_changed():
-#TODO                        gaussian_type = 'Pure' if int(psi4.get_global('PUREAM')) else 'Cartesian'
-                    continue
-                elif spherical.match(line):
-                    gaussian_type = 'Pure'
-#TODO                    if psi4.get_global_option('PUREAM').has_changed():
-#TODO                        gaussian_type = 'Pure' if int(psi4.get_global('PUREAM')) else 'Cartesian'
-                    continue
-                #end case where puream setting wasn't forced by caller
-
-            # Do some matches
-            if comment.match(line):
-                continue
-            if separator.match(line):
-                continue
+                if len(shell_type) == 1:
+                    am = _shell_to_am[shell_type[0]]
+
+                    exponents = [0.0] * nprimitive
+                    contractions = [0.0] * nprimitive
 
-            # Match: H    0
-            # or:    H    O...     0
-            if atom_array.match(line):
-                what = atom_array.match(line).group(1).split()
-                # Check the captures and see if this basis set is for the atom we need.
-                found = False
-                if symbol in [x.upper() for x in what]:
-                    found = True
-                    msg = """line %5d""" % (lineno)
-
-                    # Read in the next line
-                    line = lines[lineno]
-                    lineno += 1
-
-                    # Need to do the following until we match a "****" which is the end of the basis set
-                    while not separator.match(line):
-                        # Match shell information
-                        if shell.match(line):
-                            what = shell.match(line)
-                            shell_type = str(what.group(1)).upper()
-                            nprimitive = int(what.group(2))
-                            scale = float(what.group(3))
-
-                            if len(shell_type) == 1:
-                                am = shell_to_am[shell_type[0]]
-
-                                exponents = [0.0] * nprimitive
-                                contractions = [0.0] * nprimitive
-
-                                for p in range(nprimitive):
-                                    line = lines[lineno]
-                                    lineno += 1
-                                    line = line.replace('D', 'e', 2)
-                                    line = line.replace('d', 'e', 2)
-
-                                    what = primitives1.match(line)
-                                    # Must match primitives1; will work on the others later
-                                    if not what:
-                                        raise ValidationError("""Gaussian94BasisSetParser::parse: Unable to match an exponent with one contraction: line %d: %s""" % (lineno, line))
-                                    exponent = float(what.group(1))
-                                    contraction = float(what.group(2))
-
-                                    # Scale the contraction and save the information
-                                    contraction *= scale
-                                    exponents[p] = exponent
-                                    contractions[p] = contraction
-
-                                # We have a full shell, push it to the basis set
-                                shell_list.append(ShellInfo(am, contractions, exponents,
-                                    gaussian_type, 0, center, 0, 'Unnormalized'))
-
-                            elif len(shell_type) == 2:
-                                # This is to handle instances of SP, PD, DF, FG, ...
-                                am1 = shell_to_am[shell_type[0]]
-                                am2 = shell_to_am[shell_type[1]]
-
-                                exponents = [0.0] * nprimitive
-                                contractions1 = [0.0] * nprimitive
-                                contractions2 = [0.0] * nprimitive
-
-                                for p in range(nprimitive):
-                                    line = lines[lineno]
-                                    lineno += 1
-                                    line = line.replace('D', 'e', 2)
-                                    line = line.replace('d', 'e', 2)
-
-                                    what = primitives2.match(line)
-                                    # Must match primitivies2
-                                    if not what:
-                                        raise ValidationError("Gaussian94BasisSetParser::parse: Unable to match an exponent with two contractions: line %d: %s" % (lineno, line))
-                                    exponent = float(what.group(1))
-                                    contraction = float(what.group(2))
-
-                                    # Scale the contraction and save the information
-                                    contraction *= scale
-                                    exponents[p] = exponent
-                                    contractions1[p] = contraction
-
-                                    # Do the other contraction
-                                    contraction = float(what.group(3))
-
-                                    # Scale the contraction and save the information
-                                    contraction *= scale
-                                    contractions2[p] = contraction
-
-                                shell_list.append(ShellInfo(am1, contractions1, exponents,
-                                    gaussian_type, 0, center, 0, 'Unnormalized'))
-                                shell_list.append(ShellInfo(am2, contractions2, exponents,
-                                    gaussian_type, 0, center, 0, 'Unnormalized'))
-                            else:
-                                raise ValidationError("""Gaussian94BasisSetParser::parse: Unable to parse basis sets with spd, or higher grouping""")
-                        else:
-                            raise ValidationError("""Gaussian94BasisSetParser::parse: Expected shell information, but got: line %d: %s""" % (lineno, line))
+                    for p in range(nprimitive):
+                        line = lines[lineno]
+                        lineno += 1
+                        line = line.replace('D', 'e', 2)
+                        line = line.replace('d', 'e', 2)
+
+                        what = _primitives1.match(line)
+                        # Must match primitives1; will work on the others later
+                        if not what:
+                            raise ValidationError("""Gaussian94BasisSetParser::parse: Unable to match an exponent with one contraction: line %d: %s""" % (lineno, line))
+                        exponent = float(what.group(1))
+                        contraction = float(what.group(2))
+
+                        # Scale the contraction and save the information
+                        contraction *= scale
+                        exponents[p] = exponent
+                        contractions[p] = contraction
+
+                    # We have a full shell, push it to the basis set
+                    shell_list.append(ShellInfo(am, contractions, exponents,
+                        gaussian_type, 0, center, 0, 'Unnormalized'))
+
+                elif len(shell_type) == 2:
+                    # This is to handle instances of SP, PD, DF, FG, ...
+                    am1 = _shell_to_am[shell_type[0]]
+                    am2 = _shell_to_am[shell_type[1]]
+
+                    exponents = [0.0] * nprimitive
+                    contractions1 = [0.0] * nprimitive
+                    contractions2 = [0.0] * nprimitive
+
+                    for p in range(nprimitive):
                         line = lines[lineno]
                         lineno += 1
+                        line = line.replace('D', 'e', 2)
+                        line = line.replace('d', 'e', 2)
+
+                        what = _primitives2.match(line)
+                        # Must match primitivies2
+                        if not what:
+                            raise ValidationError("Gaussian94BasisSetParser::parse: Unable to match an exponent with two contractions: line %d: %s" % (lineno, line))
+                        exponent = float(what.group(1))
+                        contraction = float(what.group(2))
+
+                        # Scale the contraction and save the information
+                        contraction *= scale
+                        exponents[p] = exponent
+                        contractions1[p] = contraction
+
+                        # Do the other contraction
+                        contraction = float(what.group(3))
+
+                        # Scale the contraction and save the information
+                        contraction *= scale
+                        contractions2[p] = contraction
+
+                    shell_list.append(ShellInfo(am1, contractions1, exponents,
+                        gaussian_type, 0, center, 0, 'Unnormalized'))
+                    shell_list.append(ShellInfo(am2, contractions2, exponents,
+                        gaussian_type, 0, center, 0, 'Unnormalized'))
+                else:
+                    raise ValidationError("""Gaussian94BasisSetParser::parse: Unable to parse basis sets with spd, or higher grouping""")
+            else:
+                raise ValidationError("""Gaussian94BasisSetParser::parse: Expected shell information, but got: line %d: %s""" % (lineno, line))
+            line = lines[lineno]
+            lineno += 1
 
-                    break
+        return shell_list, msg
 
-        if not found:
-            #raise BasisSetNotFound("Gaussian94BasisSetParser::parser: Unable to find the basis set for %s in %s" % \
-            #   (symbol, self.filename), silent=True)
-            return None, None
 
-        return shell_list, msg
+class ArchivedBasisSet(object):
+    """Basis set file *filename* as held by BasisSetArchive *archive*,
+    with *entries* its index of atom symbols to archive entries, for
+    :py:func:`Gaussian94BasisSetParser.parse`. Parsed entries are cached
+    by the sha1 of the contents compiled, so a rebuilt archive isn't
+    answered with shells of the file as it was.
+
+    """
+
+    def __init__(self, archive, filename, entries):
+        self.archive = archive
+        self.filename = filename
+        self.entries = entries
+        name = os.path.basename(filename)
+        self.key = ('archive', archive.filename, name, archive.files[name][2])
+
+
+class BasisSetArchive(object):
+    """Compiled basis set library *filename* written by
+    compile_basis_library(). Records for each .gbs file of its directory
+    the size, mtime, and sha1 and, for each atom symbol, the first entry;
+    the shells of all entries are held as contiguous arrays of angular
+    momenta, primitive counts and offsets, exponents, and (unnormalized)
+    contraction coefficients.
+
+    """
+
+    def __init__(self, filename):
+        self.filename = os.path.abspath(filename)
+        self.directory = os.path.dirname(self.filename)
+        with open(self.filename, 'rb') as handle:
+            npz = np.load(handle)
+            header = npz['header'][()]
+            if isinstance(header, bytes):
+                header = header.decode('utf-8')
+            header = json.loads(header)
+            if header['version'] != ARCHIVE_VERSION:
+                raise ValidationError("""Basis set archive %s has format version %s, not %s. Rebuild it.""" %
+                                      (filename, header['version'], ARCHIVE_VERSION))
+            # per entry: first shell, number of shells, line number, and puream
+            self.entry_shell = npz['entry_shell'].tolist()
+            self.entry_nshell = npz['entry_nshell'].tolist()
+            self.entry_lineno = npz['entry_lineno'].tolist()
+            self.entry_pure = npz['entry_pure'].tolist()
+            # per shell: angular momentum, first primitive, and number of primitives
+            self.shell_am = npz['shell_am'].tolist()
+            self.shell_prim = npz['shell_prim'].tolist()
+            self.shell_nprim = npz['shell_nprim'].tolist()
+            # per primitive
+            self.exps = npz['exps'].tolist()
+            self.coefs = npz['coefs'].tolist()
+        # {name: (size, mtime, sha1, {SYMBOL: entry})}
+        self.files = dict((name, (size, mtime, sha1, entries)) for name, size, mtime, sha1, entries in header['files'])
+        # whether file holds contents as compiled, keyed by (name, size, mtime)
+        self.current = {}
+
+    def entries(self, filename):
+        """Returns {SYMBOL: entry} index of .gbs *filename* if the archive
+        holds its current contents, else None. Unchanged size and mtime
+        are trusted; otherwise contents are compared by hash.
+
+        """
+        if os.path.dirname(os.path.abspath(filename)) != self.directory:
+            return None
+        name = os.path.basename(filename)
+        try:
+            size, mtime, sha1, entries = self.files[name]
+            stat = os.stat(filename)
+        except (KeyError, OSError):
+            return None
+        key = (name, stat.st_size, stat.st_mtime)
+        if key not in self.current:
+            if stat.st_size == size and stat.st_mtime == mtime:
+                self.current[key] = True
+            else:
+                with open(filename, 'rb') as handle:
+                    self.current[key] = hashlib.sha1(handle.read()).hexdigest() == sha1
+        return entries if self.current[key] else None
+
+    def shells(self, entry, gaussian_type=None):
+        """Returns list of ShellInfo and location message of *entry*,
+        the shells Pure or Cartesian as compiled unless *gaussian_type*.
+
+        """
+        if gaussian_type is None:
+            gaussian_type = 'Pure' if self.entry_pure[entry] else 'Cartesian'
+
+        # Need a dummy center for the shell.
+        center = [0.0, 0.0, 0.0]
+
+        shell_list = []
+        first = self.entry_shell[entry]
+        for sh in range(first, first + self.entry_nshell[entry]):
+            start = self.shell_prim[sh]
+            stop = start + self.shell_nprim[sh]
+            shell_list.append(ShellInfo(self.shell_am[sh], self.coefs[start:stop], self.exps[start:stop],
+                gaussian_type, 0, center, 0, 'Unnormalized'))
+        return shell_list, """line %5d""" % (self.entry_lineno[entry])
+
+
+def compile_basis_library(directory, filename=None):
+    """Compiles the .gbs files of *directory* into BasisSetArchive
+    *filename*, by default ARCHIVE_NAME within *directory*, where
+    :py:func:`Gaussian94BasisSetParser.load_library_file` finds it.
+    Files with an entry that doesn't parse are left out, to be read as
+    text. Returns *filename*.
+
+    The archive is an uncompressed NPZ of a JSON header (version and,
+    per file, size, mtime, sha1, and entry of each atom symbol) and flat
+    arrays of each entry's first shell, shell count, line number, and
+    puream; each shell's angular momentum, first primitive, and
+    primitive count; and each primitive's exponent and coefficient.
+
+    """
+    if np is None:
+        raise ValidationError("""NumPy must be available to compile basis set archive.""")
+    directory = os.path.abspath(directory)
+    if filename is None:
+        filename = os.path.join(directory, ARCHIVE_NAME)
+
+    parser = Gaussian94BasisSetParser()
+    files = []
+    entry_shell, entry_nshell, entry_lineno, entry_pure = [], [], [], []
+    shell_am, shell_prim, shell_nprim = [], [], []
+    exps, coefs = [], []
+    for gbs in sorted(glob.glob(os.path.join(directory, '*.gbs'))):
+        try:
+            lines = parser.read_file(gbs)
+            index = parser.index(lines)
+            parsed = {}
+            for symbol, (lineno, gaussian_type) in sorted(index.items()):
+                if lineno not in parsed:
+                    parsed[lineno] = (gaussian_type, parser.parse_entry(lines, lineno, gaussian_type)[0])
+        except (ValidationError, IndexError, KeyError, ValueError) as err:
+            print("""Warning: Basis set file %s left out of archive: %s""" % (gbs, err))
+            continue
+
+        entries = {}
+        for lineno, (gaussian_type, shell_list) in sorted(parsed.items()):
+            entries[lineno] = len(entry_shell)
+            entry_shell.append(len(shell_am))
+            entry_nshell.append(len(shell_list))
+            entry_lineno.append(lineno)
+            entry_pure.append(gaussian_type == 'Pure')
+            for sh in shell_list:
+                shell_am.append(sh.am())
+                shell_prim.append(len(exps))
+                shell_nprim.append(sh.nprimitive())
+                exps.extend(sh.exps())
+                coefs.extend(sh.original_coefs())
+
+        with open(gbs, 'rb') as handle:
+            sha1 = hashlib.sha1(handle.read()).hexdigest()
+        stat = os.stat(gbs)
+        files.append([os.path.basename(gbs), stat.st_size, stat.st_mtime, sha1,
+                      dict((symbol, entries[lineno]) for symbol, (lineno, gaussian_type) in index.items())])
+
+    header = OrderedDict()
+    header['version'] = ARCHIVE_VERSION
+    header['files'] = files
+    with open(filename, 'wb') as handle:
+        np.savez(handle, header=np.array(json.dumps(header)),
+                 entry_shell=np.array(entry_shell, dtype=np.int32),
+                 entry_nshell=np.array(entry_nshell, dtype=np.int32),
+                 entry_lineno=np.array(entry_lineno, dtype=np.int32),
+                 entry_pure=np.array(entry_pure, dtype=np.int8),
+                 shell_am=np.array(shell_am, dtype=np.int32),
+                 shell_prim=np.array(shell_prim, dtype=np.int64),
+                 shell_nprim=np.array(shell_nprim, dtype=np.int32),
+                 exps=np.array(exps, dtype=float),
+                 coefs=np.array(coefs, dtype=float))
+    return filename
@@ -200,7 +200,7 @@ class ShellInfo(object):
         tmp1 = self.l + 1.5
         g = 2.0 * self.PYexp[p]
         z = pow(g, tmp1)
-        return math.sqrt((pow(2.0, self.l) * z) / (math.pi * math.sqrt(math.pi) * df(2 * self.l)))
+        return math.sqrt((pow(2.0, self.l) * z) / (math.pi * math.sqrt(math.pi) * df(2 * self.l - 1)))
 
     def contraction_normalization(self):
         """Normalizes an entire contraction set. Applies the normalization to the coefficients
@@ -214,7 +214,7 @@ class ShellInfo(object):
                 z = pow(g, self.l + 1.5)
                 e_sum += self.PYcoef[i] * self.PYcoef[j] / z
 
-        tmp = ((2.0 * math.pi / (2.0 / math.sqrt(math.pi))) * df(2 * self.l)) / pow(2.0, self.l)
+        tmp = ((2.0 * math.pi / (2.0 / math.sqrt(math.pi))) * df(2 * self.l - 1)) / pow(2.0, self.l)
         try:
             norm = math.sqrt(1.0 / (tmp * e_sum))
         except ZeroDivisionError:
@@ -253,7 +253,7 @@ class ShellInfo(object):
                     tsum += temp
         prefac = 1.0
         if self.l > 1:
-            prefac = pow(2.0, 2 * self.l) / df(2 * self.l)
+            prefac = pow(2.0, 2 * self.l) / df(2 * self.l - 1)
         norm = math.sqrt(prefac / tsum)
         for j in range(self.nprimitive()):
             self.PYerd_coef.append(self.PYoriginal_coef[j] * norm)
@@ -32,10 +32,15 @@ import os
 import re
 import copy
 import math
+import contextlib
 try:
     from collections import OrderedDict
 except ImportError:
     from .oldpymodules import OrderedDict
+try:
+    import numpy as np
+except ImportError:
+    np = None
 from .periodictable import *
 from .physconst import *
 from .vecutil import *
@@ -85,6 +90,15 @@ class LibmintsMolecule(object):
     FullPointGroupList = ["ATOM", "C_inf_v", "D_inf_h", "C1", "Cs", "Ci", \
         "Cn", "Cnv", "Cnh", "Sn", "Dn", "Dnd", "Dnh", "Td", "Oh", "Ih"]
 
+    # whether extract_fragments leaves update_geometry to the caller by
+    #   default, only within deferred_extract_update()
+    _defer_extract_update = False
+
+    # symmetry_frame and set_full_point_group results shared by all
+    #   molecules, keyed by _symmetry_key fingerprints of the geometry
+    symmetry_cache = {}
+    symmetry_cache_size = 4096
+
     def __init__(self, psi4molstr=None):
         """Initialize Molecule object from string in psi4 format"""
 
@@ -117,6 +131,9 @@ class LibmintsMolecule(object):
         self.all_variables = []
         # A listing of the variables used to define the geometries
         self.geometry_variables = {}
+        # NumPy arrays over atoms formed from the coordinates on demand,
+        #   dropped whenever atoms or coordinates change (see _array)
+        self.PYarrays = {}
 
         # <<< Fragmentation >>>
 
@@ -135,6 +152,8 @@ class LibmintsMolecule(object):
         self.PYmove_to_com = True
         # Reorient or not?  UNUSED
         self.PYfix_orientation = False
+        # Skip symmetry detection, taking the molecule as C1 in its input frame
+        self.PYno_symmetry_analysis = False
         # Reinterpret the coord entries or not (Default is true, except for findif)
         self.PYreinterpret_coordentries = True
         # Nilpotence boolean (flagged upon first determination of symmetry frame,
@@ -337,6 +356,9 @@ class LibmintsMolecule(object):
 
         """
         if to_au:
+            if np is not None:
+                temp = self._array('geom')[atom]
+                return temp.tolist() if posn is None else float(temp[posn])
             factor = self.input_units_to_au
         else:
             factor = 1.0
@@ -367,7 +389,8 @@ class LibmintsMolecule(object):
         >>>  H2OH2O.set_mass(4, 2.0141017778)
 
         """
-        self.full_atoms[atom].PYmass = mass        
+        self.full_atoms[atom].PYmass = mass
+        self.PYarrays = {}
 
     def symbol(self, atom):
         """Returns the cleaned up label of the atom (C2 => C, H4 = H) (0-indexed)
@@ -539,7 +562,7 @@ class LibmintsMolecule(object):
         for fr in range(self.nfragments()):
             self.fragment_types[fr] = 'Absent'
 
-    def extract_subsets(self, reals, ghosts=[]):
+    def extract_subsets(self, reals, ghosts=[], update=None):
         """Wrapper for :py:func:`~qcdb.molecule.extract_fragments`.
         See note there. This function can be used as long as not
         in psi4 input file. Use extract_fragments directly, then.
@@ -549,13 +572,15 @@ class LibmintsMolecule(object):
         >>> obj.extract_subsets(1,[2,3])  # monomer A, CP-corrected if obj is tri-molecular complex
 
         """
-        return self.extract_fragments(reals, ghosts=ghosts)
+        return self.extract_fragments(reals, ghosts=ghosts, update=update)
 
-    def extract_fragments(self, reals, ghosts=[]):
+    def extract_fragments(self, reals, ghosts=[], update=None):
         """Makes a copy of the molecule, returning a new molecule with
         only certain fragment atoms present as either ghost or real atoms
         *reals*: The list or int of fragments (1-indexed) that should be present in the molecule as real atoms.
         *ghosts*: The list or int of fragments (1-indexed) that should be present in the molecule as ghosts.
+        *update*: Whether to update_geometry on the new molecule. None
+        means True except within deferred_extract_update().
         (method name in libmints is extract_subsets. This is different
         in qcdb because the psi4 input parser tries to process lines with
         that term, giving rise to Boost:Python type conlicts.) See usage
@@ -584,9 +609,31 @@ class LibmintsMolecule(object):
         for fr in lghosts:
             subset.set_ghost_fragment(fr + 1)  # the ghost fragment code subtracts 1
 
-        subset.update_geometry()
+        if update is None:
+            update = not LibmintsMolecule._defer_extract_update
+        if update:
+            subset.update_geometry()
         return subset
 
+    @staticmethod
+    @contextlib.contextmanager
+    def deferred_extract_update():
+        """Context manager within which extract_fragments calls not given
+        *update* leave update_geometry to the caller, as for database
+        modules imported by qcdb.WrappedDatabase. The previous behavior is
+        restored on exit, even by exception.
+
+        >>> with qcdb.Molecule.deferred_extract_update():
+        ...     monoA = dimer.extract_subsets(1)
+
+        """
+        previous = LibmintsMolecule._defer_extract_update
+        LibmintsMolecule._defer_extract_update = True
+        try:
+            yield
+        finally:
+            LibmintsMolecule._defer_extract_update = previous
+
     # <<< Methods for Construction >>>
 
     def create_molecule_from_string(self, text):
@@ -601,6 +648,7 @@ class LibmintsMolecule(object):
         ang = re.compile(r'^\s*units?[\s=]+(ang|angstrom)\s*$', re.IGNORECASE)
         orient = re.compile(r'^\s*(no_reorient|noreorient)\s*$', re.IGNORECASE)
         com = re.compile(r'^\s*(no_com|nocom)\s*$', re.IGNORECASE)
+        nosymm = re.compile(r'^\s*(no_symmetry_analysis|nosymmetryanalysis)\s*$', re.IGNORECASE)
         symmetry = re.compile(r'^\s*symmetry[\s=]+(\w+)\s*$', re.IGNORECASE)
         ATOM = '((([A-Z]{1,3})_\w+)|(([A-Z]{1,3})\d*))'  # match 'C', 'al', 'p88', 'p_pass' not 'Ofail', 'h99_text'  # good, but unused
         atom = re.compile(r'^(?:(?P<gh1>@)|(?P<gh2>Gh\())?(?P<label>(?P<symbol>[A-Z]{1,3})(?:(_\w+)|(\d+))?)(?(gh2)\))(?:@(?P<mass>\d+\.\d+))?$', re.IGNORECASE)
@@ -635,6 +683,10 @@ class LibmintsMolecule(object):
             elif com.match(line):
                 self.PYmove_to_com = False
 
+            # handle no_symmetry_analysis
+            elif nosymm.match(line):
+                self.PYno_symmetry_analysis = True
+
             # handle symmetry
             elif symmetry.match(line):
                 self.PYsymmetry_from_input = symmetry.match(line).group(1).lower()
@@ -1098,6 +1150,8 @@ class LibmintsMolecule(object):
                 text += "    no_com\n"
             if self.PYfix_orientation:
                 text += "    no_reorient\n"
+            if self.PYno_symmetry_analysis:
+                text += "    no_symmetry_analysis\n"
 
             # append atoms and coordentries and fragment separators with charge and multiplicity
             Pfr = 0
@@ -1175,6 +1229,7 @@ class LibmintsMolecule(object):
                 NumberValue(x), NumberValue(y), NumberValue(z)))
             if label.upper() != 'X':
                 self.atoms.append(self.full_atoms[-1])
+            self.PYarrays = {}
         else:
             raise ValidationError("Molecule::add_atom: Adding atom on top of an existing atom.")
 
@@ -1192,6 +1247,9 @@ class LibmintsMolecule(object):
         if len(b) != 3:
             raise ValidationError('Molecule::atom_at_position: Argument vector not of length 3\n')
 
+        if self.natom() > SpatialHash.min_points:
+            return self._spatial_hash(tol).index_within(b)
+
         for at in range(self.natom()):
             a = self.xyz(at)
             if distance(b, a) < tol:
@@ -1228,6 +1286,7 @@ class LibmintsMolecule(object):
         """
         self.__dict__['lock_frame'] = False
         self.__dict__['geometry_variables'][vstr.upper()] = val
+        self.__dict__['PYarrays'] = {}
         print("""Setting geometry variable %s to %f""" % (vstr.upper(), val))
         try:
             self.update_geometry()
@@ -1293,6 +1352,8 @@ class LibmintsMolecule(object):
                 self.__dict__[name] = value
         except KeyError:
             self.__dict__[name] = value
+        if name in ['atoms', 'full_atoms', 'input_units_to_au'] or (name == 'lock_frame' and not value):
+            self.__dict__['PYarrays'] = {}
 
     def __getattr__(self, name):
         """Function to overload accessing attribute contents to allow
@@ -1331,6 +1392,8 @@ class LibmintsMolecule(object):
         [[-2.930978460188563, -0.21641143673806384, 0.0], [-3.655219780069251, 1.4409218455037016, 0.0], [-1.1332252981904638, 0.0769345303220403, 0.0], [2.5523113582286716, 0.21064588230662976, 0.0], [3.175492014248769, -0.7062681346308132, -1.4334725450878665], [3.175492014248769, -0.7062681346308132, 1.4334725450878665]]
 
         """
+        if np is not None:
+            return self._array('geom').tolist()
         geom = []
         for at in range(self.natom()):
             geom.append([self.x(at), self.y(at), self.z(at)])
@@ -1343,11 +1406,82 @@ class LibmintsMolecule(object):
         [[-2.930978460188563, -0.21641143673806384, 0.0], [-3.655219780069251, 1.4409218455037016, 0.0], [-1.1332252981904638, 0.0769345303220403, 0.0], [0.0, 0.0, 0.0], [2.5523113582286716, 0.21064588230662976, 0.0], [3.175492014248769, -0.7062681346308132, -1.4334725450878665], [3.175492014248769, -0.7062681346308132, 1.4334725450878665]]
 
         """
+        if np is not None:
+            return self._array('full_geom').tolist()
         geom = []
         for at in range(self.nallatom()):
             geom.append([self.fx(at), self.fy(at), self.fz(at)])
         return geom
 
+    def _array(self, key):
+        """Returns NumPy array *key* over atoms, forming it from the current
+        coordinates if not cached since atoms or coordinates last changed:
+        'geom' and 'full_geom' (natom x 3 and nallatom x 3 in Bohr), 'Z',
+        'mass', and 'charge'.
+
+        """
+        try:
+            return self.PYarrays[key]
+        except KeyError:
+            pass
+        if key == 'geom':
+            arr = np.array([atom.compute() for atom in self.atoms], dtype=float).reshape(-1, 3)
+            arr *= self.input_units_to_au
+        elif key == 'full_geom':
+            arr = np.array([atom.compute() for atom in self.full_atoms], dtype=float).reshape(-1, 3)
+            arr *= self.input_units_to_au
+        elif key == 'Z':
+            arr = np.array([atom.Z() for atom in self.atoms], dtype=float)
+        elif key == 'mass':
+            arr = np.array([self.mass(at) for at in range(self.natom())], dtype=float)
+        elif key == 'charge':
+            arr = np.array([atom.charge() for atom in self.atoms], dtype=float)
+        else:
+            raise ValidationError('Molecule::_array: Array %s unknown.' % (key))
+        self.PYarrays[key] = arr
+        return arr
+
+    def _spatial_hash(self, tol):
+        """Returns SpatialHash of the atom positions in Bohr for lookups
+        within *tol*, cached alongside and invalidated with the coordinate
+        arrays of _array.
+
+        """
+        key = ('hash', tol)
+        try:
+            return self.PYarrays[key]
+        except KeyError:
+            pass
+        self.PYarrays[key] = SpatialHash(self.geometry(), tol)
+        return self.PYarrays[key]
+
+    def _symmetry_key(self, tol):
+        """Returns hashable fingerprint of the quantities on which symmetry
+        detection with tolerance *tol* depends (Bohr coordinates and the
+        Z, mass, ghosting, and basis hashes that decide atom equivalence).
+
+        """
+        return (tol,
+                tuple(coord for row in self.geometry() for coord in row),
+                tuple(self._equivalence_key(atom) for atom in self.atoms))
+
+    def _symmetry_cached(self, kind, tol, compute):
+        """Returns symmetry result *kind* at tolerance *tol* for the
+        current geometry from symmetry_cache, else from callable *compute*,
+        storing it.
+
+        """
+        key = (kind,) + self._symmetry_key(tol)
+        try:
+            return copy.deepcopy(self.symmetry_cache[key])
+        except KeyError:
+            pass
+        result = compute()
+        if len(self.symmetry_cache) >= self.symmetry_cache_size:
+            self.symmetry_cache.clear()
+        self.symmetry_cache[key] = copy.deepcopy(result)
+        return result
+
     def set_geometry(self, geom, units='a0'):
         """Sets the geometry, given a N X 3 array of coordinates *geom* in units *units*.
 
@@ -1371,6 +1505,7 @@ class LibmintsMolecule(object):
                                                geom[at][2] / self.input_units_to_au)
             elif units == 'AA':
                 self.atoms[at].set_coordinates(geom[at][0], geom[at][1], geom[at][2])
+        self.PYarrays = {}
 
     def set_full_geometry(self, geom):
         """Sets the full geometry (dummies included), given a N X 3 array of coordinates *geom* in Bohr.
@@ -1383,6 +1518,7 @@ class LibmintsMolecule(object):
             self.full_atoms[at].set_coordinates(geom[at][0] / self.input_units_to_au,
                                                 geom[at][1] / self.input_units_to_au,
                                                 geom[at][2] / self.input_units_to_au)
+        self.PYarrays = {}
 
     def distance_matrix(self):
         """Computes a matrix depicting distances between atoms. Prints
@@ -1616,6 +1752,7 @@ class LibmintsMolecule(object):
         if self.nfragments() < 2:
             self.PYmolecular_charge = temp_charge
             self.PYmultiplicity = temp_multiplicity
+        self.PYarrays = {}
 
     def update_geometry(self):
         """Updates the geometry, by (re)interpreting the string used to
@@ -1651,7 +1788,7 @@ class LibmintsMolecule(object):
         #self.print_full()
 
         # If the no_reorient command was given, don't reorient
-        if not self.PYfix_orientation:
+        if not self.PYfix_orientation and not self.PYno_symmetry_analysis:
             # Now we need to rotate the geometry to its symmetry frame
             # to align the axes correctly for the point group
             # symmetry_frame looks for the highest point group so that we can align
@@ -1662,6 +1799,16 @@ class LibmintsMolecule(object):
             #print "after rotate:"
             #self.print_full()
 
+        # Without symmetry analysis, the molecule is C1 and needs no symmetrizing
+        if self.PYno_symmetry_analysis:
+            if self.symmetry_from_input() not in [None, 'c1']:
+                raise ValidationError("Molecule::update_geometry: User specified point group (%s) can't be used with no_symmetry_analysis" % (self.symmetry_from_input()))
+            self.set_point_group(PointGroup('c1'))
+            self.full_pg = 'C1'
+            self.PYfull_pg_n = 1
+            self.lock_frame = True
+            return
+
         # Recompute point group of the molecule, so the symmetry info is updated to the new frame
         self.set_point_group(self.find_point_group())
         self.set_full_point_group()
@@ -1684,13 +1831,58 @@ class LibmintsMolecule(object):
         self.atoms = []
         self.full_atoms = []
 
-    def nuclear_repulsion_energy(self):
-        """Computes nuclear repulsion energy.
+    def _nre_blocks(self, chunksize=None):
+        """Generates pairwise quantities over atoms for the nuclear
+        repulsion energy and its derivatives in blocks of at most
+        *chunksize* rows (all atoms if None), bounding the pair arrays to
+        chunksize x natom. Yields the row range of each block and the
+        displacements R_i - R_j, distances, and Z_i Z_j products against
+        every atom, with the self-pair distances set to one and products
+        to zero.
+
+        """
+        geom = self._array('geom')
+        Zs = self._array('Z')
+        nat = self.natom()
+        step = nat if not chunksize else max(1, int(chunksize))
+        for lo in range(0, nat, step):
+            hi = min(nat, lo + step)
+            disp = geom[lo:hi, None, :] - geom[None, :, :]
+            dist = np.sqrt((disp * disp).sum(axis=2))
+            ZZ = Zs[lo:hi, None] * Zs[None, :]
+            rows = np.arange(hi - lo)
+            dist[rows, rows + lo] = 1.0
+            ZZ[rows, rows + lo] = 0.0
+            yield lo, hi, disp, dist, ZZ
+
+    def nuclear_repulsion_energy(self, chunksize=None):
+        """Computes nuclear repulsion energy. When *chunksize* is given,
+        atom pairs are formed that many rows at a time to bound memory.
 
         >>> print H2OH2O.nuclear_repulsion_energy()
         36.6628478528
 
         """
+        if np is not None and self.natom() > 1:
+            # cumulative sums keep the summation order of the loop below
+            geom = self._array('geom')
+            Zs = self._array('Z')
+            nat = self.natom()
+            if not chunksize:
+                at1, at2 = np.tril_indices(nat, -1)
+                dist = np.sqrt(((geom[at1] - geom[at2]) ** 2).sum(axis=1))
+                return float(np.cumsum(Zs[at1] * Zs[at2] / dist)[-1])
+
+            e = 0.0
+            step = max(1, int(chunksize))
+            for lo in range(1, nat, step):
+                at1, at2 = np.tril_indices(min(nat, lo + step), -1)
+                keep = at1 >= lo
+                at1, at2 = at1[keep], at2[keep]
+                dist = np.sqrt(((geom[at1] - geom[at2]) ** 2).sum(axis=1))
+                e = np.cumsum(np.concatenate(([e], Zs[at1] * Zs[at2] / dist)))[-1]
+            return float(e)
+
         e = 0.0
         for at1 in range(self.natom()):
             for at2 in range(self.natom()):
@@ -1701,13 +1893,21 @@ class LibmintsMolecule(object):
                     e += Zi * Zj / dist
         return e
 
-    def nuclear_repulsion_energy_deriv1(self):
-        """Computes nuclear repulsion energy derivatives
+    def nuclear_repulsion_energy_deriv1(self, chunksize=None):
+        """Computes nuclear repulsion energy derivatives. When *chunksize*
+        is given, atom pairs are formed that many rows at a time to bound
+        memory.
 
         >>> print H2OH2O.nuclear_repulsion_energy_deriv1()
         [[3.9020946901323774, 2.76201566471991, 0.0], [1.3172905807089021, -2.3486366050337293, 0.0], [-1.8107598525022435, -0.32511212499256564, 0.0], [-1.217656141385739, -2.6120090867576717, 0.0], [-1.0954846384766488, 1.2618710760320282, 2.1130743287465603], [-1.0954846384766488, 1.2618710760320282, -2.1130743287465603]]
 
         """
+        if np is not None and self.natom():
+            de = np.zeros((self.natom(), 3))
+            for lo, hi, disp, dist, ZZ in self._nre_blocks(chunksize):
+                de[lo:hi] = -np.einsum('ijx,ij->ix', disp, ZZ / dist ** 3)
+            return de.tolist()
+
         de = []
         for i in range(self.natom()):
             entry = [0.0, 0.0, 0.0]
@@ -1722,9 +1922,38 @@ class LibmintsMolecule(object):
             de.append(entry)
         return de
 
-    def nuclear_repulsion_energy_deriv2(self):
-        """ **NYI** Computes nuclear repulsion energy second derivatives"""
-        raise FeatureNotImplemented('Molecule::nuclear_repulsion_energy_deriv2')  # FINAL
+    def nuclear_repulsion_energy_deriv2(self, chunksize=None):
+        """Computes nuclear repulsion energy second derivatives as a
+        3*natom x 3*natom array ordered x, y, z within atom. When
+        *chunksize* is given, atom pairs are formed that many rows at a
+        time to bound memory.
+
+        """
+        nat = self.natom()
+        if np is not None and nat:
+            hess = np.zeros((nat, 3, nat, 3))
+            for lo, hi, disp, dist, ZZ in self._nre_blocks(chunksize):
+                # d2/dRi dRj of Zi Zj / r for i != j; diagonal blocks are minus the row sums
+                block = np.einsum('ija,ijb,ij->iajb', disp, disp, -3.0 * ZZ / dist ** 5)
+                block += np.einsum('ab,ij->iajb', np.identity(3), ZZ / dist ** 3)
+                hess[lo:hi] = block
+                rows = np.arange(lo, hi)
+                hess[rows, :, rows, :] = -block.sum(axis=2)
+            return hess.reshape(3 * nat, 3 * nat).tolist()
+
+        hess = [[0.0] * (3 * nat) for i in range(3 * nat)]
+        for i in range(nat):
+            for j in range(nat):
+                if i != j:
+                    rij = sub(self.xyz(i), self.xyz(j))
+                    dist = norm(rij)
+                    ZZ = self.Z(i) * self.Z(j)
+                    for a in range(3):
+                        for b in range(3):
+                            temp = ZZ * (3.0 * rij[a] * rij[b] / dist ** 5 - (1.0 if a == b else 0.0) / dist ** 3)
+                            hess[3 * i + a][3 * j + b] -= temp
+                            hess[3 * i + a][3 * i + b] += temp
+        return hess
 
     def set_basis_all_atoms(self, name, role="BASIS"):
         """Assigns basis *name* to all atoms."""
@@ -1768,6 +1997,35 @@ class LibmintsMolecule(object):
                 (number, self.natom()))
         self.atoms[number].set_shell(bshash, role)
 
+    def set_shells(self, bshashes, role="BASIS"):
+        """Assigns BasisSet hashes *bshashes* (one per atom, excludes
+        dummies) for *role*. Symmetry is re-evaluated at the next
+        update_geometry only if the new hashes change which atoms are
+        equivalent; otherwise the current frame and point group stand.
+
+        """
+        if len(bshashes) != self.natom():
+            raise ValidationError("Molecule::set_shells: %d basis hashes given for %d atoms in this molecule." % \
+                (len(bshashes), self.natom()))
+        before = self._equivalence_classes()
+        for atom, bshash in zip(self.atoms, bshashes):
+            atom.set_shell(bshash, role)
+        if self._equivalence_classes() != before:
+            self.lock_frame = False
+
+    def _equivalence_classes(self):
+        """Returns list labeling each atom by the first atom to which it is
+        equivalent in the CoordEntry.is_equivalent_to sense.
+
+        """
+        first = {}
+        return [first.setdefault(self._equivalence_key(atom), at) for at, atom in enumerate(self.atoms)]
+
+    @staticmethod
+    def _equivalence_key(atom):
+        """Returns hashable form of what CoordEntry.is_equivalent_to compares."""
+        return (atom.PYZ, atom.PYmass, atom.ghosted, tuple(sorted(atom.PYshells.items())))
+
     def nfrozen_core(self, depth=False):
         """Number of frozen core for molecule given freezing state.
 
@@ -1818,6 +2076,7 @@ class LibmintsMolecule(object):
             temp = add(temp, r)
             temp = scale(temp, 1.0 / self.input_units_to_au)
             self.full_atoms[at].set_coordinates(temp[0], temp[1], temp[2])
+        self.PYarrays = {}
 
     def center_of_mass(self, to_au=True):
         """Computes center of mass of molecule (does not translate molecule).
@@ -1826,6 +2085,12 @@ class LibmintsMolecule(object):
         [-0.12442647346606871, 0.00038657002584110707, 0.0]
 
         """
+        if np is not None and to_au:
+            # cumulative sums keep the summation order of the loop below
+            masses = self._array('mass')
+            ret = np.cumsum(masses[:, None] * self._array('geom'), axis=0)[-1]
+            return (ret * (1.0 / np.cumsum(masses)[-1])).tolist()
+
         ret = [0.0, 0.0, 0.0]
         total_m = 0.0
 
@@ -1858,6 +2123,20 @@ class LibmintsMolecule(object):
         [[8.704574864178731, -8.828375721817082, 0.0], [-8.828375721817082, 280.82861714077666, 0.0], [0.0, 0.0, 281.249500988553]]
 
         """
+        if np is not None and self.natom():
+            # cumulative sums keep the summation order of the loop below
+            x, y, z = self._array('geom').T
+            m = self._array('mass')
+            tensor = np.empty((3, 3))
+            tensor[0][0] = np.cumsum(m * (y * y + z * z))[-1]
+            tensor[1][1] = np.cumsum(m * (x * x + z * z))[-1]
+            tensor[2][2] = np.cumsum(m * (x * x + y * y))[-1]
+            tensor[0][1] = tensor[1][0] = -np.cumsum(m * x * y)[-1]
+            tensor[0][2] = tensor[2][0] = -np.cumsum(m * x * z)[-1]
+            tensor[1][2] = tensor[2][1] = -np.cumsum(m * y * z)[-1]
+            tensor[np.abs(tensor) < ZERO] = 0.0
+            return tensor.tolist()
+
         tensor = [[0, 0, 0], [0, 0, 0], [0, 0, 0]]
 
         for i in range(self.natom()):
@@ -2009,11 +2288,14 @@ class LibmintsMolecule(object):
                 item.invalidate()
 
             for fr in range(self.nfragments()):
+                if self.fragment_types[fr] == 'Absent':
+                    continue
                 for at in range(self.fragments[fr][0], self.fragments[fr][1] + 1):
                     self.full_atoms[at].compute()
                     self.full_atoms[at].set_ghosted(self.fragment_types[fr] == 'Ghost')
                     if self.full_atoms[at].symbol() != 'X':
                         self.atoms.append(self.full_atoms[at])
+            self.PYarrays = {}
         else:  # release orientation to be free
             self.PYfix_orientation = False
 
@@ -2103,6 +2385,14 @@ class LibmintsMolecule(object):
         order n in Cn. 0 for atoms or infinity.
 
         """
+        def compute():
+            self._set_full_point_group(tol)
+            return self.full_pg, self.PYfull_pg_n
+
+        self.full_pg, self.PYfull_pg_n = self._symmetry_cached('full_pg', tol, compute)
+
+    def _set_full_point_group(self, tol):
+        """Body of set_full_point_group for the uncached case."""
         verbose = 1  # TODO
         # Get cartesian geometry and put COM at origin
         geom = self.geometry()
@@ -2251,12 +2541,13 @@ class LibmintsMolecule(object):
 
             # Check for sigma_h (xy plane).
             op_sigma_h = False
+            geom_hash = SpatialHash(geom, tol)
             for at in range(self.natom()):
                 if abs(geom[at][2]) < tol:
                     continue  # atom is in xy plane
                 else:
                     test_atom = [geom[at][0], geom[at][1], -1 * geom[at][2]]
-                    if not atom_present_in_geom(geom, test_atom, tol):
+                    if geom_hash.index_within(test_atom) < 0:
                         break
             else:
                 op_sigma_h = True
@@ -2292,12 +2583,13 @@ class LibmintsMolecule(object):
 
             # Check for sigma_v (yz plane).
             op_sigma_v = False
+            geom_hash = SpatialHash(geom, tol)
             for at in range(self.natom()):
                 if abs(geom[at][0]) < tol:
                     continue  # atom is in yz plane
                 else:
                     test_atom = [-1 * geom[at][0], geom[at][1], geom[at][2]]
-                    if not atom_present_in_geom(geom, test_atom, tol):
+                    if geom_hash.index_within(test_atom) < 0:
                         break
             else:
             #if at == self.natom():
@@ -2486,14 +2778,59 @@ class LibmintsMolecule(object):
                 axis = scale(axis, -1.0)
         return like, axis
 
+    def c1_prescreen(self, origin, tol=DEFAULT_SYM_TOL):
+        """Whether the molecule can cheaply be shown to have no symmetry
+        operation about *origin* at tolerance *tol*, so that searching
+        for one may be skipped. Any operation maps each atom onto an
+        equivalent atom the same distance from *origin*. When no two
+        atoms alike in Z, mass, and ghosting share a distance, every atom
+        must map onto itself, which only a plane or axis holding all the
+        atoms allows, ruled out when the molecule is far from planar.
+        False means undecided, not that symmetry is present.
+
+        """
+        key = ('c1', tol, tuple(origin))
+        try:
+            return self.PYarrays[key]
+        except KeyError:
+            pass
+
+        # margins far beyond tol, as missing a proof only costs time
+        margin = max(1.0e-5, 100.0 * tol)
+        proven = self.natom() > 3
+        if proven:
+            seps = [sub(row, origin) for row in self.geometry()]
+            signature = sorted(((atom.PYZ, atom.PYmass, atom.ghosted), dot(sep, sep))
+                               for atom, sep in zip(self.atoms, seps))
+            for (kind1, rr1), (kind2, rr2) in zip(signature, signature[1:]):
+                if kind1 == kind2 and rr2 - rr1 < margin:
+                    proven = False
+                    break
+        if proven:
+            # smallest second moment bounds distances from the best plane through origin
+            moment = zero(3, 3)
+            for sep in seps:
+                for i in range(3):
+                    for j in range(3):
+                        moment[i][j] += sep[i] * sep[j]
+            evals, evecs = diagonalize3x3symmat(moment)
+            proven = min(evals) > self.natom() * margin
+
+        self.PYarrays[key] = proven
+        return proven
+
     def find_point_group(self, tol=DEFAULT_SYM_TOL):
         """Find computational molecular point group, user can override
         this with the "symmetry" keyword. Result is highest D2h subgroup
         attendant on molecule and allowed by the user.
 
         """
-        pg = self.find_highest_point_group(tol)  # D2h subgroup
         user = self.symmetry_from_input()
+        if user == 'c1':
+            # c1 is a subgroup of anything detected
+            return PointGroup(user)
+
+        pg = self.find_highest_point_group(tol)  # D2h subgroup
 
         if user is not None:
             # Need to handle the cases that the user only provides C2, C2v, C2h, Cs.
@@ -2546,6 +2883,8 @@ class LibmintsMolecule(object):
 
         """
         pg_bits = 0
+        if self.c1_prescreen([0.0, 0.0, 0.0], tol):
+            return PointGroup(pg_bits)
 
         # The order of the next 2 arrays MUST match!
         symm_bit = [
@@ -2602,11 +2941,20 @@ class LibmintsMolecule(object):
         [[1.0, -0.0, 0.0], [0.0, 1.0, 0.0], [0.0, -0.0, 1.0]]
 
         """
+        return self._symmetry_cached('frame', tol, lambda: self._symmetry_frame(tol))
+
+    def _symmetry_frame(self, tol):
+        """Body of symmetry_frame for the uncached case."""
         com = self.center_of_mass()
         worldxaxis = [1.0, 0.0, 0.0]
         worldyaxis = [0.0, 1.0, 0.0]
         worldzaxis = [0.0, 0.0, 1.0]
 
+        if self.c1_prescreen(com, tol):
+            # no axes or planes to find, so the frame is the world axes as below
+            yaxis = scale(cross(worldxaxis, worldzaxis), -1.0)
+            return [[worldxaxis[i], yaxis[i], worldzaxis[i]] for i in range(3)]
+
         sigma = [0.0, 0.0, 0.0]
         sigmav = [0.0, 0.0, 0.0]
         c2axis = [0.0, 0.0, 0.0]
@@ -3161,6 +3509,97 @@ class LibmintsMolecule(object):
         return mmax
 
 
+class SpatialHash(object):
+    """Buckets the rows of *points* (3D coordinates) into cubic cells at
+    least *cell* on a side, so that the points within *tol* of a position
+    are found by examining the one to eight cells around it rather than
+    every point. Answers match those of scanning all points in order.
+
+    """
+    # below this many points, a plain scan is as quick as hashing
+    min_points = 8
+
+    def __init__(self, points, tol, cell=0.5):
+        self.points = [[pt[0], pt[1], pt[2]] for pt in points]
+        self.tol = tol
+        self.cell = max(cell, 4.0 * abs(tol))
+        self.cells = {}
+        cell = self.cell
+        for idx, pt in enumerate(self.points):
+            key = (int(math.floor(pt[0] / cell)), int(math.floor(pt[1] / cell)), int(math.floor(pt[2] / cell)))
+            self.cells.setdefault(key, []).append(idx)
+
+    def candidates(self, b):
+        """Returns ascending indices of points in the cells around *b*,
+        a superset of the points within tol of it.
+
+        """
+        # twice tol brackets the cells, proof against rounding at cell edges
+        slack = 2.0 * abs(self.tol)
+        spans = [range(int(math.floor((b[xyz] - slack) / self.cell)),
+                       int(math.floor((b[xyz] + slack) / self.cell)) + 1) for xyz in range(3)]
+        found = []
+        for i in spans[0]:
+            for j in spans[1]:
+                for k in spans[2]:
+                    found.extend(self.cells.get((i, j, k), []))
+        if len(spans[0]) * len(spans[1]) * len(spans[2]) > 1:
+            found.sort()
+        return found
+
+    def index_within(self, b):
+        """Returns lowest index of a point closer than tol to *b*, else -1."""
+        for idx in self.candidates(b):
+            if distance(b, self.points[idx]) < self.tol:
+                return idx
+        return -1
+
+    def pairs_within(self, cutoff):
+        """Returns [i, j, distance] for each pair of points i < j closer
+        than *cutoff*, ordered by i then j. Only cells within *cutoff* of
+        one another are compared, so the cost grows with the number of
+        points rather than its square when *cutoff* is short.
+
+        """
+        reach = int(math.ceil(cutoff / self.cell))
+        span = range(-reach, reach + 1)
+        # half the neighborhood, so each pair of cells is visited once
+        offsets = [(i, j, k) for i in span for j in span for k in span if (i, j, k) > (0, 0, 0)]
+        if np is not None:
+            coords = np.array(self.points, dtype=float).reshape(-1, 3)
+
+        pairs = []
+        for key, members in self.cells.items():
+            others = [idx for off in offsets
+                      for idx in self.cells.get((key[0] + off[0], key[1] + off[1], key[2] + off[2]), [])]
+            if np is not None:
+                mem = np.array(members)
+                dist = np.sqrt(((coords[mem][:, None, :] - coords[mem][None, :, :]) ** 2).sum(axis=2))
+                for i, j in zip(*np.nonzero(np.triu(dist < cutoff, 1))):
+                    pairs.append([members[i], members[j], float(dist[i, j])])
+                if others:
+                    oth = np.array(others)
+                    dist = np.sqrt(((coords[mem][:, None, :] - coords[oth][None, :, :]) ** 2).sum(axis=2))
+                    for i, j in zip(*np.nonzero(dist < cutoff)):
+                        pairs.append(sorted([members[i], others[j]]) + [float(dist[i, j])])
+            else:
+                for ii, i in enumerate(members):
+                    for j in members[ii + 1:] + others:
+                        dist = distance(self.points[i], self.points[j])
+                        if dist < cutoff:
+                            pairs.append(sorted([i, j]) + [dist])
+        pairs.sort()
+        return pairs
+
+    def has_match(self, b):
+        """Whether some point lies within tol of *b* in every coordinate."""
+        for idx in self.candidates(b):
+            a = self.points[idx]
+            if abs(b[0] - a[0]) <= self.tol and abs(b[1] - a[1]) <= self.tol and abs(b[2] - a[2]) <= self.tol:
+                return True
+        return False
+
+
 def atom_present_in_geom(geom, b, tol=DEFAULT_SYM_TOL):
     """Function used by set_full_point_group() to scan a given geometry
     and determine if an atom is present at a given location.
@@ -3181,15 +3620,90 @@ def matrix_3d_rotation_Cn(coord, axis, reflect, tol=DEFAULT_SYM_TOL, max_Cn_to_c
     @returns n
 
     """
-    # Check all atoms. In future, make more intelligent.
     max_possible = len(coord) if max_Cn_to_check == -1 else max_Cn_to_check
 
-    Cn = 1  # C1 is there for sure
-    for n in range(2, max_possible + 1):
+    # Only orders dividing the ring sizes can map points onto each other,
+    #   and the highest passing order is the answer, so test downwards.
+    ring_gcd = _ring_size_gcd(coord, axis, reflect, tol, max_possible)
+    for n in range(max_possible, 1, -1):
+        if ring_gcd and ring_gcd % n:
+            continue
         rotated_mat = matrix_3d_rotation(coord, axis, 2 * math.pi / n, reflect)
         if equal_but_for_row_order(coord, rotated_mat, tol):
-            Cn = n
-    return Cn
+            return n
+    return 1  # C1 is there for sure
+
+
+def _ring_size_gcd(coord, axis, reflect, tol, max_possible):
+    """Returns greatest common divisor of the numbers of points in each
+    ring (shared height along and distance from *axis*, height taken
+    unsigned if *reflect*) about *axis*, which any Cn (Sn if *reflect*)
+    about *axis* up to order *max_possible* must divide. Points too near
+    the axis to be moved beyond *tol* don't constrain the order and are
+    left out. Returns 0 if no bound can be given, either for lack of
+    off-axis points or because points lie within *tol* of each other so
+    symmetry images needn't be distinct.
+
+    """
+    npts = len(coord)
+    if npts < 2 or max_possible < 2 or tol <= 0.0:
+        return 0
+    if npts > SpatialHash.min_points:
+        crowd = SpatialHash(coord, 4.0 * tol)
+        if any(crowd.index_within(pt) != idx for idx, pt in enumerate(crowd.points)):
+            return 0
+    else:
+        for i in range(npts):
+            for j in range(i):
+                if distance(coord[i], coord[j]) < 4.0 * tol:
+                    return 0
+
+    unit = normalize(axis)
+    rings = []
+    for pt in coord:
+        height = dot(pt, unit)
+        radius = norm(sub(pt, scale(unit, height)))
+        rings.append((radius, abs(height) if reflect else height))
+
+    # cluster by radius then height, splitting only at gaps wider than
+    #   window, the most a point and its symmetry image can differ by
+    window = 4.0 * tol
+    rings.sort()
+    clusters = [[rings[0]]]
+    for ring in rings[1:]:
+        if ring[0] - clusters[-1][-1][0] > window:
+            clusters.append([])
+        clusters[-1].append(ring)
+
+    # a cluster reaching in close enough to the axis that accumulated
+    #   fuzz could close an orbit early doesn't constrain the order
+    onaxis = 2.0 * npts * max_possible * tol
+    sizes = []
+    for cluster in clusters:
+        if cluster[0][0] <= onaxis:
+            continue
+        heights = sorted(ring[1] for ring in cluster)
+        size = 1
+        for lo, hi in zip(heights, heights[1:]):
+            if hi - lo > window:
+                sizes.append(size)
+                size = 0
+            size += 1
+        sizes.append(size)
+    if not sizes:
+        return 0
+
+    ring_gcd = 0
+    for size in sizes:
+        ring_gcd = _gcd(ring_gcd, size)
+    return ring_gcd
+
+
+def _gcd(a, b):
+    """Greatest common divisor of nonnegative integers *a* and *b*."""
+    while b:
+        a, b = b, a % b
+    return a
 
 
 def matrix_3d_rotation(mat, axis, phi, Sn):
@@ -3260,6 +3774,10 @@ def equal_but_for_row_order(mat, rhs, tol=DEFAULT_SYM_TOL):
     @returns true if equal, otherwise false.
 
     """
+    if len(mat) > SpatialHash.min_points:
+        rhs_hash = SpatialHash(rhs[:len(mat)], tol)
+        return all(rhs_hash.has_match(row) for row in mat)
+
     for m in range(len(mat)):
         for m_rhs in range(len(mat)):
 
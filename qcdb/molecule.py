@@ -42,7 +42,8 @@ import subprocess
 import socket
 import shutil
 import random
-from collections import defaultdict
+import hashlib
+from collections import defaultdict, deque, OrderedDict
 from .libmintsmolecule import *
 
 
@@ -801,80 +802,32 @@ class Molecule(LibmintsMolecule):
         """Perform a breadth-first search (BFS) on the real atoms
         in molecule, returning an array of atom indices of fragments.
         Relies upon van der Waals radii and so faulty for close
-        (esp. hydrogen-bonded) fragments. Original code from
-        Michael S. Marshall.
+        (esp. hydrogen-bonded) fragments. Neighbors come from the
+        'vdw' connectivity() graph, so cost grows linearly with size.
+        Original code from Michael S. Marshall.
 
         """
-        vdW_diameter = {
-            #'H':  1.001 / 1.5,  # JMol
-            'HE': 1.012 / 1.5,  # JMol
-            'LI': 0.825 / 1.5,  # JMol
-            'BE': 1.408 / 1.5,  # JMol
-            #'B':  1.485 / 1.5,  # JMol
-            #'C':  1.452 / 1.5,  # JMol
-            #'N':  1.397 / 1.5,  # JMol
-            #'O':  1.342 / 1.5,  # JMol
-            #'F':  1.287 / 1.5,  # JMol
-            'NE': 1.243 / 1.5,  # JMol
-            'NA': 1.144 / 1.5,  # JMol
-            'MG': 1.364 / 1.5,  # JMol
-            'AL': 1.639 / 1.5,  # JMol
-            #'SI': 1.716 / 1.5,  # JMol
-            #'P':  1.705 / 1.5,  # JMol
-            #'S':  1.683 / 1.5,  # JMol
-            #'CL': 1.639 / 1.5,  # JMol
-            'AR': 1.595 / 1.5,  # JMol
-
-            'H': 1.06 / 1.5,  # Bondi JPC 68 441 (1964)
-            'B': 1.65 / 1.5,  # Bondi JPC 68 441 (1964)
-            'C': 1.53 / 1.5,  # Bondi JPC 68 441 (1964)
-            'N': 1.46 / 1.5,  # Bondi JPC 68 441 (1964)
-            'O': 1.42 / 1.5,  # Bondi JPC 68 441 (1964)
-            'F': 1.40 / 1.5,  # Bondi JPC 68 441 (1964)
-            'SI': 1.93 / 1.5,  # Bondi JPC 68 441 (1964)
-            'P': 1.86 / 1.5,  # Bondi JPC 68 441 (1964)
-            'S': 1.80 / 1.5,  # Bondi JPC 68 441 (1964)
-            'CL': 1.75 / 1.5,  # Bondi JPC 68 441 (1964)
-            'GE': 1.98 / 1.5,  # Bondi JPC 68 441 (1964)
-            'AS': 1.94 / 1.5,  # Bondi JPC 68 441 (1964)
-            'SE': 1.90 / 1.5,  # Bondi JPC 68 441 (1964)
-            'BR': 1.87 / 1.5,  # Bondi JPC 68 441 (1964)
-            'SN': 2.16 / 1.5,  # Bondi JPC 68 441 (1964)
-            'SB': 2.12 / 1.5,  # Bondi JPC 68 441 (1964)
-            'TE': 2.08 / 1.5,  # Bondi JPC 68 441 (1964)
-            'I': 2.04 / 1.5,  # Bondi JPC 68 441 (1964)
-            'XE': 2.05 / 1.5}  # Bondi JPC 68 441 (1964)
-
-        Queue = []
-        White = list(range(self.natom()))  # untouched
-        Black = []  # touched and all edges discovered
-        Fragment = []  # stores fragments
-
-        start = 0  # starts with the first atom in the list
-        Queue.append(start)
-        White.remove(start)
+        neighbors = self.connectivity('vdw')
 
         # Simply start with the first atom, do a BFS when done, go to any
         #   untouched atom and start again iterate until all atoms belong
         #   to a fragment group
-        while len(White) > 0 or len(Queue) > 0:  # Iterates to the next fragment
+        Fragment = []  # stores fragments
+        touched = [False] * self.natom()
+        for start in range(self.natom()):
+            if touched[start]:
+                continue
+            touched[start] = True
+            Queue = deque([start])
             Fragment.append([])
-
-            while len(Queue) > 0:                # BFS within a fragment
-                for u in Queue:                  # find all (still white) nearest neighbors to vertex u
-                    for i in White:
-                        dist = distance(self.xyz(i), self.xyz(u)) * psi_bohr2angstroms
-                        if dist < vdW_diameter[self.symbol(u)] + vdW_diameter[self.symbol(i)]:
-                            Queue.append(i)      # if you find you, put in the queue
-                            White.remove(i)      # and remove it from the untouched list
-                Queue.remove(u)                  # remove focus from Queue
-                Black.append(u)
-                Fragment[-1].append(int(u))      # add to group (0-indexed)
-                Fragment[-1].sort()              # preserve original atom ordering
-
-            if len(White) != 0:                  # can't move White -> Queue if no more exist
-                Queue.append(White[0])
-                White.remove(White[0])
+            while Queue:                         # BFS within a fragment
+                u = Queue.popleft()
+                Fragment[-1].append(u)           # add to group (0-indexed)
+                for i in neighbors[u]:           # find all (still untouched) nearest neighbors to vertex u
+                    if not touched[i]:
+                        touched[i] = True
+                        Queue.append(i)
+            Fragment[-1].sort()                  # preserve original atom ordering
 
         return Fragment
 
@@ -1174,19 +1127,14 @@ class Molecule(LibmintsMolecule):
         Q = Qmol[:, 1:] * w
         
         # Translate P & Q to global origin by subtracting away respective centroids
-        P = (P - P.mean(axis=0)).T
-        Q = (Q - Q.mean(axis=0)).T
+        P = P - P.mean(axis=0)
+        Q = Q - Q.mean(axis=0)
 
         # Choose algorithm, compute rotation, & rotate P onto Q
-        if alg.lower() == 'svd':
-            R = self.kabsch_svd(P, Q) 
-            P = R.dot(P)
-        elif alg.lower() == 'quaternion':
-            R = self.kabsch_quaternion(P, Q)
-            P = R.dot(P)
-
-        # Compute & Return RMSD
-        rmsd = np.linalg.norm(Q.T - P.T) / np.sqrt(P.T.shape[0])
+        rmsd, R = _kabsch_batch(P[None, :, :], Q, alg)
+        P = R[0].dot(P.T)
+        Q = Q.T
+        rmsd = rmsd[0]
 
         # Returns
         if return_aligned:
@@ -1198,6 +1146,165 @@ class Molecule(LibmintsMolecule):
         else:
             return rmsd
         
+    def align_geometries(self, geoms, weight=None, alg='svd', permute=False):
+        """Compares each of a stack of geometries *geoms* to the geometry
+        of molecule as reference, the batched counterpart of
+        :py:func:`align_molecules` that leaves all Molecule state alone.
+
+        Arguments:
+        <np.array> geoms := K x N x 3 Cartesian coordinates in Angstroms
+            in the atom ordering of *self*, or K x N x 4 with atomic number
+            leading each row, as from :py:func:`format_molecule_for_numpy`.
+
+        Keyword Arguments:
+        <str or np.array> weight := Weighting to be applied to atomic coordinates,
+            as for :py:func:`align_molecules`.
+            Accepted: None, <str> 'mass', <np.array> w, <list> w
+            Default: None
+        <str> alg := Algorithm to use to compute the optimal alignment.
+            Accepted: 'quaternion', 'svd'
+            Default: 'svd'
+        <bool> permute := Also optimize the pairing of atoms of like element,
+            alternating optimal assignment and alignment from the given
+            ordering until the pairing is steady. Any *weight* must then be
+            equal among atoms of like element.
+            Default: False
+
+        Returns:
+        <np.array> rmsd := K least root mean square displacements.
+        <np.array> rot := K x 3 x 3 rotations taking each centered geometry onto the
+            centered reference, rot[k].dot(p) for each atom position p.
+        <np.array> atommap := K x N indices of the atom of each geometry paired with
+            each reference atom, the given ordering unless *permute*.
+
+        >>> rmsd, rot, atommap = molecule.align_geometries(conformers)
+        """
+        import numpy as np
+
+        Qmol = self.format_molecule_for_numpy()
+        Nat = Qmol.shape[0]
+        geoms = np.asarray(geoms, dtype=float)
+        if geoms.ndim == 2:
+            geoms = geoms[None, :, :]
+        if geoms.ndim != 3 or geoms.shape[1] != Nat or geoms.shape[2] not in [3, 4]:
+            raise ValidationError("""Molecule::align_geometries: geometries of shape %s not K x %d x 3 or K x %d x 4.""" %
+                (geoms.shape, Nat, Nat))
+        if geoms.shape[2] == 4:
+            Zs = geoms[:, :, 0]
+            geoms = geoms[:, :, 1:]
+        else:
+            Zs = np.tile(Qmol[:, 0], (geoms.shape[0], 1))
+
+        # Weighting coordinates, by reference atom
+        if weight is None:
+            w = np.ones((Nat, 1))
+        elif weight == 'mass':
+            w = Qmol[:, 0, None]
+        elif isinstance(weight, (list, np.ndarray)):
+            w = np.asarray(weight, dtype=float).reshape(Nat, 1)
+        else:
+            raise ValidationError("""Molecule::align_geometries: Unrecognized argument type %s for keyword argument 'weight'.""" %
+                type(weight))
+
+        K = geoms.shape[0]
+        atommap = np.tile(np.arange(Nat), (K, 1))
+        if not permute:
+            if (Zs != Qmol[:, 0]).any():
+                raise ValidationError("""Molecule::align_geometries: geometry elements differ from reference ordering.""")
+        else:
+            # weights go with reference atoms, so must survive re-pairing
+            for Z in set(Qmol[:, 0].tolist()):
+                if np.ptp(w[Qmol[:, 0] == Z]) > 0.0:
+                    raise ValidationError("""Molecule::align_geometries: weights differ among atoms of Z=%d, so can't permute.""" %
+                        (Z))
+            ref_counts = sorted(Qmol[:, 0].tolist())
+            for k in range(K):
+                if sorted(Zs[k].tolist()) != ref_counts:
+                    raise ValidationError("""Molecule::align_geometries: geometry %d elements differ from reference.""" % (k))
+                # start from the given ordering, like elements in order of appearance
+                for Z in set(ref_counts):
+                    atommap[k][Qmol[:, 0] == Z] = np.nonzero(Zs[k] == Z)[0]
+            geoms = geoms[np.arange(K)[:, None], atommap]
+
+        Q = Qmol[:, 1:] * w
+        Q = Q - Q.mean(axis=0)
+        P = geoms * w
+        P = P - P.mean(axis=1)[:, None, :]
+        rmsd, rot = _kabsch_batch(P, Q, alg)
+
+        if permute:
+            groups = [np.nonzero(Qmol[:, 0] == Z)[0] for Z in sorted(set(Qmol[:, 0].tolist()))]
+            for k in range(K):
+                rmsd[k], rot[k], order = _kabsch_permute(P[k], Q, groups, alg)
+                atommap[k] = atommap[k][order]
+
+        return rmsd, rot, atommap
+
+    def canonical_atoms(self):
+        """Returns list of the identities of the non-dummy atoms of the
+        molecule and N x 3 NumPy array of their Cartesian coordinates in
+        Angstroms. Each identity is (symbol, ghosted, mass, fragment charge,
+        fragment multiplicity), everything an atom must share with its
+        partner for two molecules to pose the same calculation.
+
+        >>> labels, geom = H2OH2O.canonical_atoms()
+
+        """
+        import numpy as np
+        factor = 1.0 if self.PYunits == 'Angstrom' else psi_bohr2angstroms
+        self.update_geometry()
+
+        labels = []
+        geom = []
+        for fr in range(self.nfragments()):
+            if self.fragment_types[fr] == 'Absent':
+                continue
+            for at in range(self.fragments[fr][0], self.fragments[fr][1] + 1):
+                atom = self.full_atoms[at]
+                if atom.symbol() == 'X':
+                    continue
+                mass = atom.mass() if atom.mass() != 0.0 else el2mass[atom.symbol().upper()]
+                ghosted = self.fragment_types[fr] == 'Ghost' or atom.Z() == 0.0
+                labels.append((atom.symbol(), ghosted, '%.6f' % (mass),
+                               self.fragment_charges[fr], self.fragment_multiplicities[fr]))
+                geom.append(atom.compute())
+
+        return labels, np.array(geom).reshape(-1, 3) * factor
+
+    def content_key(self, decimals=2):
+        """Returns hex digest addressing the calculation the molecule
+        poses, independent of atom ordering, orientation, and position.
+        Hashed are the molecular charge and multiplicity, the sorted
+        (type, charge, multiplicity, natom) of the fragments, the sorted
+        :py:func:`canonical_atoms` identities, and the sorted interatomic
+        distances rounded to *decimals* places in Angstroms. Equivalent
+        molecules share a key unless a distance straddles a rounding
+        boundary; mirror images always do, so pair candidates with
+        :py:func:`group_equivalent_molecules` rather than by key alone.
+
+        >>> H2OH2O.content_key() == H2OH2O.clone().content_key()
+        True
+
+        """
+        import numpy as np
+        labels, geom = self.canonical_atoms()
+
+        frags = []
+        for fr in range(self.nfragments()):
+            if self.fragment_types[fr] == 'Absent':
+                continue
+            natom = len([at for at in range(self.fragments[fr][0], self.fragments[fr][1] + 1)
+                         if self.full_atoms[at].symbol() != 'X'])
+            frags.append((self.fragment_types[fr], self.fragment_charges[fr],
+                          self.fragment_multiplicities[fr], natom))
+
+        iu = np.triu_indices(len(labels), 1)
+        dist = np.sqrt(((geom[:, None, :] - geom[None, :, :]) ** 2).sum(axis=2))[iu]
+
+        text = repr((self.molecular_charge(), self.multiplicity(), sorted(frags), sorted(labels)))
+        text += ' '.join(['%.*f' % (decimals, d) for d in np.sort(dist)])
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
     def kabsch_svd(self, P, Q):
         """Computes the optimal rotation matrix R which maps a set of N points 
         P = {p_n | p in R^M} onto a set of N points Q = {q_n | q in R^M} according
@@ -1211,20 +1318,7 @@ class Molecule(LibmintsMolecule):
         Returns:
         <np.ndarray> R := Optimal MxM rotation matrix mapping P onto Q.
         """
-        import numpy as np
-
-        # Form covariance matrix
-        cov = Q.dot(P.T)
-
-        # Compute the SVD of the covariance matrix
-        U, D, V = np.linalg.svd(cov)
-
-        # Build optimal rotation matrix
-        if (np.linalg.det(U) * np.linalg.det(V)) < 0: # Right hand coordinate system?
-            U[:, -1] = -U[:, -1]
-        R = U.dot(V)
-
-        return R
+        return _kabsch_batch(P.T[None, :, :], Q.T, 'svd')[1][0]
 
     def kabsch_quaternion(self, P, Q):
         """Computes the optimal rotation matrix U which mapping a set of points P onto 
@@ -1238,45 +1332,155 @@ class Molecule(LibmintsMolecule):
         Returns:
         <np.ndarray> U := Optimal MxM rotation matrix mapping P onto Q.
         """
-        import numpy as np
+        return _kabsch_batch(P.T[None, :, :], Q.T, 'quaternion')[1][0]
+
+
+def _kabsch_batch(P, Q, alg='svd'):
+    """Returns least root mean square displacements and optimal rotation
+    matrices R[k] that bring each centered K x N x 3 geometry *P* onto
+    the centered N x 3 reference *Q*, minimizing ||Q - R[k] * P[k]||,
+    by *alg* 'svd' or 'quaternion' for all K at once.
 
-        # Form covariance matrix
-        cov = Q.dot(P.T)
+    """
+    import numpy as np
+
+    # Form covariance matrices
+    cov = np.einsum('ni,knj->kij', Q, P)
+
+    if alg.lower() == 'svd':
+        U, D, V = np.linalg.svd(cov)
+        # Right hand coordinate system?
+        flip = (np.linalg.det(U) * np.linalg.det(V)) < 0
+        U[flip, :, -1] = -U[flip, :, -1]
+        R = np.einsum('kij,kjl->kil', U, V)
 
-        # Form the quaternion transformation matrix F
-        F = np.zeros((4,4))
+    elif alg.lower() == 'quaternion':
+        F = np.zeros((cov.shape[0], 4, 4))
         # diagonal
-        F[0,0] = cov[0,0] + cov[1,1] + cov[2,2]
-        F[1,1] = cov[0,0] - cov[1,1] - cov[2,2]
-        F[2,2] = -cov[0,0] + cov[1,1] - cov[2,2]
-        F[3,3] = -cov[0,0] - cov[1,1] + cov[2,2]
+        F[:, 0, 0] = cov[:, 0, 0] + cov[:, 1, 1] + cov[:, 2, 2]
+        F[:, 1, 1] = cov[:, 0, 0] - cov[:, 1, 1] - cov[:, 2, 2]
+        F[:, 2, 2] = -cov[:, 0, 0] + cov[:, 1, 1] - cov[:, 2, 2]
+        F[:, 3, 3] = -cov[:, 0, 0] - cov[:, 1, 1] + cov[:, 2, 2]
         # Upper & lower triangle
-        F[1,0] = F[0,1] = cov[1,2] - cov[2,1]
-        F[2,0] = F[0,2] = cov[2,0] - cov[0,2]
-        F[3,0] = F[0,3] = cov[0,1] - cov[1,0]
-        F[2,1] = F[1,2] = cov[0,1] + cov[1,0]
-        F[3,1] = F[1,3] = cov[0,2] + cov[2,0]
-        F[3,2] = F[2,3] = cov[1,2] + cov[2,1]
-        
-        # Compute ew, ev of F
+        F[:, 1, 0] = F[:, 0, 1] = cov[:, 1, 2] - cov[:, 2, 1]
+        F[:, 2, 0] = F[:, 0, 2] = cov[:, 2, 0] - cov[:, 0, 2]
+        F[:, 3, 0] = F[:, 0, 3] = cov[:, 0, 1] - cov[:, 1, 0]
+        F[:, 2, 1] = F[:, 1, 2] = cov[:, 0, 1] + cov[:, 1, 0]
+        F[:, 3, 1] = F[:, 1, 3] = cov[:, 0, 2] + cov[:, 2, 0]
+        F[:, 3, 2] = F[:, 2, 3] = cov[:, 1, 2] + cov[:, 2, 1]
+
+        # Construct optimal rotation matrices from leading ev of F
         ew, ev = np.linalg.eigh(F)
+        q0, q1, q2, q3 = ev[:, 0, -1], ev[:, 1, -1], ev[:, 2, -1], ev[:, 3, -1]
+        R = np.empty((cov.shape[0], 3, 3))
+        R[:, 0, 0] = q0**2 + q1**2 - q2**2 - q3**2
+        R[:, 0, 1] = 2*(q1*q2 - q0*q3)
+        R[:, 0, 2] = 2*(q1*q3 + q0*q2)
+        R[:, 1, 0] = 2*(q1*q2 + q0*q3)
+        R[:, 1, 1] = q0**2 - q1**2 + q2**2 - q3**2
+        R[:, 1, 2] = 2*(q2*q3 - q0*q1)
+        R[:, 2, 0] = 2*(q1*q3 - q0*q2)
+        R[:, 2, 1] = 2*(q2*q3 + q0*q1)
+        R[:, 2, 2] = q0**2 - q1**2 - q2**2 + q3**2
+
+    else:
+        raise ValidationError("""Unrecognized alignment algorithm %s.""" % (alg))
+
+    resid = Q[None, :, :] - np.einsum('kij,knj->kni', R, P)
+    rmsd = np.sqrt((resid ** 2).sum(axis=(1, 2)) / P.shape[1])
+    return rmsd, R
+
+
+def _kabsch_permute(P, Q, groups, alg='svd'):
+    """Returns least root mean square displacement, optimal rotation, and
+    reordering of the rows of centered N x 3 geometry *P* that bring it
+    onto centered reference *Q*, where rows may exchange only within each
+    index array of *groups*. Optimal assignment and alignment alternate
+    until steady from each of the given ordering and the four
+    principal-axes superpositions, the best result being kept.
+
+    """
+    import numpy as np
+
+    Nat = P.shape[0]
+    starts = [_kabsch_batch(P[None, :, :], Q, alg)[1][0]]
+    ewP, EP = np.linalg.eigh(P.T.dot(P))
+    ewQ, EQ = np.linalg.eigh(Q.T.dot(Q))
+    if np.linalg.det(EP) * np.linalg.det(EQ) < 0:
+        EP[:, -1] = -EP[:, -1]
+    for phase in [[1, 1, 1], [1, -1, -1], [-1, 1, -1], [-1, -1, 1]]:
+        starts.append(EQ.dot(np.diag(phase)).dot(EP.T))
+
+    best = None
+    for R in starts:
+        order = np.arange(Nat)
+        rmsd = None
+        for iteration in range(20):
+            aligned = P[order].dot(R.T)
+            new = np.arange(Nat)
+            for grp in groups:
+                if len(grp) > 1:
+                    cost = ((Q[grp][:, None, :] - aligned[grp][None, :, :]) ** 2).sum(axis=2)
+                    new[grp] = grp[linear_assignment(cost.tolist())]
+            if rmsd is not None and (new == np.arange(Nat)).all():
+                break
+            trial_rmsd, trial_R = _kabsch_batch(P[order[new]][None, :, :], Q, alg)
+            if rmsd is not None and trial_rmsd[0] >= rmsd:
+                break
+            order, rmsd, R = order[new], trial_rmsd[0], trial_R[0]
+        if best is None or rmsd < best[0]:
+            best = (rmsd, R, order)
+
+    return best
+
+
+def group_equivalent_molecules(molecules, tol=1.0e-5):
+    """Partitions *molecules*, a dictionary or list of pairs of label
+    to Molecule, into groups that pose the same calculation: equal
+    :py:func:`Molecule.content_key` and geometries superimposable by a
+    proper rotation, translation, and exchange of like atoms to within
+    root mean square displacement *tol* in Angstroms. Mirror images are
+    not grouped. Returns OrderedDict of the label of the representative,
+    the first encountered, to the list of labels of the group, the
+    representative leading. For use, molecules should already be in
+    their final orientation, e.g., through fix_orientation.
+
+    >>> groups = group_equivalent_molecules(GEOS)
+    >>> for rep, members in groups.items():
+    ...     print rep, members[1:]
+
+    """
+    import numpy as np
+
+    items = molecules.items() if hasattr(molecules, 'items') else molecules
+
+    groups = OrderedDict()
+    reps = defaultdict(list)
+    for label, mol in items:
+        key = mol.content_key()
+        labels, geom = mol.canonical_atoms()
+        order = sorted(range(len(labels)), key=lambda at: labels[at])
+        P = geom[order] - geom[order].mean(axis=0)
+        Nat = len(labels)
+        dist = np.sort(np.sqrt(((P[:, None, :] - P[None, :, :]) ** 2).sum(axis=2))[np.triu_indices(Nat, 1)])
+
+        for rep, Q, Qdist, atgroups in reps[key]:
+            # sorted distances can't differ by more than twice the largest
+            #   displacement, which can't exceed sqrt(Nat) times the rmsd
+            if Nat > 1 and np.abs(dist - Qdist).max() > 2.0 * np.sqrt(Nat) * tol:
+                continue
+            if _kabsch_permute(P, Q, atgroups)[0] <= tol:
+                groups[rep].append(label)
+                break
+        else:
+            slabels = [labels[at] for at in order]
+            atgroups = [np.array([at for at in range(Nat) if slabels[at] == lbl])
+                        for lbl in sorted(set(slabels))]
+            reps[key].append((label, P, dist, atgroups))
+            groups[label] = [label]
+
+    return groups
 
-        # Construct optimal rotation matrix from leading ev
-        q = ev[:,-1]
-        U = np.zeros((3,3))
-
-        U[0,0] = q[0]**2 + q[1]**2 - q[2]**2 - q[3]**2
-        U[0,1] = 2*(q[1]*q[2] - q[0]*q[3])
-        U[0,2] = 2*(q[1]*q[3] + q[0]*q[2])
-        U[1,0] = 2*(q[1]*q[2] + q[0]*q[3])
-        U[1,1] = q[0]**2 - q[1]**2 + q[2]**2 - q[3]**2
-        U[1,2] = 2*(q[2]*q[3] - q[0]*q[1])
-        U[2,0] = 2*(q[1]*q[3] - q[0]*q[2])
-        U[2,1] = 2*(q[2]*q[3] + q[0]*q[1])
-        U[2,2] = q[0]**2 - q[1]**2 - q[2]**2 + q[3]**2
-
-        return U
-        
 
 # Attach methods to qcdb.Molecule class
 from .interface_dftd3 import run_dftd3 as _dftd3_qcdb_yo
@@ -1285,3 +1489,5 @@ from .parker import xyz2mol as _parker_xyz2mol_yo
 Molecule.format_molecule_for_mol2 = _parker_xyz2mol_yo
 from .parker import bond_profile as _parker_bondprofile_yo
 Molecule.bond_profile = _parker_bondprofile_yo
+from .parker import connectivity as _parker_connectivity_yo
+Molecule.connectivity = _parker_connectivity_yo
@@ -33,7 +33,12 @@ from __future__ import print_function
 #import math
 #import copy
 import itertools
+try:
+    import numpy as np
+except ImportError:
+    np = None
 from .molecule import Molecule
+from .libmintsmolecule import SpatialHash
 #from periodictable import *
 #from physconst import *
 from .vecutil import *
@@ -219,45 +224,16 @@ class OrientMols(object):
                     allowedExchflip.append(temp)
 
         # Find mapping of atom exchange that brings Cgeom into coincidence with Pgeom
-        for exfp in allowedExchflip:
+        Psym = [p4mol.symbol(at) for at in range(Nat)]
+        Csym = [c4mol.symbol(at) for at in range(Nat)]
+        for exfp in _screen_exchflips(Pgeom, Cgeom, allowedExchflip):
             Cgeom = mult(c4mol.geometry(), exfp)
-
-            mapMat = [None] * Nat
-            Pwhite = list(range(Nat))
-            Cwhite = list(range(Nat))
-
-#            print '\nPgeom: '
-#            for item in Pgeom:
-#                print '       %16.8f %16.8f %16.8f' % (item[0], item[1], item[2])
-#            print '\nCgeom: '
-#            for item in Cgeom:
-#                print '       %16.8f %16.8f %16.8f' % (item[0], item[1], item[2])
-
-            while len(Pwhite) > 0:
-                Patm = Pwhite[0]
-                sameElem = [at for at in range(Nat) if ((c4mol.symbol(at) == p4mol.symbol(Patm)) or (c4mol.symbol(at) == 'GH'))]
-                allowed = list(set(sameElem) & set(Cwhite))
-
-                for Catm in allowed:
-                    if all([abs(Cgeom[Catm][ax] - Pgeom[Patm][ax]) < COORD_ZERO for ax in range(3)]):
-                        mapMat[Patm] = Catm
-                        Pwhite.remove(Patm)
-                        Cwhite.remove(Catm)
-#                        print 'matchd on atom', 'Patm', Patm, 'Catm', Catm
-                        break
-                else:
-#                    print 'failed on atom', 'Patm', Patm, 'rejecting', exfp
-                    break
-            else:
-#                print 'accept exchflp', exfp, 'with map', mapMat
+            mapMat = _map_atoms(Pgeom, Cgeom, Psym, Csym)
+            if mapMat is not None:
                 break
         else:
-            print('else of for', exfp, mapMat)
             print('qcdb.orient.create_orientation_from_molecules debug info')
-            print('\nPatm', Patm, 'Catm', Catm, 'Pwhite', Pwhite, \
-                'Cwhite', Cwhite, 'sameElem', sameElem, 'allowed', allowed, \
-                '\nCgeom[Catm]: ', Cgeom[Catm], '\nPgeom[Patm]: ', Pgeom[Patm], \
-                '\nmapMat', mapMat)
+            print('\nallowedExchflip', allowedExchflip, '\nPsym', Psym, '\nCsym', Csym)
             print('\nPgeom: ')
             for item in Pgeom:
                 print('       %16.8f %16.8f %16.8f' % (item[0], item[1], item[2]))
@@ -319,71 +295,62 @@ class OrientMols(object):
         print("P4 Shift")
         coord.print_out()
 
-    def transform_coordinates2(self, coord):
+    def _inertial_exchflip(self):
+        """Returns NumPy product of Crotate and Cexchflip, which together
+        take *molChangeable* coordinates into the Pmol axis system.
+
         """
+        return np.dot(np.array(self.Crotate, dtype=float), np.array(self.Cexchflip, dtype=float))
+
+    def _reorient(self, arr):
+        """Returns the rows of *arr* (natom x 3) rotated into the inertial
+        frame, exchanged and phased into the axis system, reordered into
+        the atom ordering, and rotated out of the inertial frame, as
+        NumPy array or, lacking NumPy, list of lists.
 
         """
-        geom = coord.geometry()
+        if np is None:
+            arr = mult(mult(arr, self.Crotate), self.Cexchflip)
+            arr = [arr[self.Catommap[at]] for at in range(len(arr))]
+            return mult(arr, transpose(self.Protate))
 
-#        print self
-#        print "Original"
-#        for item in geom:
-#            print('       %16.8f %16.8f %16.8f' % (item[0], item[1], item[2]))
-
-        # ?????
-        #coord.translate(scale(self.Cshift, -1.0))
-        geom2 = []
-        for item in geom:
-            geom2.append(sub(item, self.Cshift))
-        geom = geom2
-#        print "Shift"
-#        for item in geom:
-#            print('       %16.8f %16.8f %16.8f' % (item[0], item[1], item[2]))
-
-        #coord.rotate(self.Crotate)
-        geom2 = mult(geom, self.Crotate)
-        geom = geom2
-#        print "Rotate"
-#        for item in geom:
-#            print('       %16.8f %16.8f %16.8f' % (item[0], item[1], item[2]))
-
-        #coord.rotate(self.Cexchflip)
-        geom2 = mult(geom, self.Cexchflip)
-        geom = geom2
- #       print "ExchFlip"
- #       for item in geom:
- #           print('       %16.8f %16.8f %16.8f' % (item[0], item[1], item[2]))
-
-        geom2 = []
-        for at in range(coord.natom()):
-            geom2.append(geom[self.Catommap[at]])
-        coord.set_geometry(geom2)
-        geom = geom2
-#        print "AtomMap"
-#        for item in geom:
-#            print('       %16.8f %16.8f %16.8f' % (item[0], item[1], item[2]))
-
-        #coord.rotate(transpose(self.Protate))
-        geom2 = mult(geom, transpose(self.Protate))
-        geom = geom2
-#        print "P4 Rotate"
-#        for item in geom:
-#            print('       %16.8f %16.8f %16.8f' % (item[0], item[1], item[2]))
-
-        geom2 = []
-        for item in geom:
-            geom2.append(add(item, self.Pshift))
-        geom = geom2
-#        print "P4 Shift"
-#        for item in geom:
-#            print('       %16.8f %16.8f %16.8f' % (item[0], item[1], item[2]))
-
-        Pgeom = self.Pmol.geometry()
-        Cgeom = geom
+        frame = self._inertial_exchflip()
+        arr = np.dot(np.asarray(arr, dtype=float).reshape(-1, 3)[self.Catommap], frame)
+        return np.dot(arr, np.array(self.Protate, dtype=float).T)
+
+    def transform_coordinates2(self, coord):
+        """Returns the geometry of *coord*, a :py:class:`qcdb.Molecule` in
+        *molChangeable* orientation, brought into *molPermanent*
+        orientation and checked against it. Note that *coord* is left
+        holding the geometry shifted, rotated, exchanged, and reordered,
+        but not yet rotated out of the inertial frame.
+
+        """
+        geom = coord.geometry()
         Nat = len(geom)
-        if not all([all([abs(Cgeom[at][ax] - Pgeom[at][ax]) < COORD_ZERO for ax in range(3)]) for at in range(Nat)]):
-            raise ValidationError("""Geometries unreconcilable between QC programs:\n  P4 %s\n  C4 %s""" % (Pgeom, Cgeom))
-        return geom
+
+        if np is None:
+            geom = [sub(item, self.Cshift) for item in geom]
+            geom = mult(mult(geom, self.Crotate), self.Cexchflip)
+            geom = [geom[self.Catommap[at]] for at in range(Nat)]
+            coord.set_geometry(geom)
+            geom = mult(geom, transpose(self.Protate))
+            geom = [add(item, self.Pshift) for item in geom]
+
+            Pgeom = self.Pmol.geometry()
+            if not all([all([abs(geom[at][ax] - Pgeom[at][ax]) < COORD_ZERO for ax in range(3)]) for at in range(Nat)]):
+                raise ValidationError("""Geometries unreconcilable between QC programs:\n  P4 %s\n  C4 %s""" % (Pgeom, geom))
+            return geom
+
+        frame = self._inertial_exchflip()
+        geom = np.dot((np.array(geom, dtype=float) - np.array(self.Cshift, dtype=float))[self.Catommap], frame)
+        coord.set_geometry(geom.tolist())
+        geom = np.dot(geom, np.array(self.Protate, dtype=float).T) + np.array(self.Pshift, dtype=float)
+
+        Pgeom = np.array(self.Pmol.geometry(), dtype=float)
+        if not (np.abs(geom - Pgeom) < COORD_ZERO).all():
+            raise ValidationError("""Geometries unreconcilable between QC programs:\n  P4 %s\n  C4 %s""" % (Pgeom.tolist(), geom.tolist()))
+        return geom.tolist()
 
     def transform_gradient(self, arr):
         """Applies to *arr* the transformation appropriate to bring a
@@ -394,30 +361,8 @@ class OrientMols(object):
         ordering, and a rotation to remove it from the inertial frame.
 
         """
-        arr = mult(arr, self.Crotate)
-#        print "Rotate"
-#        for item in arr:
-#            print('       %16.8f %16.8f %16.8f' % (item[0], item[1], item[2]))
-
-        arr = mult(arr, self.Cexchflip)
-#        print "ExchFlip"
-#        for item in arr:
-#            print('       %16.8f %16.8f %16.8f' % (item[0], item[1], item[2]))
-
-        arr2 = []
-        for at in range(len(arr)):
-            arr2.append(arr[self.Catommap[at]])
-        arr = arr2
-#        print "AtomMap"
-#        for item in arr:
-#            print('       %16.8f %16.8f %16.8f' % (item[0], item[1], item[2]))
-
-        arr = mult(arr, transpose(self.Protate))
-#        print "P4 Rotate"
-#        for item in arr:
-#            print('       %16.8f %16.8f %16.8f' % (item[0], item[1], item[2]))
-
-        return arr
+        arr = self._reorient(arr)
+        return arr if np is None else arr.tolist()
 
     def transform_elementlist(self, elem):
         """Applies to *elem* the transformation appropriate to bring a
@@ -440,27 +385,87 @@ class OrientMols(object):
         inertial frame.
 
         """
-        vec = [vec]  # hack since vecutil handles matrices, not vectors
-
-        #coord.rotate(self.Crotate)
-        vec2 = mult(vec, self.Crotate)
-        vec = vec2
-        #print "Rotate"
-        #for item in vec:
-        #    print('       %16.8f %16.8f %16.8f' % (item[0], item[1], item[2]))
-
-        #coord.rotate(self.Cexchflip)
-        vec2 = mult(vec, self.Cexchflip)
-        vec = vec2
-        #print "ExchFlip"
-        #for item in vec:
-        #    print('       %16.8f %16.8f %16.8f' % (item[0], item[1], item[2]))
-
-        #coord.rotate(transpose(self.Protate))
-        vec2 = mult(vec, transpose(self.Protate))
-        vec = vec2
-        #print "P4 Rotate"
-        #for item in vec:
-        #    print('       %16.8f %16.8f %16.8f' % (item[0], item[1], item[2]))
-
-        return vec[0]
+        if np is None:
+            vec = [vec]  # hack since vecutil handles matrices, not vectors
+            return mult(mult(mult(vec, self.Crotate), self.Cexchflip), transpose(self.Protate))[0]
+
+        frame = self._inertial_exchflip()
+        vec = np.dot(np.dot(np.asarray(vec, dtype=float), frame), np.array(self.Protate, dtype=float).T)
+        return vec.tolist()
+
+
+def _screen_exchflips(Pgeom, Cgeom, exchflips):
+    """Returns those of *exchflips* (axis exchange and phasing matrices)
+    that could bring *Cgeom* into coincidence with *Pgeom* to within
+    COORD_ZERO per coordinate, in the original order. Candidates are
+    scored all at once on the cross moments xy, xz, yz, and xyz of the
+    transformed geometry, which must match those of *Pgeom* to within
+    the bound the tolerance allows. Lacking NumPy, all are returned.
+
+    """
+    if np is None or len(exchflips) < 2:
+        return exchflips
+
+    Pgeom = np.array(Pgeom, dtype=float).reshape(-1, 3)
+    Cgeom = np.array(Cgeom, dtype=float).reshape(-1, 3)
+    Cgeoms = np.einsum('ij,kjl->kil', Cgeom, np.array(exchflips, dtype=float))
+
+    def moments(geom):
+        x, y, z = geom[..., 0], geom[..., 1], geom[..., 2]
+        return np.stack([(x * y).sum(axis=-1), (x * z).sum(axis=-1),
+                         (y * z).sum(axis=-1), (x * y * z).sum(axis=-1)], axis=-1)
+
+    # |x'y' - xy| <= d(|x| + |y| + d) when each coordinate moves less than d;
+    #   doubled for the rounding of the sums
+    d = COORD_ZERO
+    ax, ay, az = np.abs(Pgeom[:, 0]), np.abs(Pgeom[:, 1]), np.abs(Pgeom[:, 2])
+    bound = 2.0 * d * np.array([(ax + ay + d).sum(), (ax + az + d).sum(), (ay + az + d).sum(),
+                                ((ay + d) * (az + d) + ax * (az + d) + ax * ay).sum()])
+    fit = (np.abs(moments(Cgeoms) - moments(Pgeom)) <= bound).all(axis=1)
+    return [exfp for exfp, ok in zip(exchflips, fit) if ok]
+
+
+def _map_atoms(Pgeom, Cgeom, Psym, Csym):
+    """Returns list whose entry for each atom of *Pgeom* is the atom of
+    *Cgeom* in coincidence with it, or None if no complete mapping
+    exists. Atoms may pair if within COORD_ZERO in each coordinate and
+    of the same element in *Psym* and *Csym* or if the *Cgeom* atom is a
+    ghost, 'GH'. Where tolerance admits more than one mapping, the one
+    of least summed squared displacement is taken.
+
+    """
+    Nat = len(Pgeom)
+    lookup = SpatialHash(Cgeom, COORD_ZERO)
+    choices = []
+    for Patm in range(Nat):
+        row = [Catm for Catm in lookup.candidates(Pgeom[Patm])
+               if (Csym[Catm] == Psym[Patm] or Csym[Catm] == 'GH') and
+               all([abs(Cgeom[Catm][ax] - Pgeom[Patm][ax]) < COORD_ZERO for ax in range(3)])]
+        if not row:
+            return None
+        choices.append(row)
+
+    # pairs that are the only choice for both atoms need no assignment
+    claims = {}
+    for row in choices:
+        for Catm in row:
+            claims[Catm] = claims.get(Catm, 0) + 1
+    mapMat = [row[0] if (len(row) == 1 and claims[row[0]] == 1) else None for row in choices]
+    Popen = [Patm for Patm in range(Nat) if mapMat[Patm] is None]
+    if not Popen:
+        return mapMat
+
+    Copen = sorted(set([Catm for Patm in Popen for Catm in choices[Patm]]))
+    if len(Copen) < len(Popen):
+        return None
+    col = dict((Catm, idx) for idx, Catm in enumerate(Copen))
+    cost = [[None] * len(Copen) for Patm in Popen]
+    for idx, Patm in enumerate(Popen):
+        for Catm in choices[Patm]:
+            cost[idx][col[Catm]] = sum([(Cgeom[Catm][ax] - Pgeom[Patm][ax]) ** 2 for ax in range(3)])
+    assigned = linear_assignment(cost)
+    if assigned is None:
+        return None
+    for idx, Patm in enumerate(Popen):
+        mapMat[Patm] = Copen[assigned[idx]]
+    return mapMat
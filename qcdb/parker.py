@@ -28,12 +28,56 @@
 
 from __future__ import absolute_import
 from __future__ import print_function
+import heapq
 from .vecutil import *
 from .physconst import *
 from .cov_radii import *
+from .exceptions import *
+from .libmintsmolecule import SpatialHash
 
 BOND_FACTOR = 1.2  # fudge factor for bond length threshold
 
+# atomic diameters [A] for fragment detection by Molecule.BFS
+_vdW_diameter = {
+    #'H':  1.001 / 1.5,  # JMol
+    'HE': 1.012 / 1.5,  # JMol
+    'LI': 0.825 / 1.5,  # JMol
+    'BE': 1.408 / 1.5,  # JMol
+    #'B':  1.485 / 1.5,  # JMol
+    #'C':  1.452 / 1.5,  # JMol
+    #'N':  1.397 / 1.5,  # JMol
+    #'O':  1.342 / 1.5,  # JMol
+    #'F':  1.287 / 1.5,  # JMol
+    'NE': 1.243 / 1.5,  # JMol
+    'NA': 1.144 / 1.5,  # JMol
+    'MG': 1.364 / 1.5,  # JMol
+    'AL': 1.639 / 1.5,  # JMol
+    #'SI': 1.716 / 1.5,  # JMol
+    #'P':  1.705 / 1.5,  # JMol
+    #'S':  1.683 / 1.5,  # JMol
+    #'CL': 1.639 / 1.5,  # JMol
+    'AR': 1.595 / 1.5,  # JMol
+
+    'H': 1.06 / 1.5,  # Bondi JPC 68 441 (1964)
+    'B': 1.65 / 1.5,  # Bondi JPC 68 441 (1964)
+    'C': 1.53 / 1.5,  # Bondi JPC 68 441 (1964)
+    'N': 1.46 / 1.5,  # Bondi JPC 68 441 (1964)
+    'O': 1.42 / 1.5,  # Bondi JPC 68 441 (1964)
+    'F': 1.40 / 1.5,  # Bondi JPC 68 441 (1964)
+    'SI': 1.93 / 1.5,  # Bondi JPC 68 441 (1964)
+    'P': 1.86 / 1.5,  # Bondi JPC 68 441 (1964)
+    'S': 1.80 / 1.5,  # Bondi JPC 68 441 (1964)
+    'CL': 1.75 / 1.5,  # Bondi JPC 68 441 (1964)
+    'GE': 1.98 / 1.5,  # Bondi JPC 68 441 (1964)
+    'AS': 1.94 / 1.5,  # Bondi JPC 68 441 (1964)
+    'SE': 1.90 / 1.5,  # Bondi JPC 68 441 (1964)
+    'BR': 1.87 / 1.5,  # Bondi JPC 68 441 (1964)
+    'SN': 2.16 / 1.5,  # Bondi JPC 68 441 (1964)
+    'SB': 2.12 / 1.5,  # Bondi JPC 68 441 (1964)
+    'TE': 2.08 / 1.5,  # Bondi JPC 68 441 (1964)
+    'I': 2.04 / 1.5,  # Bondi JPC 68 441 (1964)
+    'XE': 2.05 / 1.5}  # Bondi JPC 68 441 (1964)
+
 _expected_bonds = {
     'H': 1,
     'B': 3,  # LAB added Aug 2017
@@ -85,19 +129,13 @@ def xyz2mol(self):
 
 def missing_bonds(bonds, bond_tree, at_types):
     """Determine number of bonds missing for each atom"""
-    n_missing = []
-    for i in range(len(at_types)):
-        n_bonds_i = 0
-        for p in range(len(bonds)):
-            at1 = bonds[p][0]
-            at2 = bonds[p][1]
-            if (at1 == i or at2 == i):
-                bond_order = bonds[p][2]
-                n_bonds_i += bond_order
-        n_expect_i = _expected_bonds[at_types[i]]
-        n_missing.append(n_expect_i - n_bonds_i)
+    n_bonds = [0] * len(at_types)
+    for at1, at2, bond_order in bonds:
+        n_bonds[at1] += bond_order
+        n_bonds[at2] += bond_order
 
-    return n_missing
+    # elements of unknown valence are taken as saturated by their bonds
+    return [_expected_bonds.get(at_types[i], n_bonds[i]) - n_bonds[i] for i in range(len(at_types))]
 
 
 def missing_neighbors(bond_tree, n_missing):
@@ -114,88 +152,120 @@ def missing_neighbors(bond_tree, n_missing):
     return missing_neighbors
 
 
+def connectivity(self, criterion='covalent'):
+    """Returns for each atom the ascending list of atoms bonded to it,
+    by *criterion* 'covalent' (distance within BOND_FACTOR times the sum
+    of covalent radii, as for bond_profile) or 'vdw' (distance within the
+    sum of _vdW_diameter entries, as for BFS, with covalent criterion for
+    elements lacking one). Neighbors are found with a cell list, and the
+    graph is cached until the atoms or geometry change, so treat it as
+    read-only.
+
+    """
+    key = ('connectivity', criterion)
+    try:
+        return self.PYarrays[key]
+    except KeyError:
+        pass
+
+    reach = []
+    for at in range(self.natom()):
+        symbol = self.symbol(at)
+        if criterion == 'vdw' and symbol in _vdW_diameter:
+            reach.append(_vdW_diameter[symbol])
+        elif criterion in ['vdw', 'covalent'] and symbol in psi_cov_radii:
+            reach.append(BOND_FACTOR * psi_cov_radii[symbol])
+        elif criterion in ['vdw', 'covalent']:
+            raise ValidationError("""Molecule::connectivity: No radius known for element %s.""" % (symbol))
+        else:
+            raise ValidationError("""Molecule::connectivity: Criterion %s not 'covalent' or 'vdw'.""" % (criterion))
+
+    bond_tree = [[] for at in range(self.natom())]
+    if reach:
+        cutoff = 2.0 * max(reach) / psi_bohr2angstroms
+        for i, j, dist in SpatialHash(self.geometry(), 0.0, cell=cutoff).pairs_within(cutoff):
+            if dist * psi_bohr2angstroms < reach[i] + reach[j]:
+                bond_tree[i].append(j)
+                bond_tree[j].append(i)
+        for nbrs in bond_tree:
+            nbrs.sort()
+
+    self.PYarrays[key] = bond_tree
+    return bond_tree
+
+
 def bond_profile(self):
     """Obtain bonding topology of molecule"""
 
     # determine bond topology from covalent radii
+    bond_tree = self.connectivity('covalent')
     bonds = []
     for i in range(self.natom()):
-        for j in range(i + 1, self.natom()):
-            dist = norm(sub(self.xyz(j), self.xyz(i))) * psi_bohr2angstroms
-            # TOOD check bohr/ang progress
-            bonded_dist = BOND_FACTOR * (psi_cov_radii[self.symbol(i)] + psi_cov_radii[self.symbol(j)])
-            if bonded_dist > dist:
+        for j in bond_tree[i]:
+            if j > i:
                 bonds.append([i, j, 1])
+    bond_index = dict(((bonds[p][0], bonds[p][1]), p) for p in range(len(bonds)))
 
     # determine bond order from number of bonds
     N_atoms = self.natom()
-    N_bonds = len(bonds)
     at_types = [self.symbol(i) for i in range(self.natom())]
-    bond_tree = [[] for i in range(N_atoms)]
-    for i in range(N_bonds):
-        at1 = bonds[i][0]
-        at2 = bonds[i][1]
-        bond_tree[at1].append(at2)
-        bond_tree[at2].append(at1)
 
     # determine bond order for all bonds from bond tree and element types
     n_missing = missing_bonds(bonds, bond_tree, at_types)
     n_neighbors_missing = missing_neighbors(bond_tree, n_missing)
+    sum_missing = sum(n_missing)
+
+    # deficient atoms by number of deficient neighbors, stale entries skipped on lookup
+    by_neighbors = {}
+    for i in range(N_atoms):
+        if n_missing[i] > 0:
+            by_neighbors.setdefault(n_neighbors_missing[i], []).append(i)
+
+    def lowest_deficient(neighbor_min):
+        heap = by_neighbors.get(neighbor_min, [])
+        while heap and not (n_missing[heap[0]] > 0 and n_neighbors_missing[heap[0]] == neighbor_min):
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def lose_bond(i):
+        n_missing[i] += -1
+        if n_missing[i] == 0:  # no longer deficient, so neither are its neighbors' neighbor
+            for k in bond_tree[i]:
+                n_neighbors_missing[k] += -1
+                if n_missing[k] > 0:
+                    heapq.heappush(by_neighbors.setdefault(n_neighbors_missing[k], []), k)
 
     # add double / triple bonds if only one neighbor missing bonds
-    N_left = math.floor(sum(n_missing) / 2)
+    N_left = math.floor(sum_missing / 2)
     N_left_previous = N_left + 1
-    N_iter = 0
+    N_stall = 0
     while N_left > 0:
-        N_iter += 1
 
         if N_left == N_left_previous:
             neighbor_min += 1
+            N_stall += 1
         else:
             neighbor_min = 1
 
         N_left_previous = N_left
 
         # add a multiple bond to a deficient atom with the fewest number of deficient neighbors
-        BREAK_LOOP = False
-        for i in range(N_atoms):
-            if n_missing[i] > 0 and n_neighbors_missing[i] == neighbor_min:
-                N_neighbors = len(bond_tree[i])
-                for a in range(N_neighbors):
-                    j = bond_tree[i][a]
-                    if n_missing[j] > 0:
-                        for p in range(N_bonds):
-                            at1 = bonds[p][0]
-                            at2 = bonds[p][1]
-                            if (at1 == i and at2 == j) or (at1 == j and at2 == i):
-                                bonds[p][2] += 1
-                                n_missing[i] += -1
-                                n_missing[j] += -1
-                                n_neighbors_missing[i] += -1
-                                n_neighbors_missing[j] += -1
-                                N_left = math.floor(sum(n_missing) / 2)
-                                BREAK_LOOP = True
-                    if BREAK_LOOP:
-                        break
-            if BREAK_LOOP:
-                break
-
-        # recalculate incomplete bond topology
-        n_missing = missing_bonds(bonds, bond_tree, at_types)
-        n_neighbors_missing = missing_neighbors(bond_tree, n_missing)
-
-        # break cycle if takes more than given number of iterations
+        i = lowest_deficient(neighbor_min)
+        if i is not None:
+            for j in bond_tree[i]:
+                if n_missing[j] > 0:
+                    bonds[bond_index[(min(i, j), max(i, j))]][2] += 1
+                    lose_bond(i)
+                    lose_bond(j)
+                    sum_missing += -2
+                    N_left = math.floor(sum_missing / 2)
+                    break
+
+        # break cycle if takes more than given number of fruitless iterations
         max_iter = 100
-        if N_iter > max_iter:
+        if N_stall > max_iter:
             print("""Error: multiple bond determination not complete""")
             print("""  %i bonds unaccounted for""" % (N_left))
             break
 
-    # bond order is number of bonds between each bonded atom pair
-    bond_order = []
-    for p in range(N_bonds):
-        bond_order.append(bonds[p][2])
-    for p in range(len(bond_order)):
-        bonds[p][2] = bond_order[p]
-
     return bonds
@@ -344,3 +344,62 @@ def matadd(matrix1, matrix2, fac1=1.0, fac2=1.0):
         for j in range(len(matrix1[0])):
             new_matrix[i][j] = fac1 * matrix1[i][j] + fac2 * matrix2[i][j]
     return new_matrix
+
+
+def linear_assignment(cost):
+    """Returns list of distinct column indices, one per row of *cost*
+    (n x m, n <= m), of least total cost, or None if no assignment
+    exists. Entries of None mark forbidden pairings. Hungarian method
+    by shortest augmenting paths, O(n^2 m).
+
+    """
+    inf = float('inf')
+    n = len(cost)
+    m = len(cost[0]) if n else 0
+    # 1-based potentials and matching, column 0 a sentinel
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    match = [0] * (m + 1)
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        match[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            delta = inf
+            j1 = None
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cij = cost[i0 - 1][j - 1]
+                    if cij is not None:
+                        cur = cij - u[i0] - v[j]
+                        if cur < minv[j]:
+                            minv[j] = cur
+                            way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            if j1 is None:
+                return None
+            for j in range(m + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+
+    assigned = [None] * n
+    for j in range(1, m + 1):
+        if match[j]:
+            assigned[match[j] - 1] = j - 1
+    return assigned